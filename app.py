@@ -15,7 +15,9 @@ import os
 # Add the current directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from assets.translations import get_text, LANGUAGES
+from assets.translations import get_text, bind_language, set_language, LANGUAGES
+from utils.instrumentation import instrument
+from components.solution_display import display_performance_report
 from pages import definite_integrals, riemann_sums, area_between_curves, software_engineering_scenarios, documentation
 
 # Initialize session state
@@ -42,6 +44,7 @@ def init_session_state():
 def main():
     """Main application function."""
     init_session_state()
+    bind_language(st.session_state.language)
     
     # Sidebar for navigation and language selection
     with st.sidebar:
@@ -58,7 +61,7 @@ def main():
         )
         
         if selected_language != st.session_state.language:
-            st.session_state.language = selected_language
+            set_language(selected_language)
             st.rerun()
         
         st.markdown("---")
@@ -88,6 +91,10 @@ def main():
         
         st.markdown("---")
         
+        show_performance = st.checkbox("⏱️ " + get_text("show_performance"), key="show_performance")
+        
+        st.markdown("---")
+        
         # App info
         st.markdown("### 📚 " + get_text("app_title"))
         st.markdown(get_text("app_description"))
@@ -96,16 +103,20 @@ def main():
         st.markdown(f"*{get_text('footer_info')}*")
     
     # Main content area
-    if st.session_state.current_page == "definite_integrals":
-        definite_integrals.show()
-    elif st.session_state.current_page == "riemann_sums":
-        riemann_sums.show()
-    elif st.session_state.current_page == "area_between_curves":
-        area_between_curves.show()
-    elif st.session_state.current_page == "engineering_scenarios":
-        software_engineering_scenarios.show()
-    elif st.session_state.current_page == "documentation":
-        documentation.show()
+    with instrument() as report:
+        if st.session_state.current_page == "definite_integrals":
+            definite_integrals.show()
+        elif st.session_state.current_page == "riemann_sums":
+            riemann_sums.show()
+        elif st.session_state.current_page == "area_between_curves":
+            area_between_curves.show()
+        elif st.session_state.current_page == "engineering_scenarios":
+            software_engineering_scenarios.show()
+        elif st.session_state.current_page == "documentation":
+            documentation.show()
+    
+    if show_performance:
+        display_performance_report(report)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Lazily loaded store for the static content of the application.
+
+Study plans, documentation and scenario data are large literal dictionaries
+that most reruns never touch. Instead of importing them eagerly from every
+page, they are loaded on first access, optionally from precompiled JSON
+files, and kept in memory afterwards.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+from functools import lru_cache
+
+# Directory for precompiled content (optional, created by precompile_content)
+CONTENT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_content_cache")
+
+# Content name -> {language: module that defines it}
+# Todo el contenido está escrito en español; los demás idiomas usan este como respaldo
+CONTENT_SOURCES = {
+    "definite_integrals_study_plan": {"es": "assets.study_plans"},
+    "riemann_sums_study_plan": {"es": "assets.study_plans"},
+    "area_between_curves_study_plan": {"es": "assets.study_plans"},
+    "engineering_scenarios_study_plan": {"es": "assets.study_plans"},
+    "additional_integral_examples": {"es": "assets.study_plans"},
+    "practice_exercises": {"es": "assets.study_plans"},
+    "enhanced_definite_integrals_plan": {"es": "assets.enhanced_study_plans"},
+    "installation_documentation": {"es": "assets.enhanced_study_plans"},
+    "faq_section": {"es": "assets.enhanced_study_plans"},
+    "additional_learning_resources": {"es": "assets.enhanced_study_plans"},
+    "SOFTWARE_ENGINEERING_SCENARIOS": {"es": "assets.software_engineering_data"},
+    "DETAILED_SOFTWARE_EXAMPLES": {"es": "assets.software_engineering_data"},
+}
+
+DEFAULT_CONTENT_LANGUAGE = "es"
+
+def _content_cache_path(name: str, language: str) -> str:
+    """Path of the precompiled JSON file for a content entry."""
+    return os.path.join(CONTENT_CACHE_DIR, f"{name}.{language}.json")
+
+def _resolve_language(name: str, language: str) -> str:
+    """Fall back to the default language when a content entry has no translation."""
+    if name not in CONTENT_SOURCES:
+        raise KeyError(f"Unknown content: '{name}'")
+
+    if language in CONTENT_SOURCES[name]:
+        return language
+    return DEFAULT_CONTENT_LANGUAGE
+
+@lru_cache(maxsize=None)
+def _load_content(name: str, language: str):
+    """Load a content entry once, preferring its precompiled JSON file."""
+    cache_path = _content_cache_path(name, language)
+    module_name = CONTENT_SOURCES[name][language]
+    source_path = importlib.util.find_spec(module_name).origin
+
+    # Solo usar el JSON si es más reciente que el módulo fuente
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(source_path):
+        try:
+            with open(cache_path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            # Archivo precompilado dañado: usar el módulo fuente
+            pass
+
+    module = importlib.import_module(module_name)
+    return getattr(module, name)
+
+def get_content(name: str, language: str = None):
+    """
+    Get a static content entry, loading it on first access.
+
+    Args:
+        name (str): Content name (e.g. "definite_integrals_study_plan")
+        language (str): Language code; defaults to the session language
+
+    Returns:
+        The content (dict or list); shared between callers, do not modify it
+    """
+    if language is None:
+        import streamlit as st
+        language = st.session_state.get("language", DEFAULT_CONTENT_LANGUAGE)
+
+    return _load_content(name, _resolve_language(name, language))
+
+def precompile_content(directory: str = None) -> list:
+    """
+    Write every content entry to JSON so later loads skip importing the source modules.
+
+    Args:
+        directory (str): Output directory; defaults to CONTENT_CACHE_DIR
+
+    Returns:
+        list: Paths of the files written
+    """
+    global CONTENT_CACHE_DIR
+
+    if directory is not None:
+        CONTENT_CACHE_DIR = directory
+    os.makedirs(CONTENT_CACHE_DIR, exist_ok=True)
+
+    written = []
+    for name, sources in CONTENT_SOURCES.items():
+        for language in sources:
+            module = importlib.import_module(sources[language])
+            path = _content_cache_path(name, language)
+            with open(path, "w", encoding="utf-8") as cache_file:
+                json.dump(getattr(module, name), cache_file, ensure_ascii=False)
+            written.append(path)
+
+    _load_content.cache_clear()
+    return written
+
+if __name__ == "__main__":
+    for path in precompile_content():
+        print(path)
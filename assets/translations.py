@@ -1,4 +1,8 @@
 import streamlit as st
+import logging
+import threading
+from string import Formatter
+from types import MappingProxyType
 
 # Language configuration
 LANGUAGES = {
@@ -231,6 +235,14 @@ TRANSLATIONS = {
         "es": "Punto Medio",
         "en": "Midpoint"
     },
+    "method_trapezoid": {
+        "es": "Trapecio",
+        "en": "Trapezoid"
+    },
+    "method_simpson": {
+        "es": "Simpson",
+        "en": "Simpson"
+    },
     
     # Examples
     "example_problems": {
@@ -293,6 +305,86 @@ TRANSLATIONS = {
         "es": "Descargar Solución",
         "en": "Download Solution"
     },
+    "full_sample_table": {
+        "es": "Tabla Completa de Puntos de Muestra",
+        "en": "Full Sample Point Table"
+    },
+    "table_page": {
+        "es": "Página",
+        "en": "Page"
+    },
+    "download_table_csv": {
+        "es": "Descargar Tabla (CSV)",
+        "en": "Download Table (CSV)"
+    },
+    "show_performance": {
+        "es": "Mostrar rendimiento",
+        "en": "Show performance"
+    },
+    "performance_report": {
+        "es": "Rendimiento de esta ejecución",
+        "en": "Performance of this run"
+    },
+    "rerun_time": {
+        "es": "Tiempo total",
+        "en": "Total time"
+    },
+    "performance_counters": {
+        "es": "Contadores",
+        "en": "Counters"
+    },
+    "cache_statistics": {
+        "es": "Estadísticas de caché",
+        "en": "Cache statistics"
+    },
+    "export_data": {
+        "es": "Exportar Datos (f, f' e Integral Acumulada)",
+        "en": "Export Data (f, f' and Running Integral)"
+    },
+    "export_points": {
+        "es": "Número de puntos",
+        "en": "Number of points"
+    },
+    "export_format": {
+        "es": "Formato",
+        "en": "Format"
+    },
+    "export_cli_hint": {
+        "es": "Hasta {max_points} puntos desde el navegador; para más usa python -m utils.data_export",
+        "en": "Up to {max_points} points from the browser; for more use python -m utils.data_export"
+    },
+    "prepare_export": {
+        "es": "Preparar archivo",
+        "en": "Prepare file"
+    },
+    "download_export": {
+        "es": "Descargar Datos",
+        "en": "Download Data"
+    },
+    "applied_integrals": {
+        "es": "Aplicaciones de la Integral",
+        "en": "Applications of the Integral"
+    },
+    "surface_area_revolution": {
+        "es": "Área de superficie de revolución",
+        "en": "Surface area of revolution"
+    },
+    "average_value": {
+        "es": "Valor promedio",
+        "en": "Average value"
+    },
+    "improper_integral": {
+        "es": "Integral impropia",
+        "en": "Improper integral"
+    },
+    "singular_points": {
+        "es": "Puntos singulares",
+        "en": "Singular points"
+    },
+    "error_estimate": {
+        "es": "Error estimado",
+        "en": "Error estimate"
+    },
     
     # Steps and calculations
     "step": {
@@ -1331,36 +1423,146 @@ TRANSLATIONS = {
     }
 }
 
-def get_text(key: str, **kwargs) -> str:
+def _compile_catalogs(translations: dict, languages: dict):
     """
-    Get translated text for the current language.
+    Flatten the nested translation dictionary into one frozen catalog per language.
+    
+    Returns:
+        tuple: (catalogs, templates, missing) where catalogs maps language -> {key: text},
+        templates maps language -> frozenset of keys whose text has format fields,
+        and missing maps language -> sorted keys without a translation in that language
+    """
+    catalogs = {}
+    templates = {}
+    missing = {}
+    
+    for language in languages:
+        catalog = {}
+        template_keys = set()
+        missing_keys = []
+        
+        for key, entry in translations.items():
+            if language not in entry:
+                missing_keys.append(key)
+            text = entry.get(language, entry.get("es", key))
+            catalog[key] = text
+            
+            # Precompilar: solo los textos con campos {name} pasan por str.format
+            try:
+                if any(field is not None for _, field, _, _ in Formatter().parse(text)):
+                    template_keys.add(key)
+            except ValueError:
+                pass
+        
+        catalogs[language] = MappingProxyType(catalog)
+        templates[language] = frozenset(template_keys)
+        missing[language] = sorted(missing_keys)
+    
+    return MappingProxyType(catalogs), MappingProxyType(templates), MappingProxyType(missing)
+
+CATALOGS, TEMPLATE_KEYS, MISSING_TRANSLATIONS = _compile_catalogs(TRANSLATIONS, LANGUAGES)
+
+# Idioma activo por hilo: Streamlit ejecuta cada rerun de una sesión en su propio hilo
+_active = threading.local()
+
+logger = logging.getLogger("calculo.translations")
+
+# Claves solicitadas que no existen en el catálogo (se reportan una sola vez)
+_reported_missing_keys = set()
+
+def check_translations() -> dict:
+    """
+    Report translation keys missing for each language.
+    
+    Returns:
+        dict: Language code -> list of keys without a translation in that language
+    """
+    incomplete = {language: list(keys) for language, keys in MISSING_TRANSLATIONS.items() if keys}
+    for language, keys in incomplete.items():
+        logger.warning("Missing '%s' translations for %d keys: %s", language, len(keys), ", ".join(keys))
+    return incomplete
+
+# Verificación al arrancar: avisar de claves sin traducir en algún idioma
+check_translations()
+
+def bind_language(language_code: str = None):
+    """
+    Bind the catalog of a language for the current rerun.
+    
+    Called once at the start of each rerun so get_text does not read
+    session_state on every call.
     
     Args:
-        key (str): Translation key
-        **kwargs: Optional parameters for string formatting
+        language_code (str): Language code (es, en); defaults to the session language
+    """
+    if language_code is None:
+        language_code = st.session_state.get("language", "es")
+    if language_code not in CATALOGS:
+        language_code = "es"
+    
+    _active.language = language_code
+    _active.catalog = CATALOGS[language_code]
+    _active.templates = TEMPLATE_KEYS[language_code]
+
+def get_translator(language_code: str = None):
+    """
+    Get a text lookup function bound to one language.
+    
+    Args:
+        language_code (str): Language code (es, en); defaults to the session language
     
     Returns:
-        str: Translated text
+        Callable[..., str]: Function with the same signature as get_text
     """
-    # Get current language from session state, default to Spanish
-    current_language = st.session_state.get("language", "es")
+    if language_code is None:
+        language_code = st.session_state.get("language", "es")
+    catalog = CATALOGS.get(language_code, CATALOGS["es"])
+    templates = TEMPLATE_KEYS.get(language_code, TEMPLATE_KEYS["es"])
     
-    # Get translation, fallback to key if not found
-    if key in TRANSLATIONS:
-        translation = TRANSLATIONS[key].get(current_language, TRANSLATIONS[key].get("es", key))
-    else:
-        translation = key
+    def translate(key: str, **kwargs) -> str:
+        return _lookup(catalog, templates, key, kwargs)
     
-    # Apply formatting if kwargs provided
-    if kwargs:
+    return translate
+
+def _lookup(catalog, templates, key: str, kwargs: dict) -> str:
+    """Resolve a key in a compiled catalog, formatting only precompiled templates."""
+    translation = catalog.get(key)
+    
+    if translation is None:
+        # Fallback to the key itself, but report it once instead of failing silently
+        if key not in _reported_missing_keys:
+            _reported_missing_keys.add(key)
+            logger.warning("Missing translation key: '%s'", key)
+        return key
+    
+    if kwargs and key in templates:
         try:
             translation = translation.format(**kwargs)
-        except (KeyError, ValueError):
+        except (KeyError, ValueError, IndexError):
             # If formatting fails, return original translation
             pass
     
     return translation
 
+def get_text(key: str, **kwargs) -> str:
+    """
+    Get translated text for the current language.
+    
+    Args:
+        key (str): Translation key
+        **kwargs: Optional parameters for string formatting
+    
+    Returns:
+        str: Translated text
+    """
+    catalog = getattr(_active, "catalog", None)
+    if catalog is None:
+        # Sin idioma enlazado en este hilo (p. ej. fuera de app.main): leer la sesión
+        bind_language()
+        catalog = _active.catalog
+    
+    return _lookup(catalog, _active.templates, key, kwargs)
+
 def get_available_languages() -> dict:
     """
     Get available languages.
@@ -1381,3 +1583,5 @@ def set_language(language_code: str):
         st.session_state.language = language_code
     else:
         st.session_state.language = "es"  # Default to Spanish
+    
+    bind_language(st.session_state.language)
@@ -0,0 +1,133 @@
+"""
+Benchmark corpus built from the functions the application actually ships.
+
+Cases come from the engineering scenario templates, the study plan examples
+and the case-study system metrics; two-function cases come from the
+area-between-curves examples, so benchmarks exercise real inputs.
+"""
+
+from typing import Dict, List
+
+from assets.content_store import get_content
+from utils.expression_parser import safe_sympify
+from utils.random_generator import ENGINEERING_TEMPLATES
+
+# Intervalo fijo para las plantillas de ingeniería (generate_safe_bounds es aleatorio)
+TEMPLATE_BOUNDS = ("0", "10")
+
+def _detect_variable(function_str: str) -> str:
+    """Pick the variable a study-plan example is written in (x, t or n)."""
+    success, expr = safe_sympify(function_str, "x")
+    if success:
+        names = {symbol.name for symbol in expr.free_symbols}
+        for variable in ("x", "t", "n"):
+            if variable in names:
+                return variable
+    return "x"
+
+def _template_cases() -> List[Dict]:
+    cases = []
+    for template in ENGINEERING_TEMPLATES:
+        for index, function_str in enumerate(template["functions"]):
+            cases.append({
+                "name": f"template:{template['type']}:{index}",
+                "function": function_str,
+                "variable": "t",
+                "lower": TEMPLATE_BOUNDS[0],
+                "upper": TEMPLATE_BOUNDS[1]
+            })
+    return cases
+
+def _study_plan_examples(content, source: str) -> List[Dict]:
+    """Collect every {"function", "bounds"} example nested in a study plan."""
+    cases = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            if "function" in node and "bounds" in node:
+                function_str = node["function"]
+                variable = _detect_variable(function_str)
+                cases.append({
+                    "name": f"{source}:{len(cases)}",
+                    "function": function_str,
+                    "variable": variable,
+                    "lower": str(node["bounds"][0]),
+                    "upper": str(node["bounds"][1])
+                })
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(content)
+    return cases
+
+def _system_metric_cases() -> List[Dict]:
+    from pages.software_engineering_scenarios import SYSTEM_METRICS
+
+    return [
+        {
+            "name": f"metric:{index}",
+            "function": metric["function"],
+            "variable": metric["variable"],
+            "lower": metric["lower"],
+            "upper": metric["upper"]
+        }
+        for index, metric in enumerate(SYSTEM_METRICS.values())
+    ]
+
+def build_corpus() -> List[Dict]:
+    """
+    Build the full benchmark corpus.
+
+    Returns:
+        List[Dict]: Cases with name, function, variable, lower and upper
+    """
+    corpus = _template_cases()
+    for name in ("definite_integrals_study_plan", "riemann_sums_study_plan",
+                 "engineering_scenarios_study_plan", "additional_integral_examples"):
+        corpus.extend(_study_plan_examples(get_content(name, "es"), name))
+    corpus.extend(_system_metric_cases())
+    return corpus
+
+def build_pairs() -> List[Dict]:
+    """
+    Build the two-function corpus from the area-between-curves examples.
+
+    Returns:
+        List[Dict]: Cases with name, func1, func2, variable, lower and upper
+    """
+    from assets.simple_examples import area_between_curves_examples
+
+    pairs = [
+        {
+            "name": f"area_example:{index}",
+            "func1": example["function1"],
+            "func2": example["function2"],
+            "variable": "x",
+            "lower": str(example["lower_bound"]),
+            "upper": str(example["upper_bound"])
+        }
+        for index, example in enumerate(area_between_curves_examples.values())
+    ]
+
+    def walk(node):
+        if isinstance(node, dict):
+            if "function1" in node and "function2" in node and "bounds" in node:
+                pairs.append({
+                    "name": f"area_between_curves_study_plan:{len(pairs)}",
+                    "func1": node["function1"],
+                    "func2": node["function2"],
+                    "variable": _detect_variable(f"({node['function1']}) + ({node['function2']})"),
+                    "lower": str(node["bounds"][0]),
+                    "upper": str(node["bounds"][1])
+                })
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(get_content("area_between_curves_study_plan", "es"))
+    return pairs
@@ -0,0 +1,219 @@
+"""
+Replay scripted page interactions outside the browser and profile each rerun.
+
+The app is driven through Streamlit's AppTest. Every interaction (open a
+page, load an example, change n, switch language...) triggers one rerun
+whose latency is recorded and whose profile is written to disk:
+
+    python -m benchmarks.replay                       # all scenarios
+    python -m benchmarks.replay riemann_sums -o prof  # one scenario
+
+Profiles are cProfile ``.prof`` files (snakeviz, flameprof, gprof2dot); when
+pyinstrument is installed, a speedscope ``.speedscope.json`` flame graph is
+written as well. A ``summary.json`` with the latencies is written alongside.
+"""
+
+import argparse
+import cProfile
+import json
+import logging
+import os
+import pstats
+import runpy
+import sys
+import time
+import warnings
+from typing import Callable, Dict, List, Tuple
+
+# ✅ IMPORT OPCIONAL DE PYINSTRUMENT
+try:
+    from pyinstrument import Profiler as InstrumentProfiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+DEFAULT_OUTPUT_DIR = "profiles"
+
+# Tiempo máximo por rerun (la primera carga importa SymPy/Plotly)
+RERUN_TIMEOUT = 300
+
+# Profilers for the rerun in progress; the script thread reads them
+_active_profilers: Dict[str, object] = {}
+
+Step = Tuple[str, Callable[[AppTest], None]]
+
+def _open_page(page: str) -> Callable[[AppTest], None]:
+    return lambda at: at.radio(key="page_selector").set_value(page)
+
+def _click(key: str) -> Callable[[AppTest], None]:
+    return lambda at: at.button(key=key).click()
+
+def _set_number(key: str, value) -> Callable[[AppTest], None]:
+    return lambda at: at.number_input(key=key).set_value(value)
+
+def _switch_language(language: str) -> Callable[[AppTest], None]:
+    return lambda at: at.selectbox(key="language_selector").select(language)
+
+# Scenario name -> interactions replayed after the initial load
+SCENARIOS: Dict[str, List[Step]] = {
+    "definite_integrals": [
+        ("load_example", _click("load_integral_example")),
+        ("calculate", _click("calculate_integral")),
+        ("switch_language", _switch_language("en")),
+    ],
+    "riemann_sums": [
+        ("open_page", _open_page("riemann_sums")),
+        ("load_example", _click("load_riemann_example")),
+        ("calculate", _click("calculate_riemann")),
+        ("n_100", _set_number("riemann_n_input", 100)),
+        ("n_1000", _set_number("riemann_n_input", 1000)),
+        ("compare_methods", _click("compare_riemann_methods")),
+        ("switch_language", _switch_language("en")),
+    ],
+    "area_between_curves": [
+        ("open_page", _open_page("area_between_curves")),
+        ("load_example", _click("load_area_example")),
+        ("calculate", _click("calculate_area")),
+        ("find_intersections", _click("find_intersections")),
+        ("switch_language", _switch_language("en")),
+    ],
+}
+
+def _profiled_app():
+    """Script run by AppTest: profile one rerun of app.py inside the script thread."""
+    from benchmarks.replay import run_app_profiled
+    run_app_profiled()
+
+def run_app_profiled():
+    """Run app.py under the profilers registered for the current rerun."""
+    profilers = dict(_active_profilers)
+
+    for profiler in profilers.values():
+        if isinstance(profiler, cProfile.Profile):
+            profiler.enable()
+        else:
+            profiler.start()
+
+    try:
+        runpy.run_path(APP_PATH, run_name="__main__")
+    finally:
+        for profiler in profilers.values():
+            if isinstance(profiler, cProfile.Profile):
+                profiler.disable()
+            else:
+                profiler.stop()
+
+def _profile_rerun(at: AppTest, output_prefix: str) -> Dict:
+    """Run one rerun with fresh profilers and write their output."""
+    _active_profilers.clear()
+    _active_profilers["cprofile"] = cProfile.Profile()
+    if PYINSTRUMENT_AVAILABLE:
+        _active_profilers["pyinstrument"] = InstrumentProfiler(async_mode="disabled")
+
+    start_time = time.perf_counter()
+    at.run(timeout=RERUN_TIMEOUT)
+    latency = time.perf_counter() - start_time
+
+    files = []
+    cprofile_path = f"{output_prefix}.prof"
+    _active_profilers["cprofile"].dump_stats(cprofile_path)
+    files.append(cprofile_path)
+
+    if PYINSTRUMENT_AVAILABLE:
+        speedscope_path = f"{output_prefix}.speedscope.json"
+        with open(speedscope_path, "w", encoding="utf-8") as speedscope_file:
+            speedscope_file.write(_active_profilers["pyinstrument"].output(SpeedscopeRenderer()))
+        files.append(speedscope_path)
+
+    _active_profilers.clear()
+
+    return {
+        "latency": latency,
+        "exceptions": [str(exception.message) for exception in at.exception],
+        "files": files
+    }
+
+def replay_scenario(name: str, output_dir: str = DEFAULT_OUTPUT_DIR) -> List[Dict]:
+    """
+    Replay a scenario from a fresh session, profiling every rerun.
+
+    Args:
+        name (str): Scenario name (key of SCENARIOS)
+        output_dir (str): Directory for the profile files
+
+    Returns:
+        List[Dict]: One entry per interaction with step, latency, exceptions and files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    at = AppTest.from_function(_profiled_app, default_timeout=RERUN_TIMEOUT)
+
+    results = []
+    steps = [("initial_load", None)] + SCENARIOS[name]
+    for index, (label, action) in enumerate(steps):
+        if action is not None:
+            action(at)
+        output_prefix = os.path.join(output_dir, f"{name}-{index:02d}-{label}")
+        result = _profile_rerun(at, output_prefix)
+        result["step"] = label
+        results.append(result)
+
+    return results
+
+def top_functions(profile_path: str, limit: int = 5) -> List[Tuple[str, float]]:
+    """
+    Get the application functions with the highest cumulative time in a cProfile file.
+
+    Returns:
+        List[Tuple[str, float]]: (module:line(function), cumulative seconds) for code
+        in pages/, components/, utils/ and assets/
+    """
+    repo_root = os.path.dirname(APP_PATH)
+    stats = pstats.Stats(profile_path)
+    entries = []
+    for (filename, line, function), (_, _, _, cumulative, _) in stats.stats.items():
+        relative_path = os.path.relpath(filename, repo_root) if os.path.isabs(filename) else filename
+        if relative_path.split(os.sep)[0] not in ("pages", "components", "utils", "assets"):
+            continue
+        entries.append((f"{relative_path}:{line}({function})", cumulative))
+    entries.sort(key=lambda entry: entry[1], reverse=True)
+    return entries[:limit]
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay page interactions and profile each rerun")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to replay (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    summary = {}
+    for name in args.scenarios or list(SCENARIOS):
+        if name not in SCENARIOS:
+            print(f"Unknown scenario: {name}")
+            return 2
+
+        summary[name] = replay_scenario(name, args.output_dir)
+        for result in summary[name]:
+            status = "ERROR" if result["exceptions"] else "ok"
+            print(f"{name:<22} {result['step']:<20} {result['latency'] * 1000:10.1f} ms  {status}")
+            for function, cumulative in top_functions(result["files"][0], limit=3):
+                print(f"{'':<44}{cumulative * 1000:10.1f} ms  {function}")
+
+    summary_path = os.path.join(args.output_dir, "summary.json")
+    with open(summary_path, "w", encoding="utf-8") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    print(f"Summary written to {summary_path}")
+
+    failed = any(result["exceptions"] for results in summary.values() for result in results)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    # Usar el módulo importado: el script de AppTest comparte sus _active_profilers
+    from benchmarks.replay import main as replay_main
+    sys.exit(replay_main())
@@ -0,0 +1,254 @@
+"""
+Benchmark runner with JSON baselines and regression thresholds.
+
+Usage (from the repository root):
+
+    python -m benchmarks.run                  # run and compare with the baseline
+    python -m benchmarks.run --save           # run and store a new baseline
+    python -m benchmarks.run -k riemann       # only benchmarks whose name contains "riemann"
+
+Each benchmark runs over the whole corpus (or a fixed slice of it for the
+slow ones) with cold caches; the median of the repeats is compared against
+the baseline and the run fails when it exceeds baseline * threshold.
+
+Baselines are absolute timings of one machine, so they are not versioned:
+save one locally (--save) before changing the code, then compare against it
+on the same host. A baseline from another platform or Python is reported.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.corpus import build_corpus, build_pairs
+from utils.instrumentation import clear_caches
+from utils.expression_parser import safe_sympify, safe_float_conversion, evaluate_expression_at_point
+from utils.calculator import calculate_definite_integral_robust
+from utils.riemann_sum import calculate_riemann_sum
+from utils.area_between_curves import calculate_area_between_curves, find_intersection_points
+from utils import plotting
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Máximo permitido respecto al baseline antes de considerarlo regresión
+DEFAULT_THRESHOLD = 1.5
+
+DEFAULT_REPEATS = 3
+
+# Casos usados por los benchmarks lentos (integración simbólica, gráficas)
+SLOW_CASE_LIMIT = 12
+
+# Benchmark name -> (function(corpus, pairs), threshold)
+BENCHMARKS: Dict[str, tuple] = {}
+
+def benchmark(name: str, threshold: float = DEFAULT_THRESHOLD):
+    """Register a benchmark function under a name."""
+    def decorator(function: Callable):
+        BENCHMARKS[name] = (function, threshold)
+        return function
+    return decorator
+
+def _bounds(case: Dict) -> tuple:
+    success, lower = safe_float_conversion(case["lower"])
+    success, upper = safe_float_conversion(case["upper"])
+    return lower, upper
+
+def _call(function: Callable, *args):
+    """Call a calculator function, ignoring the errors the pages would show to the user."""
+    try:
+        return function(*args)
+    except Exception:
+        return None
+
+@benchmark("parser.safe_sympify")
+def bench_safe_sympify(corpus, pairs):
+    for case in corpus:
+        safe_sympify(case["function"], case["variable"])
+
+@benchmark("parser.evaluate_expression_at_point")
+def bench_evaluate_expression_at_point(corpus, pairs):
+    for case in corpus:
+        success, expr = safe_sympify(case["function"], case["variable"])
+        lower, upper = _bounds(case)
+        for point in np.linspace(lower, upper, 50):
+            evaluate_expression_at_point(expr, case["variable"], float(point))
+
+@benchmark("calculator.calculate_definite_integral_robust", threshold=2.0)
+def bench_definite_integral(corpus, pairs):
+    for case in corpus[::max(1, len(corpus) // SLOW_CASE_LIMIT)]:
+        calculate_definite_integral_robust(case["function"], case["lower"], case["upper"], case["variable"])
+
+@benchmark("riemann.calculate_riemann_sum")
+def bench_riemann_sum(corpus, pairs):
+    for case in corpus:
+        lower, upper = _bounds(case)
+        for method in ("left", "right", "midpoint"):
+            _call(calculate_riemann_sum, case["function"], lower, upper, 100, method, case["variable"])
+
+@benchmark("area.calculate_area_between_curves", threshold=2.0)
+def bench_area_between_curves(corpus, pairs):
+    for pair in pairs:
+        _call(calculate_area_between_curves, pair["func1"], pair["func2"], pair["lower"], pair["upper"], pair["variable"])
+
+@benchmark("area.find_intersection_points", threshold=2.0)
+def bench_find_intersection_points(corpus, pairs):
+    for pair in pairs:
+        _call(find_intersection_points, pair["func1"], pair["func2"], pair["variable"])
+
+def _plot_cases(corpus):
+    return corpus[::max(1, len(corpus) // SLOW_CASE_LIMIT)]
+
+@benchmark("plotting.plot_integral")
+def bench_plot_integral(corpus, pairs):
+    for case in _plot_cases(corpus):
+        plotting.plot_integral(case["function"], case["lower"], case["upper"], case["variable"])
+
+@benchmark("plotting.plot_riemann_sum")
+def bench_plot_riemann_sum(corpus, pairs):
+    for case in _plot_cases(corpus):
+        lower, upper = _bounds(case)
+        plotting.plot_riemann_sum(case["function"], lower, upper, 50, "midpoint", case["variable"])
+
+@benchmark("plotting.plot_area_between_curves")
+def bench_plot_area_between_curves(corpus, pairs):
+    for pair in pairs:
+        lower, upper = _bounds(pair)
+        plotting.plot_area_between_curves(pair["func1"], pair["func2"], str(lower), str(upper), pair["variable"])
+
+@benchmark("plotting.create_comparison_plot")
+def bench_create_comparison_plot(corpus, pairs):
+    for case in _plot_cases(corpus):
+        plotting.create_comparison_plot(case["function"], case["lower"], case["upper"], case["variable"])
+
+@benchmark("plotting.plot_volume_3d")
+def bench_plot_volume_3d(corpus, pairs):
+    for case in _plot_cases(corpus):
+        plotting.plot_volume_3d(case["function"], case["lower"], case["upper"], case["variable"])
+
+@benchmark("plotting.export_plot_data")
+def bench_export_plot_data(corpus, pairs):
+    for case in _plot_cases(corpus):
+        plotting.export_plot_data(case["function"], case["lower"], case["upper"], case["variable"])
+
+def run_benchmarks(name_filter: str = None, repeats: int = DEFAULT_REPEATS) -> Dict[str, Dict]:
+    """
+    Run the registered benchmarks.
+
+    Args:
+        name_filter (str): Only run benchmarks whose name contains this text
+        repeats (int): Number of cold runs per benchmark
+
+    Returns:
+        Dict[str, Dict]: Benchmark name -> {"median", "min", "runs"} in seconds
+    """
+    corpus = build_corpus()
+    pairs = build_pairs()
+    results = {}
+
+    for name, (function, threshold) in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+
+        runs = []
+        for _ in range(repeats):
+            clear_caches()
+            start_time = time.perf_counter()
+            function(corpus, pairs)
+            runs.append(time.perf_counter() - start_time)
+
+        results[name] = {"median": statistics.median(runs), "min": min(runs), "runs": runs}
+
+    return results
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict:
+    """Load a stored baseline, or an empty one if it does not exist."""
+    if not os.path.exists(path):
+        return {"benchmarks": {}}
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+def save_baseline(results: Dict[str, Dict], path: str = BASELINE_PATH):
+    """Store benchmark medians as the new baseline."""
+    baseline = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {
+            name: {"median": result["median"], "threshold": BENCHMARKS[name][1]}
+            for name, result in results.items()
+        }
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+
+def compare_with_baseline(results: Dict[str, Dict], baseline: Dict) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        List[str]: Names of the benchmarks slower than baseline * threshold
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            continue
+        if result["median"] > reference["median"] * reference.get("threshold", DEFAULT_THRESHOLD):
+            regressions.append(name)
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the calculator benchmarks")
+    parser.add_argument("-k", dest="name_filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    # Las gráficas se construyen sin servidor de Streamlit
+    warnings.filterwarnings("ignore")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    results = run_benchmarks(args.name_filter, args.repeats)
+    baseline = load_baseline(args.baseline)
+
+    host = (platform.python_version(), platform.platform())
+    if baseline["benchmarks"] and (baseline.get("python"), baseline.get("platform")) != host:
+        print(f"WARNING: baseline recorded on Python {baseline.get('python')} / {baseline.get('platform')}, "
+              f"timings are not comparable with this host")
+
+    for name, result in results.items():
+        reference = baseline["benchmarks"].get(name)
+        change = f"{result['median'] / reference['median']:.2f}x" if reference else "new"
+        print(f"{name:<48} {result['median'] * 1000:10.1f} ms  ({change})")
+
+    if args.save:
+        if args.name_filter:
+            # Mantener los benchmarks que no se ejecutaron
+            merged = {name: {"median": entry["median"]} for name, entry in baseline["benchmarks"].items()
+                      if name in BENCHMARKS}
+            merged.update(results)
+            results = merged
+        save_baseline(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline["benchmarks"]:
+        print(f"No baseline at {args.baseline}: run with --save on this machine first")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline)
+    for name in regressions:
+        print(f"REGRESSION: {name}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -74,11 +74,19 @@ def display_solution(func_str: str, lower_bound: str, upper_bound: str,
         key="download_integral_solution"
     )
 
+# Rows per page of the paginated Riemann sample table
+RIEMANN_TABLE_PAGE_SIZE = 50
+
 def display_riemann_sum_solution(func_str: str, lower_bound: float, upper_bound: float, 
-                                n: int, method: str, result: float, steps: list, 
-                                diagram_provided: bool = True, variable: str = "x"):
+                                n: int, method: str, result: float, steps, 
+                                diagram_provided: bool = True, variable: str = "x",
+                                sample_table=None):
     """
     Display the solution to a Riemann sum calculation with step-by-step workings.
+    
+    `steps` may be a lazy iterable (see iter_riemann_sum_steps). If `sample_table`
+    is given, the full per-subinterval data is shown one page at a time and offered
+    as a CSV download, so rendering cost does not depend on n.
     """
     st.markdown("## " + get_text("riemann_sum_solution"))
     
@@ -94,9 +102,31 @@ def display_riemann_sum_solution(func_str: str, lower_bound: float, upper_bound:
     
     with st.expander(get_text("show_solution_steps"), expanded=True):
         for i, step in enumerate(steps):
-            st.markdown(step)
-            if i < len(steps) - 1:
+            if i > 0:
                 st.markdown("---")
+            st.markdown(step)
+    
+    # Full sample table, paginated
+    if sample_table is not None:
+        with st.expander(get_text("full_sample_table"), expanded=False):
+            total_pages = max(1, -(-len(sample_table) // RIEMANN_TABLE_PAGE_SIZE))
+            page = st.number_input(
+                f"{get_text('table_page')} (1-{total_pages})",
+                min_value=1,
+                max_value=total_pages,
+                value=1,
+                key="riemann_table_page"
+            )
+            start = (int(page) - 1) * RIEMANN_TABLE_PAGE_SIZE
+            st.dataframe(sample_table.iloc[start:start + RIEMANN_TABLE_PAGE_SIZE], use_container_width=True)
+            
+            st.download_button(
+                label=get_text("download_table_csv"),
+                data=sample_table.to_csv(index=False),
+                file_name=f"riemann_{method}_n{n}.csv",
+                mime="text/csv",
+                key="download_riemann_table"
+            )
     
     # Explanation of what the Riemann sum represents
     with st.expander(get_text("what_riemann_represents"), expanded=False):
@@ -294,6 +324,31 @@ def display_error_message(error_type: str, error_details: str):
             st.markdown(f"- {get_text('try_simpler_function')}")
             st.markdown(f"- {get_text('contact_support')}")
 
+def integration_steps(details: dict, variable: str = "x") -> list:
+    """
+    Markdown steps describing how calculate_definite_integral_robust got its result.
+    
+    Improper integrals list the singular points and, for every piece, the
+    transformation used, its value and its convergence status.
+    """
+    steps = [f"**{get_text('method')}:** {details.get('method_used', '')}"]
+    
+    improper = details.get("improper")
+    if improper:
+        singular = ", ".join(f"{variable} = {point:g}" for point in improper["singularities"]) or "—"
+        steps.append(f"**{get_text('improper_integral')}** — {get_text('singular_points')}: {singular}")
+        for piece in improper["pieces"]:
+            lower, upper = piece["interval"]
+            value = f"{piece['value']:.10g}" if piece["value"] is not None else "—"
+            steps.append(f"$[{lower:g}, {upper:g}]$ ({piece['transformation']}): {value} "
+                         f"· {piece['status']} · n = {piece['evaluations']}")
+    
+    error = details.get("approximation_error")
+    if isinstance(error, float):
+        steps.append(f"**{get_text('error_estimate')}:** {error:.2e}")
+    
+    return steps
+
 def create_solution_summary(calculation_type: str, inputs: dict, result: float):
     """
     Create a summary card for the solution.
@@ -370,3 +425,130 @@ def create_result_comparison(results: dict, labels: dict = None):
         
         df = pd.DataFrame(data)
         st.dataframe(df, use_container_width=True)
+
+def display_performance_report(report: dict):
+    """
+    Display the timings, counters and cache statistics of a performance report.
+    """
+    import pandas as pd
+    
+    with st.expander("⏱️ " + get_text("performance_report")):
+        st.metric(get_text("rerun_time"), f"{report['total_time'] * 1000:.1f} ms")
+        
+        if report["stages"]:
+            stages = sorted(report["stages"].items(), key=lambda item: item[1]["total_time"], reverse=True)
+            st.dataframe(pd.DataFrame([
+                {"Stage": name, "Calls": entry["calls"], "Time (ms)": round(entry["total_time"] * 1000, 2)}
+                for name, entry in stages
+            ]), use_container_width=True)
+        
+        if report["counters"]:
+            st.markdown("**" + get_text("performance_counters") + "**")
+            st.json(report["counters"])
+        
+        caches = {name: stats for name, stats in report["caches"].items() if stats["hits"] or stats["misses"]}
+        if caches:
+            st.markdown("**" + get_text("cache_statistics") + "**")
+            st.dataframe(pd.DataFrame([
+                {"Cache": name, "Hits": stats["hits"], "Misses": stats["misses"]}
+                for name, stats in caches.items()
+            ]), use_container_width=True)
+        
+        for event in report["events"]:
+            st.caption("⚠️ " + event)
+
+# Máximo de filas exportables desde el navegador: download_button guarda el archivo
+# entero en memoria, así que las exportaciones grandes van por la CLI de utils.data_export
+EXPORT_UI_MAX_POINTS = 100_000
+
+def display_data_export(func_str: str, lower_bound: str, upper_bound: str, variable: str = "x"):
+    """
+    Display the export of f, f' and the running integral at a user-chosen resolution.
+    
+    The file is generated only when the prepare button is clicked and kept in
+    the session until the inputs change, when it is dropped, so rendering the
+    page costs nothing. Streamlit holds downloads in memory, so the resolution
+    is capped at EXPORT_UI_MAX_POINTS; larger exports use the streaming CLI
+    (python -m utils.data_export).
+    """
+    import io
+    from utils.data_export import (export_samples, available_export_formats, EXPORT_FORMATS,
+                                   DEFAULT_EXPORT_POINTS)
+    
+    with st.expander("📤 " + get_text("export_data")):
+        col1, col2 = st.columns(2)
+        with col1:
+            num_points = st.number_input(
+                get_text("export_points"),
+                min_value=2,
+                max_value=EXPORT_UI_MAX_POINTS,
+                value=DEFAULT_EXPORT_POINTS,
+                step=1000,
+                key="export_num_points",
+                help=get_text("export_cli_hint", max_points=f"{EXPORT_UI_MAX_POINTS:,}")
+            )
+        with col2:
+            file_format = st.selectbox(
+                get_text("export_format"),
+                available_export_formats(),
+                format_func=str.upper,
+                key="export_format"
+            )
+        
+        mime, extension = EXPORT_FORMATS[file_format]
+        export_key = (func_str, str(lower_bound), str(upper_bound), variable, int(num_points), file_format)
+        
+        if st.button(get_text("prepare_export"), key="prepare_export"):
+            try:
+                output_file = io.BytesIO()
+                export_samples(func_str, lower_bound, upper_bound, output_file, file_format,
+                               variable, int(num_points))
+                st.session_state["export_payload"] = (export_key, output_file.getvalue())
+            except Exception as e:
+                st.error(str(e))
+        
+        # Solo se ofrece el archivo si corresponde a las entradas actuales; si no, se libera
+        payload = st.session_state.get("export_payload")
+        if payload is not None and payload[0] != export_key:
+            del st.session_state["export_payload"]
+        elif payload is not None:
+            st.download_button(
+                label=get_text("download_export"),
+                data=payload[1],
+                file_name=f"function_samples.{extension}",
+                mime=mime,
+                key="download_export"
+            )
+
+def display_integral_applications(func_str: str, lower_bound: str, upper_bound: str, variable: str = "x"):
+    """
+    Display arc length, surface area, centroid, work and average value of f on [a, b].
+    
+    All values come from one cached evaluation of f and f', so the panel
+    costs about the same as a single integral.
+    """
+    from utils.integral_applications import calculate_integral_applications
+    
+    with st.expander("🧰 " + get_text("applied_integrals")):
+        results = calculate_integral_applications(func_str, lower_bound, upper_bound, variable)
+        if "error" in results:
+            st.error(results["error"])
+            return
+        
+        def show_metric(label: str, value, formula: str):
+            if isinstance(value, str):
+                st.metric(label, "N/A", help=value)
+            elif isinstance(value, tuple):
+                st.metric(label, f"({value[0]:.4f}, {value[1]:.4f})", help=formula)
+            else:
+                st.metric(label, f"{value:.6f}", help=formula)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            show_metric(get_text("arc_length"), results["arc_length"], "L = ∫ √(1 + f'²) d" + variable)
+            show_metric(get_text("work_by_force"), results["work"], "W = ∫ F d" + variable)
+        with col2:
+            show_metric(get_text("surface_area_revolution"), results["surface_area"], "S = 2π ∫ |f| √(1 + f'²) d" + variable)
+            show_metric(get_text("average_value"), results["average_value"], "f̄ = 1/(b - a) ∫ f d" + variable)
+        with col3:
+            show_metric(get_text("center_of_mass"), results["centroid"], "(∫ x f / A, ∫ f²/2 / A)")
@@ -4,10 +4,9 @@ import numpy as np
 from utils.calculator import solve_integral
 from utils.plotting import plot_integral
 from components.math_input import create_math_input, create_function_examples
-from components.solution_display import display_solution, display_error_message, create_solution_summary
+from components.solution_display import display_solution, display_error_message, create_solution_summary, display_data_export, display_integral_applications, integration_steps
 from assets.simple_examples import definite_integral_examples
-from assets.study_plans import definite_integrals_study_plan, additional_integral_examples
-from assets.enhanced_study_plans import enhanced_definite_integrals_plan
+from assets.content_store import get_content
 from assets.translations import get_text
 
 def show():
@@ -135,7 +134,13 @@ def show_calculator_tab():
             
             # Calculate integral
             with st.spinner(get_text("calculating")):
-                result, steps = solve_integral(func_str, a, b, var)
+                success, result, details = solve_integral(func_str, a, b, var)
+            
+            # Divergencia, singularidades no integrables o entradas inválidas
+            if not success:
+                display_error_message("calculation_error", result)
+                return
+            steps = integration_steps(details, var)
             
             # Create summary
             inputs = {
@@ -158,6 +163,11 @@ def show_calculator_tab():
         except Exception as e:
             display_error_message("unexpected_error", str(e))
     
+    # Aplicaciones (una sola evaluación cacheada) y exportación (se genera solo al pulsar preparar)
+    if function_input.strip() and lower_bound.strip() and upper_bound.strip():
+        display_integral_applications(function_input, lower_bound, upper_bound, variable if variable else "x")
+        display_data_export(function_input, lower_bound, upper_bound, variable if variable else "x")
+    
     # Theory section
     with st.expander(get_text("learn_about_definite_integrals"), expanded=False):
         st.markdown("### " + get_text("what_is_definite_integral"))
@@ -244,6 +254,7 @@ def show_examples_tab():
 
 def show_study_plan_tab():
     """Display the enhanced study plan for definite integrals."""
+    enhanced_definite_integrals_plan = get_content("enhanced_definite_integrals_plan")
     st.markdown(f"# {enhanced_definite_integrals_plan['title']}")
     st.markdown(enhanced_definite_integrals_plan['description'])
     
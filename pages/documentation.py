@@ -1,5 +1,5 @@
 import streamlit as st
-from assets.enhanced_study_plans import installation_documentation, faq_section, additional_learning_resources
+from assets.content_store import get_content
 
 def show():
     """Display comprehensive documentation for installation and usage."""
@@ -28,6 +28,7 @@ def show():
 
 def show_installation_guide():
     """Display installation instructions."""
+    installation_documentation = get_content("installation_documentation")
     st.markdown("# 🔧 Guía de Instalación")
     st.markdown("Sigue estos pasos para tener la calculadora funcionando en tu computadora")
     
@@ -81,6 +82,7 @@ streamlit run app.py
 
 def show_usage_guide():
     """Display usage instructions."""
+    installation_documentation = get_content("installation_documentation")
     st.markdown("# 🚀 Guía de Uso Rápido")
     st.markdown("Aprende a usar todas las funciones de la calculadora")
     
@@ -166,6 +168,7 @@ exp(-x**2)               # gaussiana
 
 def show_faq():
     """Display frequently asked questions."""
+    faq_section = get_content("faq_section")
     st.markdown("# ❓ Preguntas Frecuentes")
     
     for i, qa in enumerate(faq_section["questions"]):
@@ -224,6 +227,7 @@ def show_faq():
 
 def show_additional_resources():
     """Display additional learning resources."""
+    additional_learning_resources = get_content("additional_learning_resources")
     st.markdown("# 📚 Recursos Adicionales de Aprendizaje")
     st.markdown("Enlaces a recursos externos para profundizar tu conocimiento")
     
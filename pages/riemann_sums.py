@@ -1,13 +1,21 @@
 import streamlit as st
 import sympy as sp
 import numpy as np
-from utils.riemann_sum import calculate_riemann_sum, get_riemann_sum_steps, compare_riemann_methods
+from utils.riemann_sum import iter_riemann_sum_steps, get_riemann_sum_table, compare_riemann_methods, IncrementalRiemannSampler
 from utils.plotting import plot_riemann_sum
 from components.math_input import create_math_input, create_function_examples
 from components.solution_display import display_riemann_sum_solution, display_error_message, create_solution_summary
 from assets.simple_examples import riemann_sum_examples
 from assets.translations import get_text
 
+def get_riemann_sampler(function_str: str, lower_bound: float, upper_bound: float, variable: str = "x"):
+    """Return the session's sampler, rebuilding it only when the function or bounds change."""
+    sampler = st.session_state.get("riemann_sampler")
+    if sampler is None or not sampler.matches(function_str, lower_bound, upper_bound, variable):
+        sampler = IncrementalRiemannSampler(function_str, lower_bound, upper_bound, variable)
+        st.session_state.riemann_sampler = sampler
+    return sampler
+
 def show():
     st.title("📊 " + get_text("riemann_sums_calculator"))
     
@@ -110,7 +118,17 @@ def show():
             type="primary"
         )
     
+    # Keep results live only while n alone changes (the session's samples are reused);
+    # editing the function, bounds or method waits for the button again
+    live_inputs = (function_input, lower_bound, upper_bound, method)
     if calculate_button:
+        st.session_state.riemann_live_inputs = live_inputs
+    elif st.session_state.get("riemann_live_inputs") != live_inputs:
+        st.session_state.pop("riemann_live_inputs", None)
+    
+    live_results = "riemann_live_inputs" in st.session_state
+    
+    if calculate_button or live_results:
         try:
             # Validate inputs
             if not function_input.strip():
@@ -137,8 +155,11 @@ def show():
             
             # Calculate Riemann sum
             with st.spinner(get_text("calculating")):
-                riemann_sum, rectangle_areas = calculate_riemann_sum(func_str, a, b, n, method, "x")
-                steps = get_riemann_sum_steps(func_str, a, b, n, method, "x")
+                sampler = get_riemann_sampler(func_str, a, b, "x")
+                riemann_sum, rectangle_areas = sampler.riemann_sum(n, method)
+                _, sample_values = sampler.sample(n, method)
+                steps = iter_riemann_sum_steps(func_str, a, b, n, method, "x", function_values=sample_values)
+                sample_table = get_riemann_sum_table(a, b, n, method, sample_values, "x")
             
             # Create summary
             inputs = {
@@ -152,10 +173,11 @@ def show():
             
             # Display the plot
             st.markdown("### " + get_text("visualization"))
-            plot_riemann_sum(func_str, a, b, n, method, "x")
+            plot_riemann_sum(func_str, a, b, n, method, "x", sample_values=sample_values)
             
             # Display the solution
-            display_riemann_sum_solution(func_str, a, b, n, method, riemann_sum, steps, diagram_provided=True, variable="x")
+            display_riemann_sum_solution(func_str, a, b, n, method, riemann_sum, steps, diagram_provided=True, variable="x",
+                                         sample_table=sample_table)
             
         except ValueError as e:
             display_error_message("calculation_error", str(e))
@@ -211,6 +233,24 @@ def show():
                 if "midpoint_error" in comparison:
                     st.caption(f"{get_text('error')}: {comparison['midpoint_error']:.6f}")
             
+            col4, col5 = st.columns(2)
+            
+            with col4:
+                st.metric(
+                    label=get_text("method_trapezoid"),
+                    value=f"{comparison['trapezoid']:.6f}"
+                )
+                if "trapezoid_error" in comparison:
+                    st.caption(f"{get_text('error')}: {comparison['trapezoid_error']:.6f}")
+            
+            with col5:
+                st.metric(
+                    label=get_text("method_simpson"),
+                    value=f"{comparison['simpson']:.6f}"
+                )
+                if "simpson_error" in comparison:
+                    st.caption(f"{get_text('error')}: {comparison['simpson_error']:.6f}")
+            
             if "exact" in comparison and comparison["exact"] is not None:
                 st.info(f"{get_text('exact_value')}: {comparison['exact']:.6f}")
                 
@@ -218,7 +258,9 @@ def show():
                 errors = {
                     get_text("method_left"): comparison.get('left_error', float('inf')),
                     get_text("method_right"): comparison.get('right_error', float('inf')),
-                    get_text("method_midpoint"): comparison.get('midpoint_error', float('inf'))
+                    get_text("method_midpoint"): comparison.get('midpoint_error', float('inf')),
+                    get_text("method_trapezoid"): comparison.get('trapezoid_error', float('inf')),
+                    get_text("method_simpson"): comparison.get('simpson_error', float('inf'))
                 }
                 
                 best_method = min(errors, key=errors.get)
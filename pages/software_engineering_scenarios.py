@@ -1,10 +1,13 @@
 import streamlit as st
 import numpy as np
-from utils.plotting import plot_integral
+from utils.plotting import plot_integral, plot_cumulative_integral
 from components.solution_display import display_solution, display_error_message
 from components.math_input import create_math_input, create_function_examples
 from assets.translations import get_text
 from utils.calculator import calculate_definite_integral_robust
+from utils.random_generator import SCENARIO_CATEGORIES, generate_seeded_scenario, scenario_from_code
+from utils.scenario_bank import sample_scenario, solve_scenario
+from utils.session_rng import session_rng
 import pandas as pd
 
 def show():
@@ -13,10 +16,11 @@ def show():
     st.markdown("**Descubre cómo el cálculo integral impulsa la innovación tecnológica**")
     
     # Tabs optimizados
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "🧮 Calculadora Interactiva",
         "🔬 Caso de Estudio Completo", 
         "🎲 Escenarios Aleatorios",
+        "📈 Datos Medidos",
         "🎥 Recursos Educativos"
     ])
     
@@ -30,6 +34,9 @@ def show():
         show_random_scenarios()
     
     with tab4:
+        show_time_series_integration()
+    
+    with tab5:
         show_educational_resources()
 
 def show_interactive_calculator():
@@ -100,6 +107,16 @@ def show_random_scenarios():
             # ✅ GUARDAR ESCENARIO EN SESSION STATE
             st.session_state['current_scenario'] = scenario
             st.rerun()
+        
+        # ✅ REPRODUCIR UN ESCENARIO DESDE SU CÓDIGO
+        code = st.text_input("🔑 Código de escenario:", key="scenario_code_input",
+                             placeholder="p. ej. 1-9f3a1c7b")
+        if st.button("♻️ Reproducir", key="reproduce_random") and code:
+            try:
+                st.session_state['current_scenario'] = scenario_from_code(code)
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
     
     with col2:
         st.info("""
@@ -114,64 +131,12 @@ def show_random_scenarios():
     if 'current_scenario' in st.session_state:
         display_random_scenario(st.session_state['current_scenario'])
 def generate_random_scenario(difficulty, category):
-    """Generar escenario aleatorio basado en parámetros."""
-    import random
-    
-    # Templates por categoría
-    templates = {
-        "🚀 Optimización de Rendimiento": [
-            {"func": lambda: f"{random.randint(10,100)}*t**2 + {random.randint(1,20)}*t", 
-             "context": "Tiempo de procesamiento de algoritmo O(n²)",
-             "bounds": [0, random.randint(50, 200)]},
-            {"func": lambda: f"{random.randint(20,150)}*exp(-{random.uniform(0.1,0.5):.2f}*t)", 
-             "context": "Degradación de cache después de pico",
-             "bounds": [0, random.randint(10, 60)]}
-        ],
-        "📊 Machine Learning": [
-            {"func": lambda: f"{random.uniform(0.5,2.0):.2f}*exp(-{random.uniform(0.01,0.2):.3f}*t)", 
-             "context": "Función de pérdida durante entrenamiento",
-             "bounds": [0, random.randint(100, 1000)]},
-            {"func": lambda: f"{random.randint(5,25)}*log(t+1) + {random.randint(1,10)}", 
-             "context": "Convergencia de accuracy en epochs",
-             "bounds": [1, random.randint(50, 200)]}
-        ],
-        "🌐 Sistemas Distribuidos": [
-            {"func": lambda: f"{random.randint(100,500)}*sin(3.14*t/{random.randint(12,24)}) + {random.randint(200,800)}", 
-             "context": "Carga de tráfico distribuido",
-             "bounds": [0, random.randint(24, 72)]},
-            {"func": lambda: f"{random.randint(50,200)}*exp(-t/{random.randint(10,30)}) + {random.randint(10,50)}", 
-             "context": "Latencia en red distribuida",
-             "bounds": [0, random.randint(60, 180)]}
-        ],
-        "💾 Bases de Datos": [
-            {"func": lambda: f"{random.randint(1000,5000)}*log(t+1) + {random.randint(100,500)}*t", 
-             "context": "Consultas por segundo en base de datos",
-             "bounds": [1, random.randint(24, 168)]},
-            {"func": lambda: f"{random.randint(50,200)}*sqrt(t) + {random.randint(10,100)}", 
-             "context": "Tiempo de respuesta de consultas",
-             "bounds": [1, random.randint(100, 500)]}
-        ],
-        "🔒 Seguridad": [
-            {"func": lambda: f"{random.randint(10,100)}*exp(t/{random.randint(50,200)}) + {random.randint(5,50)}", 
-             "context": "Intentos de acceso maliciosos",
-             "bounds": [0, random.randint(24, 72)]},
-            {"func": lambda: f"{random.randint(100,1000)}*sin(3.14*t/{random.randint(6,24)}) + {random.randint(50,500)}", 
-             "context": "Eventos de seguridad detectados",
-             "bounds": [0, random.randint(24, 168)]}
-        ]
-    }
-    
-    template = random.choice(templates.get(category, templates["🚀 Optimización de Rendimiento"]))
-    
-    return {
-        "function": template["func"](),
-        "context": template["context"],
-        "company": random.choice(["TechCorp", "DataFlow Inc", "CloudScale", "AI Systems", "ByteForce", "NeoStream"]),
-        "metric": random.choice(["MB/s", "ms", "requests/s", "% CPU", "GB", "usuarios", "eventos/h"]),
-        "lower": "0",
-        "upper": str(template["bounds"][1]),
-        "variable": "t"
-    }
+    """Generar escenario aleatorio: del banco pre-resuelto si existe, si no desde las plantillas.
+
+    Usa el flujo aleatorio propio de la sesión, así las sesiones no se interfieren.
+    """
+    rng = session_rng("scenarios")
+    return sample_scenario(category, rng) or generate_seeded_scenario(category, rng.getrandbits(32))
 def display_random_scenario(scenario):
     """Mostrar escenario generado con funcionalidad completa."""
     st.success(f"🏢 **{scenario['company']}** - {scenario['context']}")
@@ -183,6 +148,8 @@ def display_random_scenario(scenario):
     - **Métrica:** {scenario['metric']}
     - **Variable:** t (tiempo)
     """)
+    if scenario.get('code'):
+        st.caption(f"🔑 Código del escenario: `{scenario['code']}`")
     
     # ✅ CREAR COLUMNAS PARA BOTONES
     col1, col2, col3 = st.columns(3)
@@ -208,10 +175,18 @@ def solve_random_scenario(scenario):
         
         st.markdown("### 🚀 Resolviendo Escenario...")
         
-        with st.spinner("Calculando integral..."):
-            success, result, details = calculate_definite_integral_robust(
-                scenario['function'], scenario['lower'], scenario['upper'], scenario['variable']
-            )
+        if 'result' in scenario:
+            # ✅ ESCENARIO DEL BANCO: integral ya resuelta al generarlo
+            success, result, details = True, scenario['result'], {"method_used": scenario['method']}
+        elif 'template_index' in scenario:
+            # ✅ ESCENARIO DE PLANTILLA: solución paramétrica compilada (microsegundos)
+            success, result, method = solve_scenario(scenario)
+            details = {"method_used": method}
+        else:
+            with st.spinner("Calculando integral..."):
+                success, result, details = calculate_definite_integral_robust(
+                    scenario['function'], scenario['lower'], scenario['upper'], scenario['variable']
+                )
         
         if success:
             st.success(f"### ✅ Resultado: {result:.2f} {scenario['metric']}")
@@ -232,6 +207,10 @@ def solve_random_scenario(scenario):
             with col3:
                 st.metric("🔧 Método Usado", details.get('method_used', 'Numérico'))
             
+            # ✅ ACUMULADO HASTA CADA INSTANTE (una sola evaluación vectorizada)
+            st.markdown(f"### 📈 {scenario['metric']} acumulado hasta {scenario['variable']}")
+            plot_cumulative_integral(scenario['function'], scenario['lower'], scenario['upper'], scenario['variable'])
+            
             # ✅ INTERPRETACIÓN CONTEXTUAL
             st.markdown("### 💡 Interpretación del Resultado")
             
@@ -456,6 +435,43 @@ Error: {str(e)}
         
         st.info("💡 **Sugerencia:** Intenta generar un nuevo escenario")
 
+# Métricas del caso de estudio (también usadas por los benchmarks)
+SYSTEM_METRICS = {
+    "📈 Tráfico de Usuarios": {
+        "function": "2000000 + 8000000*sin(3.14*t/12)",
+        "variable": "t", "lower": "0", "upper": "24",
+        "units": "usuarios·hora",
+        "description": "Patrón diario de carga de usuarios concurrentes",
+        "parametric": "offset + amplitude*sin(3.14*t/period)",
+        "parameters": {"offset": (2000000, 0, 5000000), "amplitude": (8000000, 0, 16000000), "period": (12, 4, 48)}
+    },
+    "💾 Eficiencia del Cache": {
+        "function": "60 + 25*cos(3.14*t/8) + 15*sqrt(t)",
+        "variable": "t", "lower": "0", "upper": "24",
+        "units": "% hit rate·hora",
+        "description": "Rendimiento del sistema de cache distribuido",
+        "parametric": "base + amplitude*cos(3.14*t/period) + growth*sqrt(t)",
+        "parameters": {"base": (60, 0, 100), "amplitude": (25, 0, 50), "period": (8, 2, 24), "growth": (15, 0, 30)}
+    },
+    "⚡ Latencia del Sistema": {
+        "function": "150 - 50*sin(3.14*t/12) + 20*exp(-t/24)",
+        "variable": "t", "lower": "0", "upper": "24",
+        "units": "ms·hora",
+        "description": "Tiempo de respuesta promedio del sistema",
+        "parametric": "base - amplitude*sin(3.14*t/period) + spike*exp(-t/decay)",
+        "parameters": {"base": (150, 50, 300), "amplitude": (50, 0, 100), "period": (12, 4, 48),
+                       "spike": (20, 0, 100), "decay": (24, 1, 48)}
+    },
+    "🧠 Consumo de Memoria": {
+        "function": "50 + 30*sin(3.14*t/12) + 15*cos(3.14*t/6) + 5*sqrt(t)",
+        "variable": "t", "lower": "0", "upper": "24",
+        "units": "GB·hora",
+        "description": "Uso de memoria del sistema de cache",
+        "parametric": "base + amplitude*sin(3.14*t/period) + 15*cos(3.14*t/6) + growth*sqrt(t)",
+        "parameters": {"base": (50, 0, 100), "amplitude": (30, 0, 60), "period": (12, 4, 48), "growth": (5, 0, 20)}
+    }
+}
+
 def show_complete_case_study():
     """✅ CASO DE ESTUDIO COMPLETO - Con las 4 funcionalidades requeridas."""
     st.markdown("## 🔬 Caso de Estudio: Sistema de Streaming de Video")
@@ -489,32 +505,7 @@ def show_complete_case_study():
     # Selector de métricas del sistema
     st.markdown("### 🔧 Seleccionar Métrica del Sistema")
     
-    system_metrics = {
-        "📈 Tráfico de Usuarios": {
-            "function": "2000000 + 8000000*sin(3.14*t/12)",
-            "variable": "t", "lower": "0", "upper": "24",
-            "units": "usuarios·hora",
-            "description": "Patrón diario de carga de usuarios concurrentes"
-        },
-        "💾 Eficiencia del Cache": {
-            "function": "60 + 25*cos(3.14*t/8) + 15*sqrt(t)",
-            "variable": "t", "lower": "0", "upper": "24",
-            "units": "% hit rate·hora",
-            "description": "Rendimiento del sistema de cache distribuido"
-        },
-        "⚡ Latencia del Sistema": {
-            "function": "150 - 50*sin(3.14*t/12) + 20*exp(-t/24)",
-            "variable": "t", "lower": "0", "upper": "24",
-            "units": "ms·hora",
-            "description": "Tiempo de respuesta promedio del sistema"
-        },
-        "🧠 Consumo de Memoria": {
-            "function": "50 + 30*sin(3.14*t/12) + 15*cos(3.14*t/6) + 5*sqrt(t)",
-            "variable": "t", "lower": "0", "upper": "24",
-            "units": "GB·hora",
-            "description": "Uso de memoria del sistema de cache"
-        }
-    }
+    system_metrics = SYSTEM_METRICS
     
     selected_metric = st.selectbox(
         "🎯 Métrica a analizar:",
@@ -560,7 +551,7 @@ def show_complete_case_study():
         function_clean = current_metric['function'].replace('*', '\\cdot').replace('**', '^').replace('3.14', '\\pi')
         st.latex(f"\\int_{{0}}^{{24}} [{function_clean}] \\, dt")
         
-        col1, col2 = st.columns(2)
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
             if st.button("🚀 Calcular Integral", key="integral_calc"):
                 calculate_integral_definite(current_metric, selected_metric)
@@ -569,6 +560,14 @@ def show_complete_case_study():
                 st.markdown(f"#### 📈 Gráfica de {selected_metric}")
                 plot_integral(current_metric['function'], current_metric['lower'], 
                             current_metric['upper'], current_metric['variable'])
+        with col3:
+            if st.button("🔍 Perfil de Comportamiento", key="behavior_profile"):
+                show_behavior_profile(current_metric, selected_metric)
+        with col4:
+            if st.button("📈 Acumulado por Hora", key="cumulative_plot"):
+                st.markdown(f"#### 📈 {selected_metric} acumulado hasta la hora t")
+                plot_cumulative_integral(current_metric['function'], current_metric['lower'],
+                                         current_metric['upper'], current_metric['variable'])
     
     # ✅ 2. SUMAS DE RIEMANN
     with concept_tabs[1]:
@@ -662,6 +661,11 @@ def show_complete_case_study():
             axis = st.selectbox("🔄 Eje revolución:", 
                               ["⏰ Tiempo (horizontal)", "📊 Métrica (vertical)"], 
                               key="volume_axis")
+            
+            # ✅ VOLUMEN EN VIVO (cacheado: se recalcula gratis en cada cambio de widget)
+            success, live_volume, live_details = calculate_metric_volume(current_metric, axis)
+            if success:
+                st.metric("📦 Volumen", f"{live_volume:,.2f} u³", help=live_details.get('method_used'))
             if st.button("🔄 Calcular Volumen", key="volume_calc"):
                 calculate_volume_revolution_fixed(current_metric, selected_metric, axis)
         
@@ -672,6 +676,194 @@ def show_complete_case_study():
         # ✅ AGREGAR SECCIÓN 3D AL FINAL DEL TAB
         st.markdown("---")
         show_3d_volume_section(current_metric, selected_metric)
+    
+    # ✅ PLANIFICACIÓN: BARRIDO DE PARÁMETROS
+    if 'parametric' in current_metric:
+        st.markdown("---")
+        show_parameter_sweep(current_metric, selected_metric)
+
+def show_parameter_sweep(current_metric, selected_metric):
+    """Sliders de los coeficientes de la métrica, sensibilidad y heatmap del total por pares de parámetros."""
+    from utils.parameter_sweep import sweep_integral, integral_sensitivity
+    from utils.plotting import plot_parameter_heatmap
+    
+    st.markdown("### 🎛️ Planificación: ¿Qué pasa si cambian los coeficientes?")
+    st.markdown(f"**Modelo paramétrico:** `f(t) = {current_metric['parametric']}`")
+    
+    specs = current_metric['parameters']
+    names = list(specs)
+    
+    # ✅ SLIDERS (claves por métrica para no mezclar valores entre métricas)
+    values = {}
+    slider_columns = st.columns(len(names))
+    for column, name in zip(slider_columns, names):
+        default, low, high = specs[name]
+        with column:
+            values[name] = st.slider(name, float(low), float(high), float(default),
+                                     key=f"sweep_{selected_metric}_{name}")
+    
+    success, sensitivity = integral_sensitivity(
+        current_metric['parametric'], current_metric['lower'], current_metric['upper'],
+        values, current_metric['variable']
+    )
+    if not success:
+        st.error(f"❌ Error: {sensitivity}")
+        return
+    
+    metric_columns = st.columns(len(names) + 1)
+    with metric_columns[0]:
+        st.metric("📊 Total en 24 h", f"{sensitivity['value']:,.2f}", help=current_metric['units'])
+    for column, name in zip(metric_columns[1:], names):
+        with column:
+            elasticity = sensitivity['sensitivity'][name]['elasticity']
+            st.metric(f"∂/∂{name}", f"{sensitivity['sensitivity'][name]['derivative']:,.4g}",
+                      f"elasticidad {elasticity:.2f}" if np.isfinite(elasticity) else None,
+                      delta_color="off")
+    
+    # ✅ HEATMAP DEL TOTAL SOBRE UN PAR DE PARÁMETROS
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x_name = st.selectbox("Eje X:", names, index=0, key=f"sweep_x_{selected_metric}")
+    with col2:
+        y_options = [name for name in names if name != x_name]
+        y_name = st.selectbox("Eje Y:", y_options, index=min(1, len(y_options) - 1) if len(y_options) > 1 else 0,
+                              key=f"sweep_y_{selected_metric}")
+    with col3:
+        resolution = st.select_slider("Resolución:", [25, 50, 100], value=50, key="sweep_resolution")
+    
+    success, grid = sweep_integral(
+        current_metric['parametric'], current_metric['lower'], current_metric['upper'],
+        (x_name, specs[x_name][1], specs[x_name][2], resolution),
+        (y_name, specs[y_name][1], specs[y_name][2], resolution),
+        values, current_metric['variable']
+    )
+    if not success:
+        st.error(f"❌ Error: {grid}")
+        return
+    
+    plot_parameter_heatmap(grid, f"Total de {selected_metric} en 24 h ({grid['method_used']})",
+                           (values[x_name], values[y_name]), current_metric['units'])
+
+def scenario_parametric_model(scenario):
+    """Modelo paramétrico (función, valores iniciales) del escenario aleatorio actual, o None."""
+    category, template_index = scenario.get('category'), scenario.get('template_index')
+    if category not in SCENARIO_CATEGORIES or template_index is None:
+        return None
+    template = SCENARIO_CATEGORIES[category][template_index]
+    function = template['function'].format(**{name: name for name in template['parameters']})
+    return function, dict(scenario['parameters'])
+
+def show_time_series_integration():
+    """Integrar series de métricas reales (CSV/Parquet) y compararlas con un modelo ajustado."""
+    from utils.time_series import (read_time_series_columns, load_time_series, integrate_samples,
+                                   fit_parametric_model, model_series, TIME_UNITS, INTEGRATION_METHODS)
+    from utils.plotting import plot_time_series_integral
+    
+    st.markdown("## 📈 Integración de Datos Medidos")
+    st.markdown("**Sube muestras reales (CPU, RPS...) e intégralas igual que las curvas modeladas**")
+    
+    upload = st.file_uploader("📂 Serie temporal (CSV o Parquet):", type=["csv", "parquet"], key="ts_upload")
+    if upload is None:
+        st.info("""
+        **📋 Formato esperado:** una columna de tiempo (números o fechas, paso irregular permitido)
+        y una columna con la métrica. Se leen solo esas dos columnas, así que archivos con
+        millones de filas y muchas columnas se cargan rápido.
+        """)
+        return
+    
+    try:
+        columns = read_time_series_columns(upload)
+    except ValueError as e:
+        st.error(f"❌ {str(e)}")
+        return
+    if len(columns) < 2:
+        st.error("❌ El archivo necesita al menos dos columnas")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        time_column = st.selectbox("⏰ Columna de tiempo:", columns, index=0, key="ts_time_column")
+        time_unit = st.selectbox("📏 Unidad (si son fechas):", list(TIME_UNITS), index=2, key="ts_time_unit")
+    with col2:
+        value_column = st.selectbox("📊 Columna de valores:", columns, index=1, key="ts_value_column")
+        method = st.selectbox("🔧 Método:", list(INTEGRATION_METHODS), key="ts_method")
+    with col3:
+        window = st.number_input("🪟 Ventana (0 = sin ventanas):", min_value=0.0, value=1.0, key="ts_window")
+        rolling = st.checkbox("Ventana móvil", key="ts_rolling")
+    
+    # ✅ CARGA CACHEADA EN LA SESIÓN (no se relee el archivo en cada rerun)
+    load_key = (getattr(upload, "file_id", upload.name), time_column, value_column, time_unit)
+    cached = st.session_state.get('time_series')
+    if cached is None or cached[0] != load_key:
+        with st.spinner("Leyendo serie..."):
+            cached = (load_key, *load_time_series(upload, time_column, value_column, time_unit=time_unit))
+        st.session_state['time_series'] = cached
+    _, success, series, load_details = cached
+    if not success:
+        st.error(f"❌ {series}")
+        return
+    
+    success, integration, details = integrate_samples(
+        series['times'], series['values'], method, window if window > 0 else None, rolling
+    )
+    if not success:
+        st.error(f"❌ {integration}")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("🧾 Muestras", f"{load_details['rows']:,}")
+    with col2:
+        st.metric("📈 Integral total", f"{details['total']:,.2f}")
+    with col3:
+        st.metric("🔧 Método", details['method_used'])
+    with col4:
+        st.metric("🧹 Descartadas", f"{load_details['dropped'] + load_details['duplicates']:,}",
+                  help="Filas sin valor numérico o con tiempo repetido")
+    if method == "simpson" and details['max_step_ratio'] and details['max_step_ratio'] > 100:
+        st.warning("⚠️ Los pasos de tiempo son muy irregulares: Simpson puede amplificar el ruido, "
+                   "el trapecio es más robusto aquí.")
+    
+    # ✅ MODELO AJUSTADO (métricas del caso de estudio o escenario aleatorio actual)
+    models = {name: (metric['parametric'], {key: spec[0] for key, spec in metric['parameters'].items()})
+              for name, metric in SYSTEM_METRICS.items() if 'parametric' in metric}
+    if 'current_scenario' in st.session_state:
+        scenario_model = scenario_parametric_model(st.session_state['current_scenario'])
+        if scenario_model is not None:
+            models["🎲 Escenario aleatorio actual"] = scenario_model
+    
+    model_name = st.selectbox("🧮 Ajustar modelo:", ["Ninguno"] + list(models), key="ts_model")
+    model = None
+    if model_name != "Ninguno":
+        function, initial = models[model_name]
+        success, fitted, fit_details = fit_parametric_model(function, initial, series['times'], series['values'])
+        if success:
+            success, model = model_series(function, fitted, series['times'])
+        if not success:
+            st.error(f"❌ {fitted if model is None else model}")
+            model = None
+        else:
+            model['label'] = "Modelo ajustado"
+            model_total = float(model['cumulative'][-1])
+            st.markdown(f"**Modelo:** `f(t) = {function}`")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("🧮 Integral del modelo", f"{model_total:,.2f}",
+                          f"{(model_total - details['total']) / abs(details['total']) * 100:+.2f}%"
+                          if details['total'] else None, delta_color="off")
+            with col2:
+                st.metric("📐 R²", f"{fit_details['r_squared']:.4f}" if fit_details['r_squared'] is not None else "N/A")
+            with col3:
+                st.metric("📏 RMSE", f"{fit_details['rmse']:,.4g}")
+            st.dataframe(pd.DataFrame([fitted]), use_container_width=True)
+    
+    windows = None
+    if 'window_integrals' in integration:
+        windows = ((series['times'], integration['window_integrals'], None) if rolling
+                   else (integration['window_starts'], integration['window_integrals'], window))
+    
+    plot_time_series_integral(series['times'], series['values'], integration['cumulative'], model, windows,
+                              f"t ({time_unit})" if load_details['start'] else "t")
 
 def show_educational_resources():
     """Mostrar recursos educativos."""
@@ -747,6 +939,66 @@ def calculate_integral_definite(current_metric, selected_metric):
     except Exception as e:
         st.error(f"Error en cálculo: {str(e)}")
 
+def show_behavior_profile(current_metric, selected_metric):
+    """Mostrar monotonía, concavidad y extremos de la métrica."""
+    try:
+        from utils.calculator import analyze_function_behavior
+        
+        analysis = analyze_function_behavior(
+            current_metric['function'], current_metric['lower'],
+            current_metric['upper'], current_metric['variable']
+        )
+        
+        if "error" in analysis:
+            st.error(f"❌ Error: {analysis['error']}")
+            return
+        
+        def format_intervals(intervals):
+            if not intervals:
+                return "—"
+            return ", ".join(f"[{a:.2f}, {b:.2f}]" for a, b in intervals)
+        
+        def format_points(points):
+            if not points:
+                return "—"
+            return ", ".join(f"t = {p:.2f}" for p in points)
+        
+        st.markdown(f"#### 🔍 Perfil de Comportamiento - {selected_metric}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.info(f"""
+            **📈 Monotonía:**
+            - **Creciente:** {format_intervals(analysis['monotonicity']['increasing'])}
+            - **Decreciente:** {format_intervals(analysis['monotonicity']['decreasing'])}
+            
+            **🎯 Extremos locales:**
+            - **Máximos:** {format_points(analysis['extrema']['maxima'])}
+            - **Mínimos:** {format_points(analysis['extrema']['minima'])}
+            """)
+        
+        with col2:
+            st.info(f"""
+            **🌀 Concavidad:**
+            - **Cóncava hacia arriba:** {format_intervals(analysis['concavity']['concave_up'])}
+            - **Cóncava hacia abajo:** {format_intervals(analysis['concavity']['concave_down'])}
+            
+            **🔀 Puntos de inflexión:** {format_points(analysis['inflection_points'])}
+            """)
+        
+        absolute = analysis.get("absolute_extrema", {})
+        if absolute:
+            col_a, col_b = st.columns(2)
+            with col_a:
+                t_max, f_max = absolute["maximum"]
+                st.metric("🔺 Pico del día", f"{f_max:,.2f}", f"t = {t_max:.2f} h")
+            with col_b:
+                t_min, f_min = absolute["minimum"]
+                st.metric("🔻 Valle del día", f"{f_min:,.2f}", f"t = {t_min:.2f} h")
+    
+    except Exception as e:
+        st.error(f"Error en análisis de comportamiento: {str(e)}")
+
 def calculate_area_analysis(current_metric, selected_metric, period_info):
     """Calcular área para período específico."""
     try:
@@ -785,81 +1037,6 @@ def calculate_area_analysis(current_metric, selected_metric, period_info):
     except Exception as e:
         st.error(f"Error en análisis de área: {str(e)}")
 
-def calculate_volume_revolution_fixed(current_metric, selected_metric, axis):
-    """Calcular volumen de sólido de revolución."""
-    try:
-        from utils.calculator import calculate_definite_integral_robust
-        
-        # Volumen: V = π ∫ [f(x)]² dx
-        volume_function = f"3.14159 * ({current_metric['function']})**2"
-        
-        with st.spinner(f"🔄 Calculando volumen 3D para {selected_metric}..."):
-            # ✅ CORREGIR ESTA LÍNEA:
-            success, result, details = calculate_definite_integral_robust(
-                volume_function, current_metric['lower'], current_metric['upper'], current_metric['variable']
-            )
-        
-        if success:
-            st.success(f"### 🔄 Volumen 3D: {result:.2f} unidades³")
-            
-            col1, col2 = st.columns([1, 1])
-            
-            with col1:
-                st.info(f"""
-                **🎯 Interpretación del Volumen Tridimensional:**
-                - **Eje de revolución:** {axis}
-                - **Volumen calculado:** {result:.2f} unidades cúbicas
-                - **Método:** {details.get('method_used', 'Numérico')}
-                
-                **🏗️ Aplicación en infraestructura:**
-                - **Escalamiento cúbico:** Crecimiento volumétrico del sistema
-                - **Dimensionamiento:** Capacidad total de procesamiento 3D
-                - **Arquitectura distribuida:** Planificación de clusters
-                
-                💡 **Significado empresarial:** El volumen modela la capacidad 
-                tridimensional necesaria para manejar {selected_metric.lower()}.
-                """)
-                
-                # Estimaciones prácticas
-                if "Usuarios" in selected_metric:
-                    servers = result / 1000000
-                    st.metric("🖥️ Servidores estimados", f"{servers:.0f}")
-                elif "Cache" in selected_metric:
-                    efficiency = min(result / 100000 * 10, 50)
-                    st.metric("⚡ Mejora eficiencia", f"+{efficiency:.1f}%")
-                
-                # ✅ AGREGAR BOTÓN PARA VER 3D
-                if st.button("🎯 Ver Visualización 3D", key=f"view_3d_{selected_metric}"):
-                    st.markdown("#### 🔄 Sólido de Revolución en 3D")
-                    from utils.plotting import plot_volume_3d
-                    plot_volume_3d(current_metric['function'], current_metric['lower'], 
-                                 current_metric['upper'], current_metric['variable'])
-            
-            with col2:
-                st.markdown(f"#### 🔄 Función Original - {selected_metric}")
-                plot_integral(current_metric['function'], current_metric['lower'], 
-                            current_metric['upper'], current_metric['variable'])
-                
-                st.info(f"""
-                **📊 Fórmula aplicada:**
-                V = π ∫ [f(t)]² dt
-                
-                La función mostrada se eleva al cuadrado y se multiplica por π 
-                para obtener el volumen del sólido de revolución.
-                """)
-                
-                # ✅ AGREGAR BOTÓN PARA COMPARACIÓN 2D vs 3D
-                if st.button("🔄 Comparar 2D vs 3D", key=f"compare_3d_{selected_metric}"):
-                    st.markdown("#### 📊 Comparación 2D vs 3D")
-                    from utils.plotting import plot_3d_comparison
-                    plot_3d_comparison(current_metric['function'], current_metric['lower'], 
-                                     current_metric['upper'], current_metric['variable'])
-                
-        else:
-            st.error(f"❌ Error calculando volumen: {result}")
-    except Exception as e:
-        st.error(f"Error en cálculo de volumen: {str(e)}")
-
 def calculate_riemann_sum(current_metric, selected_metric, method, n_samples):
     """Calcular suma de Riemann."""
     try:
@@ -949,18 +1126,25 @@ def calculate_area_analysis(current_metric, selected_metric, period_info):
     except Exception as e:
         st.error(f"Error en análisis de área: {str(e)}")
 
+def calculate_metric_volume(current_metric, axis):
+    """Volumen de la métrica: discos alrededor del eje del tiempo o capas alrededor del eje vertical."""
+    from utils.volume_of_revolution import calculate_volume_of_revolution
+    
+    if "vertical" in axis:
+        return calculate_volume_of_revolution(
+            current_metric['function'], current_metric['lower'], current_metric['upper'],
+            current_metric['variable'], method="shell", axis=current_metric['lower']
+        )
+    return calculate_volume_of_revolution(
+        current_metric['function'], current_metric['lower'], current_metric['upper'],
+        current_metric['variable'], method="disk"
+    )
+
 def calculate_volume_revolution_fixed(current_metric, selected_metric, axis):
     """Calcular volumen de sólido de revolución."""
     try:
-        from utils.calculator import calculate_definite_integral_robust
-        
-        # Volumen: V = π ∫ [f(x)]² dx
-        volume_function = f"3.14159 * ({current_metric['function']})**2"
-        
         with st.spinner(f"🔄 Calculando volumen 3D para {selected_metric}..."):
-            success, result, details = calculate_definite_integral_robust(
-                volume_function, current_metric['lower'], current_metric['upper'], current_metric['variable']
-            )
+            success, result, details = calculate_metric_volume(current_metric, axis)
         
         if success:
             st.success(f"### 🔄 Volumen 3D: {result:.2f} unidades³")
@@ -970,9 +1154,9 @@ def calculate_volume_revolution_fixed(current_metric, selected_metric, axis):
             with col1:
                 st.info(f"""
                 **🎯 Interpretación del Volumen Tridimensional:**
-                - **Eje de revolución:** {axis}
+                - **Eje de revolución:** {axis} ({details.get('axis')})
                 - **Volumen calculado:** {result:.2f} unidades cúbicas
-                - **Método:** {details.get('method_used', 'Numérico')}
+                - **Método:** {details.get('method', 'disk')} — {details.get('method_used', 'Numérico')}
                 
                 **🏗️ Aplicación en infraestructura:**
                 - **Escalamiento cúbico:** Crecimiento volumétrico del sistema
@@ -1003,13 +1187,22 @@ def calculate_volume_revolution_fixed(current_metric, selected_metric, axis):
                 plot_integral(current_metric['function'], current_metric['lower'], 
                             current_metric['upper'], current_metric['variable'])
                 
-                st.info(f"""
-                **📊 Fórmula aplicada:**
-                V = π ∫ [f(t)]² dt
-                
-                La función mostrada se eleva al cuadrado y se multiplica por π 
-                para obtener el volumen del sólido de revolución.
-                """)
+                if details.get('method') == "shell":
+                    st.info(f"""
+                    **📊 Fórmula aplicada (capas cilíndricas):**
+                    V = 2π ∫ |t - t₀| |f(t)| dt
+                    
+                    Cada franja vertical gira alrededor del eje vertical t = t₀ 
+                    y forma una capa cilíndrica de radio |t - t₀| y altura |f(t)|.
+                    """)
+                else:
+                    st.info(f"""
+                    **📊 Fórmula aplicada (discos):**
+                    V = π ∫ [f(t)]² dt
+                    
+                    La función mostrada se eleva al cuadrado y se multiplica por π 
+                    para obtener el volumen del sólido de revolución.
+                    """)
                 
                 # ✅ AGREGAR BOTÓN PARA COMPARACIÓN 2D vs 3D
                 if st.button("🔄 Comparar 2D vs 3D", key=f"compare_3d_{selected_metric}"):
@@ -1066,6 +1259,19 @@ def show_3d_volume_section(current_metric, selected_metric):
         key="viz_3d_option"
     )
     
+    # Nivel de detalle de la malla 3D (presupuesto de vértices)
+    from utils.plotting import MESH_DETAIL_LEVELS
+    detail_labels = {"low": "Bajo", "medium": "Medio", "high": "Alto"}
+    detail = "medium"
+    if viz_option != "📈 Función 2D":
+        detail = st.select_slider(
+            "🔍 Nivel de detalle 3D:",
+            options=list(MESH_DETAIL_LEVELS.keys()),
+            value="medium",
+            format_func=lambda level: detail_labels[level],
+            key="viz_3d_detail"
+        )
+    
     if viz_option == "📈 Función 2D":
         st.markdown("#### 📈 Función Original")
         plot_integral(current_metric['function'], current_metric['lower'], 
@@ -1075,10 +1281,10 @@ def show_3d_volume_section(current_metric, selected_metric):
         st.markdown("#### 🔄 Sólido de Revolución en 3D")
         from utils.plotting import plot_volume_3d
         plot_volume_3d(current_metric['function'], current_metric['lower'], 
-                      current_metric['upper'], current_metric['variable'])
+                      current_metric['upper'], current_metric['variable'], MESH_DETAIL_LEVELS[detail])
     
     elif viz_option == "🔀 Comparación 2D vs 3D":
         st.markdown("#### 🔀 Comparación 2D vs 3D")
         from utils.plotting import plot_3d_comparison
         plot_3d_comparison(current_metric['function'], current_metric['lower'], 
-                          current_metric['upper'], current_metric['variable'])
\ No newline at end of file
+                          current_metric['upper'], current_metric['variable'], MESH_DETAIL_LEVELS[detail])
\ No newline at end of file
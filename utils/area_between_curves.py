@@ -3,6 +3,7 @@ import numpy as np
 from typing import Tuple, List, Dict, Union
 from .expression_parser import safe_sympify, evaluate_expression_at_point, safe_float_conversion
 from .validation import validate_two_functions
+from .calculator import compile_antiderivative, antiderivative_difference, get_symbolic_antiderivative
 
 def find_intersection_points(func1_str: str, func2_str: str, variable: str = "x", 
                            search_range: Tuple[float, float] = (-10, 10)) -> List[float]:
@@ -142,19 +143,21 @@ def calculate_area_between_curves(func1_str: str, func2_str: str, lower_bound: s
                 integral_result = sp.integrate(diff_expr, (var, lower_val, upper_val))
                 area = float(integral_result.evalf())
             else:
-                # Regular integration
-                antiderivative = sp.integrate(diff_expr, var)
+                # Regular integration (antiderivada cacheada y compilada por expresión)
+                antiderivative = get_symbolic_antiderivative(diff_expr, variable)
+                if antiderivative is None:
+                    raise ValueError("No closed-form antiderivative")
                 steps.append(f"Antiderivative: $F({variable}) = {sp.latex(antiderivative)}$")
                 
                 # Evaluate at bounds
-                upper_eval = antiderivative.subs(var, upper_val)
-                lower_eval = antiderivative.subs(var, lower_val)
+                lower_eval, upper_eval = compile_antiderivative(diff_expr, variable)(np.array([lower_val, upper_val]))
                 
-                steps.append(f"$F({upper_val}) = {sp.latex(upper_eval)}$")
-                steps.append(f"$F({lower_val}) = {sp.latex(lower_eval)}$")
+                steps.append(f"$F({upper_val}) = {upper_eval:.6f}$")
+                steps.append(f"$F({lower_val}) = {lower_eval:.6f}$")
                 
-                result_expr = upper_eval - lower_eval
-                area = float(result_expr.evalf())
+                area = antiderivative_difference(diff_expr, variable, lower_val, upper_val)
+                if area is None:
+                    raise ValueError("Antiderivative cannot be evaluated at the bounds")
                 
                 # Take absolute value to ensure positive area
                 area = abs(area)
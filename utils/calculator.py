@@ -2,6 +2,8 @@ import sympy as sp
 import numpy as np
 from typing import Tuple, Union, Dict, Any
 import time
+import copy
+from functools import lru_cache
 
 # ✅ IMPORT OPCIONAL DE SCIPY
 try:
@@ -13,12 +15,133 @@ except ImportError:
 
 # ✅ IMPORTS LOCALES
 try:
-    from .expression_parser import safe_sympify, evaluate_expression_at_point
+    from .expression_parser import safe_sympify, evaluate_expression_at_point, compile_expression, compile_derivatives
     from .validation import validate_integration_inputs
+    from .instrumentation import instrument, stage, log_failure, register_cache, summarize_stages
 except ImportError:
     # Fallback para imports relativos
-    from utils.expression_parser import safe_sympify, evaluate_expression_at_point
+    from utils.expression_parser import safe_sympify, evaluate_expression_at_point, compile_expression, compile_derivatives
     from utils.validation import validate_integration_inputs
+    from utils.instrumentation import instrument, stage, log_failure, register_cache, summarize_stages
+
+# Resolución de la malla compartida para el análisis de comportamiento
+BEHAVIOR_GRID_POINTS = 2001
+
+# Resolución por defecto de la integral acumulada F(t)
+CUMULATIVE_GRID_POINTS = 1001
+
+CUMULATIVE_METHODS = ("auto", "symbolic", "simpson", "trapezoid")
+
+@lru_cache(maxsize=256)
+def get_symbolic_antiderivative(expr: sp.Expr, variable: str = "x"):
+    """
+    Antiderivada simbólica cacheada por expresión.
+    
+    Returns:
+        sp.Expr or None: F(x) tal que F' = f, o None si SymPy no encuentra forma cerrada
+    """
+    try:
+        var_symbol = sp.Symbol(variable, real=True)
+        antiderivative = sp.integrate(expr, var_symbol)
+        if antiderivative is None or antiderivative.has(sp.Integral):
+            return None
+        return antiderivative
+    except Exception:
+        return None
+
+@lru_cache(maxsize=512)
+def get_exact_definite_integral(expr: sp.Expr, variable: str, lower_val: float, upper_val: float):
+    """
+    Valor exacto de la integral definida usando la antiderivada cacheada.
+    
+    Returns:
+        float or None: Valor de la integral, o None si no se puede calcular simbólicamente
+    """
+    var_symbol = sp.Symbol(variable, real=True)
+    
+    value = antiderivative_difference(expr, variable, lower_val, upper_val)
+    if value is not None:
+        return value
+    
+    # Sin forma cerrada usable: integración definida directa
+    try:
+        value = float(sp.integrate(expr, (var_symbol, lower_val, upper_val)).evalf())
+        if np.isfinite(value):
+            return value
+    except Exception:
+        pass
+    
+    return None
+
+@lru_cache(maxsize=256)
+def compile_antiderivative(expr: sp.Expr, variable: str = "x"):
+    """
+    Antiderivada cacheada y compilada a NumPy, una sola vez por expresión.
+    
+    Returns:
+        Callable or None: Vectorized F (NaN where undefined), or None if there is no closed form
+    """
+    antiderivative = get_symbolic_antiderivative(expr, variable)
+    if antiderivative is None:
+        return None
+    return compile_expression(antiderivative, variable)
+
+register_cache("get_symbolic_antiderivative", get_symbolic_antiderivative)
+register_cache("get_exact_definite_integral", get_exact_definite_integral)
+register_cache("compile_antiderivative", compile_antiderivative)
+
+# Por debajo de esta fracción de |F| la resta F(b) - F(a) en float64 pierde demasiados dígitos
+CANCELLATION_THRESHOLD = 1e-8
+
+def evaluate_definite_integrals(expr: sp.Expr, variable: str, lower_vals, upper_vals) -> np.ndarray:
+    """
+    Evaluate ∫[a, b] f for many (a, b) pairs at once with the compiled antiderivative.
+    
+    Args:
+        expr (sp.Expr): SymPy expression
+        variable (str): Variable name
+        lower_vals (array-like): Lower bounds
+        upper_vals (array-like): Upper bounds (broadcast against lower_vals)
+    
+    Returns:
+        np.ndarray: F(b) - F(a) per pair, NaN where F is undefined or has no closed form
+    """
+    lower_vals, upper_vals = np.broadcast_arrays(np.asarray(lower_vals, dtype=float),
+                                                 np.asarray(upper_vals, dtype=float))
+    antiderivative = compile_antiderivative(expr, variable)
+    if antiderivative is None:
+        return np.full(lower_vals.shape, np.nan)
+    
+    return antiderivative(upper_vals) - antiderivative(lower_vals)
+
+def antiderivative_difference(expr: sp.Expr, variable: str, lower_val: float, upper_val: float):
+    """
+    F(b) - F(a) for a single pair, compiled when possible.
+    
+    Falls back to exact substitution when the float64 difference cancels
+    (|F(b) - F(a)| tiny compared to |F|), where it would lose precision.
+    
+    Returns:
+        float or None: Integral value, or None if the antiderivative cannot be evaluated
+    """
+    antiderivative = compile_antiderivative(expr, variable)
+    if antiderivative is None:
+        return None
+    
+    bound_values = antiderivative(np.array([lower_val, upper_val], dtype=float))
+    value = bound_values[1] - bound_values[0]
+    scale = np.max(np.abs(bound_values))
+    if np.isfinite(value) and abs(value) >= CANCELLATION_THRESHOLD * scale:
+        return float(value)
+    
+    try:
+        var_symbol = sp.Symbol(variable, real=True)
+        symbolic_antiderivative = get_symbolic_antiderivative(expr, variable)
+        value = float((symbolic_antiderivative.subs(var_symbol, upper_val) -
+                       symbolic_antiderivative.subs(var_symbol, lower_val)).evalf())
+        return value if np.isfinite(value) else None
+    except Exception:
+        return None
 
 def validate_result_accuracy(symbolic_result, numerical_result, tolerance=1e-10):
     """Validar precisión entre métodos simbólico y numérico."""
@@ -38,8 +161,49 @@ def validate_result_accuracy(symbolic_result, numerical_result, tolerance=1e-10)
 def calculate_definite_integral_robust(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x") -> Tuple[bool, Union[float, str], Dict[str, Any]]:
     """
     Calculate definite integral with multiple fallback methods and cross-validation.
+
+    Infinite bounds ("inf", "-oo", "∞") and singularities of f in [a, b] are
+    handled by calculate_improper_integral, which reports divergence as a
+    failure and adds its diagnostics under details["improper"].
+
+    The details include "stage_times" (seconds per stage, slowest first) and
+    "counters" (evaluations) for the call.
     """
+    with instrument() as report:
+        success, result, details = _calculate_definite_integral(function_str, lower_bound, upper_bound, variable)
+    
+    if details:
+        details["stage_times"] = summarize_stages(report)
+        details["counters"] = dict(report["counters"])
+    
+    return success, result, details
+
+def _improper_engine():
+    """utils.improper_integrals importa este módulo, así que se importa al usarlo."""
     try:
+        from . import improper_integrals
+    except ImportError:
+        from utils import improper_integrals
+    return improper_integrals
+
+def _improper_result(improper_integrals, function_str: str, lower_bound: str, upper_bound: str,
+                     variable: str) -> Tuple[bool, Union[float, str], Dict[str, Any]]:
+    success, result, details = improper_integrals.calculate_improper_integral(
+        function_str, lower_bound, upper_bound, variable
+    )
+    if details:
+        details["scipy_available"] = SCIPY_AVAILABLE
+    return success, result, details
+
+def _calculate_definite_integral(function_str: str, lower_bound: str, upper_bound: str, variable: str) -> Tuple[bool, Union[float, str], Dict[str, Any]]:
+    """Integration pipeline behind calculate_definite_integral_robust."""
+    try:
+        improper_integrals = _improper_engine()
+        
+        # Límites infinitos: motor de integrales impropias antes del truncado a ±1e6 de validate_bounds
+        if improper_integrals.is_improper(lower_bound, upper_bound):
+            return _improper_result(improper_integrals, function_str, lower_bound, upper_bound, variable)
+        
         # Validate inputs
         valid, error, expr, lower_val, upper_val = validate_integration_inputs(
             function_str, lower_bound, upper_bound, variable
@@ -47,6 +211,12 @@ def calculate_definite_integral_robust(function_str: str, lower_bound: str, uppe
         if not valid:
             return False, f"Validation error: {error}", {}
         
+        # Singularidades en [a, b] (1/sqrt(x) en 0, 1/x en [-1, 1]): también impropia
+        with stage("singularity_detection"):
+            singular = improper_integrals.has_singularities(expr, variable, lower_val, upper_val)
+        if singular:
+            return _improper_result(improper_integrals, function_str, lower_bound, upper_bound, variable)
+        
         details = {
             "function": function_str,
             "variable": variable,
@@ -65,73 +235,62 @@ def calculate_definite_integral_robust(function_str: str, lower_bound: str, uppe
         final_result = None
         
         # Método 1: Integración simbólica con SymPy
-        try:
-            var_symbol = sp.Symbol(variable, real=True)
-            
-            # Intentar integración simbólica directa
-            indefinite_integral = sp.integrate(expr, var_symbol)
+        with stage("symbolic_integration"):
+            try:
+                var_symbol = sp.Symbol(variable, real=True)
             
-            # Verificar si la integral indefinida es válida
-            if indefinite_integral and not indefinite_integral.has(sp.Integral):
-                # Evaluar en los límites
-                upper_eval = indefinite_integral.subs(var_symbol, upper_val)
-                lower_eval = indefinite_integral.subs(var_symbol, lower_val)
-                
-                # Convertir a float si es posible
-                try:
-                    symbolic_result = float((upper_eval - lower_eval).evalf())
-                    if not (np.isnan(symbolic_result) or np.isinf(symbolic_result)):
-                        final_result = symbolic_result
-                        details["method_used"] = "Symbolic Integration (SymPy)"
-                except:
-                    pass
+                # Antiderivada cacheada y compilada, evaluada en los límites como arreglo
+                symbolic_result = antiderivative_difference(expr, variable, lower_val, upper_val)
+                if symbolic_result is not None:
+                    final_result = symbolic_result
+                    details["method_used"] = "Symbolic Integration (SymPy)"
             
-            # Si la simbólica directa no funciona, intentar integración numérica con SymPy
-            if symbolic_result is None:
-                try:
-                    definite_integral = sp.integrate(expr, (var_symbol, lower_val, upper_val))
-                    symbolic_result = float(definite_integral.evalf())
-                    if not (np.isnan(symbolic_result) or np.isinf(symbolic_result)):
-                        final_result = symbolic_result
-                        details["method_used"] = "SymPy Numerical Integration"
-                except Exception as sympy_error:
-                    print(f"SymPy numerical integration failed: {sympy_error}")
+                # Si la simbólica directa no funciona, intentar integración numérica con SymPy
+                if symbolic_result is None:
+                    try:
+                        definite_integral = sp.integrate(expr, (var_symbol, lower_val, upper_val))
+                        symbolic_result = float(definite_integral.evalf())
+                        if not (np.isnan(symbolic_result) or np.isinf(symbolic_result)):
+                            final_result = symbolic_result
+                            details["method_used"] = "SymPy Numerical Integration"
+                    except Exception as sympy_error:
+                        log_failure("SymPy numerical integration", sympy_error)
                 
-        except Exception as symbolic_error:
-            print(f"Symbolic integration failed: {symbolic_error}")
+            except Exception as symbolic_error:
+                log_failure("Symbolic integration", symbolic_error)
         
         # Método 2: Integración numérica con SciPy (solo si está disponible)
-        if SCIPY_AVAILABLE and integrate is not None:
-            try:
-                def function_for_scipy(x):
-                    """Función adaptada para SciPy"""
-                    try:
-                        success, result = evaluate_expression_at_point(expr, variable, float(x))
-                        if success and not (np.isnan(result) or np.isinf(result)):
+        with stage("numeric_integration"):
+            if SCIPY_AVAILABLE and integrate is not None:
+                try:
+                    # Evaluador compilado (cacheado) en vez de subs de SymPy en cada nodo de quad
+                    compiled = compile_expression(expr, variable)
+
+                    def function_for_scipy(x):
+                        """Función adaptada para SciPy"""
+                        result = float(compiled(np.array([x], dtype=float))[0])
+                        if np.isfinite(result):
                             return result
-                        else:
-                            return 0.0  # Valor por defecto para puntos problemáticos
-                    except:
-                        return 0.0
+                        return 0.0  # Valor por defecto para puntos problemáticos
                 
-                # Usar quad de SciPy con manejo de errores robusto
-                numerical_result, error_estimate = integrate.quad(
-                    function_for_scipy, 
-                    lower_val, 
-                    upper_val,
-                    limit=100,  # Límite de subdivisiones
-                    epsabs=1e-8,  # Tolerancia absoluta
-                    epsrel=1e-8   # Tolerancia relativa
-                )
+                    # Usar quad de SciPy con manejo de errores robusto
+                    numerical_result, error_estimate = integrate.quad(
+                        function_for_scipy, 
+                        lower_val, 
+                        upper_val,
+                        limit=100,  # Límite de subdivisiones
+                        epsabs=1e-8,  # Tolerancia absoluta
+                        epsrel=1e-8   # Tolerancia relativa
+                    )
                 
-                if not (np.isnan(numerical_result) or np.isinf(numerical_result)):
-                    if final_result is None:
-                        final_result = numerical_result
-                        details["method_used"] = "SciPy Numerical Integration (quad)"
-                    details["approximation_error"] = error_estimate
+                    if not (np.isnan(numerical_result) or np.isinf(numerical_result)):
+                        if final_result is None:
+                            final_result = numerical_result
+                            details["method_used"] = "SciPy Numerical Integration (quad)"
+                        details["approximation_error"] = error_estimate
                     
-            except Exception as scipy_error:
-                print(f"SciPy integration failed: {scipy_error}")
+                except Exception as scipy_error:
+                    log_failure("SciPy integration", scipy_error)
         
         # Validación cruzada entre métodos
         if symbolic_result is not None and numerical_result is not None:
@@ -151,12 +310,13 @@ def calculate_definite_integral_robust(function_str: str, lower_bound: str, uppe
         # Método 3: Fallback a Suma de Riemann de alta precisión
         if final_result is None:
             try:
-                riemann_result, riemann_details = calculate_riemann_sum_robust(
-                    function_str, lower_val, upper_val, 
-                    n=10000,  # Alta precisión
-                    method="simpson", 
-                    variable=variable
-                )
+                with stage("riemann_fallback"):
+                    riemann_result, riemann_details = calculate_riemann_sum_robust(
+                        function_str, lower_val, upper_val, 
+                        n=10000,  # Alta precisión
+                        method="simpson", 
+                        variable=variable
+                    )
                 
                 if riemann_result[0]:  # Si fue exitoso
                     final_result = riemann_result[1]
@@ -164,14 +324,15 @@ def calculate_definite_integral_robust(function_str: str, lower_bound: str, uppe
                     details.update(riemann_details)
                     
             except Exception as riemann_error:
-                print(f"Riemann sum failed: {riemann_error}")
+                log_failure("Riemann sum", riemann_error)
         
         # Método 4: Fallback a Monte Carlo (casos extremos)
         if final_result is None:
             try:
-                mc_result = monte_carlo_integration(
-                    expr, variable, lower_val, upper_val, n_samples=100000
-                )
+                with stage("monte_carlo"):
+                    mc_result = monte_carlo_integration(
+                        expr, variable, lower_val, upper_val, n_samples=100000
+                    )
                 
                 if not (np.isnan(mc_result) or np.isinf(mc_result)):
                     final_result = mc_result
@@ -179,7 +340,7 @@ def calculate_definite_integral_robust(function_str: str, lower_bound: str, uppe
                     details["approximation_error"] = "Estimated ±2%"
                     
             except Exception as mc_error:
-                print(f"Monte Carlo integration failed: {mc_error}")
+                log_failure("Monte Carlo integration", mc_error)
         
         # Finalizar
         details["computation_time"] = time.time() - start_time
@@ -278,14 +439,17 @@ def calculate_riemann_sum_robust(function_str: str, lower_bound: float, upper_bo
         return (False, f"Riemann sum calculation error: {str(e)}"), {}
 
 def monte_carlo_integration(expr: sp.Expr, variable: str, lower_bound: float, 
-                          upper_bound: float, n_samples: int = 100000) -> float:
+                          upper_bound: float, n_samples: int = 100000, seed: int = 42) -> float:
     """
     Monte Carlo integration for complex functions.
+    
+    Uses its own seeded generator, so results are reproducible and the
+    global NumPy RNG (shared by all sessions) is never touched.
     """
     try:
-        # Generar puntos aleatorios
-        np.random.seed(42)  # Para reproducibilidad
-        random_points = np.random.uniform(lower_bound, upper_bound, n_samples)
+        # Generar puntos aleatorios (generador local, no np.random.seed global)
+        rng = np.random.default_rng(seed)
+        random_points = rng.uniform(lower_bound, upper_bound, n_samples)
         
         # Evaluar función en puntos aleatorios
         function_values = []
@@ -366,61 +530,294 @@ def find_critical_points(expr: sp.Expr, variable: str, domain_start: float, doma
         return sorted(list(set(critical_points)))
         
     except Exception as e:
-        print(f"Critical points calculation failed: {str(e)}")
+        log_failure("Critical points calculation", e)
         return []
 
-def analyze_function_behavior(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x") -> dict:
+def _refine_sign_changes(func, left: np.ndarray, right: np.ndarray, iterations: int = 60) -> np.ndarray:
     """
-    Analyze function behavior including monotonicity, concavity, and extrema.
+    Refine all bracketed roots of a compiled function at once using vectorized bisection.
+    """
+    left = left.astype(float).copy()
+    right = right.astype(float).copy()
+    f_left = func(left)
+    
+    for _ in range(iterations):
+        middle = 0.5 * (left + right)
+        f_middle = func(middle)
+        same_side = np.sign(f_middle) == np.sign(f_left)
+        left = np.where(same_side, middle, left)
+        f_left = np.where(same_side, f_middle, f_left)
+        right = np.where(same_side, right, middle)
+    
+    return 0.5 * (left + right)
+
+def _sign_analysis(func, grid: np.ndarray, values: np.ndarray, lower_val: float, upper_val: float) -> dict:
+    """
+    Split [lower_val, upper_val] into intervals where a compiled function keeps its sign.
+    
+    Returns a dict with the refined sign changes ("roots", with the sign on their
+    right-hand side), the grid zeros that do not change sign ("touch_points"), and
+    the "positive", "negative" and "zero" intervals.
     """
+    finite = np.isfinite(values)
+    if not finite.any():
+        return {"roots": [], "root_signs": [], "touch_points": [], "positive": [], "negative": [], "zero": []}
+    
+    tolerance = 1e-12 * max(1.0, float(np.max(np.abs(values[finite]))))
+    signs = np.where(np.abs(values) <= tolerance, 0.0, np.sign(values))
+    
+    nonzero = finite & (signs != 0)
+    touch_points = [float(x) for x in grid[finite & (signs == 0)]]
+    
+    if not nonzero.any():
+        return {"roots": [], "root_signs": [], "touch_points": [], "positive": [], "negative": [],
+                "zero": [(lower_val, upper_val)]}
+    
+    x_nonzero = grid[nonzero]
+    s_nonzero = signs[nonzero]
+    changes = np.nonzero(s_nonzero[:-1] != s_nonzero[1:])[0]
+    
+    roots = []
+    if len(changes) > 0:
+        refined = _refine_sign_changes(func, x_nonzero[changes], x_nonzero[changes + 1])
+        # Evitar residuos como 1e-21 cuando la raíz exacta es 0
+        refined[np.abs(refined) <= 1e-12 * (upper_val - lower_val)] = 0.0
+        roots = [float(r) for r in refined]
+    root_signs = [float(s_nonzero[i + 1]) for i in changes]
+    
+    # Los ceros de la malla que coinciden con un cambio de signo ya están en roots
+    touch_points = [
+        x for x in touch_points
+        if not any(abs(x - r) <= 1e-9 * max(1.0, abs(r)) + 1e-12 for r in roots)
+    ]
+    
+    boundaries = [lower_val] + roots + [upper_val]
+    segment_signs = [float(s_nonzero[0])] + root_signs
+    
+    intervals = {"positive": [], "negative": []}
+    for i, sign in enumerate(segment_signs):
+        key = "positive" if sign > 0 else "negative"
+        intervals[key].append((boundaries[i], boundaries[i + 1]))
+    
+    return {
+        "roots": roots,
+        "root_signs": root_signs,
+        "touch_points": touch_points,
+        "positive": intervals["positive"],
+        "negative": intervals["negative"],
+        "zero": []
+    }
+
+@lru_cache(maxsize=64)
+def _analyze_function_behavior_cached(function_str: str, lower_bound: str, upper_bound: str,
+                                      variable: str, grid_points: int) -> dict:
+    """Análisis de comportamiento en un solo pase sobre una malla compartida (cacheado)."""
+    valid, error, expr, lower_val, upper_val = validate_integration_inputs(
+        function_str, lower_bound, upper_bound, variable
+    )
+    if not valid:
+        return {"error": error}
+    
+    analysis = {
+        "function": function_str,
+        "domain": [lower_val, upper_val],
+        "critical_points": [],
+        "inflection_points": [],
+        "monotonicity": {"increasing": [], "decreasing": [], "constant": []},
+        "concavity": {"concave_up": [], "concave_down": [], "linear": []},
+        "extrema": {"minima": [], "maxima": []},
+        "absolute_extrema": {}
+    }
+    
     try:
-        # Validate inputs
-        valid, error, expr, lower_val, upper_val = validate_integration_inputs(
-            function_str, lower_bound, upper_bound, variable
-        )
-        if not valid:
-            return {"error": error}
-        
-        var_symbol = sp.Symbol(variable)
-        
-        analysis = {
-            "function": function_str,
-            "domain": [lower_val, upper_val],
-            "critical_points": [],
-            "inflection_points": [],
-            "monotonicity": {},
-            "concavity": {},
-            "extrema": {"minima": [], "maxima": []}
+        # f, f' y f'' se compilan una sola vez y se evalúan sobre la misma malla
+        f, first_derivative, second_derivative = compile_derivatives(expr, variable, 2)
+        
+        grid = np.linspace(lower_val, upper_val, grid_points)
+        values = f(grid)
+        first_values = first_derivative(grid)
+        second_values = second_derivative(grid)
+        
+        # Monotonía a partir del signo de f'
+        first_signs = _sign_analysis(first_derivative, grid, first_values, lower_val, upper_val)
+        analysis["monotonicity"] = {
+            "increasing": first_signs["positive"],
+            "decreasing": first_signs["negative"],
+            "constant": first_signs["zero"]
         }
         
-        try:
-            # Primera derivada
-            first_derivative = sp.diff(expr, var_symbol)
-            # Segunda derivada
-            second_derivative = sp.diff(first_derivative, var_symbol)
-            
-            # Encontrar puntos críticos
-            analysis["critical_points"] = find_critical_points(expr, variable, lower_val, upper_val)
-            
-            # Análisis de extremos usando la segunda derivada
-            for cp in analysis["critical_points"]:
-                try:
-                    second_deriv_val = float(second_derivative.subs(var_symbol, cp).evalf())
-                    if second_deriv_val > 0:
-                        analysis["extrema"]["minima"].append(cp)
-                    elif second_deriv_val < 0:
-                        analysis["extrema"]["maxima"].append(cp)
-                except:
-                    pass
-            
-        except Exception as deriv_error:
-            analysis["derivative_error"] = str(deriv_error)
-        
-        return analysis
+        # Concavidad a partir del signo de f''
+        second_signs = _sign_analysis(second_derivative, grid, second_values, lower_val, upper_val)
+        analysis["concavity"] = {
+            "concave_up": second_signs["positive"],
+            "concave_down": second_signs["negative"],
+            "linear": second_signs["zero"]
+        }
+        analysis["inflection_points"] = second_signs["roots"]
+        
+        # Extremos locales: criterio de la primera derivada en los cambios de signo
+        for root, sign_after in zip(first_signs["roots"], first_signs["root_signs"]):
+            if sign_after > 0:
+                analysis["extrema"]["minima"].append(root)
+            else:
+                analysis["extrema"]["maxima"].append(root)
+        
+        # Ceros de f' sin cambio de signo: criterio de la segunda derivada (evaluado en bloque)
+        touch_points = np.array(first_signs["touch_points"], dtype=float)
+        if len(touch_points) > 0:
+            touch_second = second_derivative(touch_points)
+            for point, value in zip(touch_points, touch_second):
+                if value > 0:
+                    analysis["extrema"]["minima"].append(float(point))
+                elif value < 0:
+                    analysis["extrema"]["maxima"].append(float(point))
+        
+        analysis["critical_points"] = sorted(first_signs["roots"] + first_signs["touch_points"])
+        analysis["extrema"]["minima"].sort()
+        analysis["extrema"]["maxima"].sort()
+        
+        # Extremos absolutos entre la malla y los puntos críticos refinados
+        critical_array = np.array(analysis["critical_points"], dtype=float)
+        candidates = np.concatenate([grid, critical_array])
+        candidate_values = np.concatenate([values, f(critical_array)])
+        finite = np.isfinite(candidate_values)
+        if finite.any():
+            candidates = candidates[finite]
+            candidate_values = candidate_values[finite]
+            min_index = int(np.argmin(candidate_values))
+            max_index = int(np.argmax(candidate_values))
+            analysis["absolute_extrema"] = {
+                "minimum": (float(candidates[min_index]), float(candidate_values[min_index])),
+                "maximum": (float(candidates[max_index]), float(candidate_values[max_index]))
+            }
         
+    except Exception as deriv_error:
+        analysis["derivative_error"] = str(deriv_error)
+    
+    return analysis
+
+register_cache("analyze_function_behavior", _analyze_function_behavior_cached)
+
+def analyze_function_behavior(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x",
+                              grid_points: int = BEHAVIOR_GRID_POINTS) -> dict:
+    """
+    Analyze function behavior including monotonicity, concavity, and extrema.
+    
+    f, f' and f'' are compiled once and evaluated on a shared grid; sign changes are
+    refined with vectorized bisection. Results are cached per input tuple.
+    """
+    try:
+        return copy.deepcopy(_analyze_function_behavior_cached(
+            function_str, str(lower_bound), str(upper_bound), variable, int(grid_points)
+        ))
     except Exception as e:
         return {"error": f"Function analysis failed: {str(e)}"}
 
+def cumulative_quadrature(grid: np.ndarray, values: np.ndarray, method: str) -> Tuple[np.ndarray, str]:
+    """
+    Running integral of sampled values, starting at 0 (the grid may be uneven).
+    
+    Returns:
+        Tuple[np.ndarray, str]: (cumulative values, method actually used); Simpson
+        needs SciPy >= 1.12 and 3+ points, otherwise the trapezoidal rule is used
+    """
+    cumulative_simpson = getattr(integrate, "cumulative_simpson", None) if SCIPY_AVAILABLE else None
+    if method == "simpson" and cumulative_simpson is not None and len(grid) >= 3:
+        return cumulative_simpson(values, x=grid, initial=0.0), "cumulative simpson"
+    
+    segments = 0.5 * (values[1:] + values[:-1]) * np.diff(grid)
+    return np.concatenate(([0.0], np.cumsum(segments))), "cumulative trapezoid"
+
+def calculate_cumulative_integral(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x",
+                                  num_points: int = CUMULATIVE_GRID_POINTS,
+                                  method: str = "auto") -> Tuple[bool, Union[Dict[str, np.ndarray], str], Dict[str, Any]]:
+    """
+    Compute the running integral F(t) = ∫[a, t] f on a grid in one vectorized pass.
+    
+    With "auto" (or "symbolic") the cached antiderivative is compiled and
+    evaluated on the whole grid; it is only used if it agrees with the
+    cumulative Simpson curve within the quadrature error estimate, which
+    rejects antiderivatives with branch jumps (e.g. atan(tan(t/2)) forms).
+    Otherwise "auto" returns the cumulative quadrature and "symbolic" fails.
+    If f is singular or undefined anywhere in [a, b] the running integral is
+    not computed (same check as calculate_definite_integral_robust).
+    
+    Args:
+        function_str (str): Function as string
+        lower_bound (str): Lower bound as string (start of accumulation)
+        upper_bound (str): Upper bound as string
+        variable (str): Integration variable
+        num_points (int): Number of grid points (at least 2)
+        method (str): "auto", "symbolic", "simpson" or "trapezoid"
+    
+    Returns:
+        Tuple[bool, Union[dict, str], dict]: (success, {"points", "values"} or error, details)
+    """
+    details = {
+        "method_used": None,
+        "num_points": int(num_points),
+        "undefined_points": 0,
+        "antiderivative": None,
+        "total": None
+    }
+    
+    if method not in CUMULATIVE_METHODS:
+        return False, f"Unknown cumulative method: {method}", details
+    if num_points < 2:
+        return False, "Number of points must be at least 2", details
+    
+    valid, error, expr, lower_val, upper_val = validate_integration_inputs(
+        function_str, lower_bound, upper_bound, variable
+    )
+    if not valid:
+        return False, error, details
+    
+    start_time = time.time()
+    
+    # Polos en [a, b] (1/x en [-1, 1], tan en [0, 3]): la cuadratura daría un total finito
+    with stage("singularity_detection"):
+        singular = _improper_engine().has_singularities(expr, variable, lower_val, upper_val)
+    if singular:
+        return False, f"f is singular in [{lower_val:g}, {upper_val:g}]: the running integral diverges or is undefined", details
+    
+    with stage("cumulative_integration"):
+        grid = np.linspace(lower_val, upper_val, int(num_points))
+        values = compile_expression(expr, variable)(grid)
+        undefined = ~np.isfinite(values)
+        details["undefined_points"] = int(undefined.sum())
+        if undefined.any():
+            return False, f"f is undefined at {variable} = {grid[np.argmax(undefined)]:g}: the running integral is undefined", details
+        
+        quadrature_method = "trapezoid" if method == "trapezoid" else "simpson"
+        cumulative, details["method_used"] = cumulative_quadrature(grid, values, quadrature_method)
+        
+        if method in ("auto", "symbolic"):
+            antiderivative = get_symbolic_antiderivative(expr, variable)
+            if antiderivative is None and method == "symbolic":
+                return False, "No symbolic antiderivative found", details
+            if antiderivative is not None:
+                details["antiderivative"] = str(antiderivative)
+                antiderivative_values = compile_expression(antiderivative, variable)(grid)
+                symbolic = antiderivative_values - antiderivative_values[0]
+                
+                # Error de la cuadratura estimado como |Simpson - trapecio|
+                trapezoid, _ = cumulative_quadrature(grid, values, "trapezoid")
+                error_estimate = np.max(np.abs(cumulative - trapezoid))
+                tolerance = 10 * error_estimate + 1e-8 * max(1.0, np.max(np.abs(cumulative)))
+                
+                if np.all(np.isfinite(symbolic)) and np.max(np.abs(symbolic - cumulative)) <= tolerance:
+                    cumulative = symbolic
+                    details["method_used"] = "symbolic antiderivative"
+                else:
+                    log_failure("cumulative_integration", ValueError("antiderivative rejected on grid"))
+                    if method == "symbolic":
+                        return False, "The symbolic antiderivative does not match the quadrature on the grid (branch jump)", details
+    
+    details["total"] = float(cumulative[-1])
+    details["computation_time"] = time.time() - start_time
+    
+    return True, {"points": grid, "values": cumulative}, details
+
 # Función legacy para compatibilidad
 def solve_integral(function_str, lower_bound, upper_bound, variable='x'):
     """Función de compatibilidad con versiones anteriores."""
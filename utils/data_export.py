@@ -0,0 +1,227 @@
+"""
+Streaming export of sampled function data.
+
+Samples of f, f' and the running integral of f are generated in fixed-size
+chunks and written straight to CSV, Parquet or Arrow, so memory stays bounded
+by the chunk size no matter how many rows are requested:
+
+    python -m utils.data_export "sin(x)" 0 pi -n 2000000 -f parquet -o sin.parquet
+"""
+
+import argparse
+import io
+import sys
+from typing import Dict, Iterator, Union, BinaryIO
+
+import numpy as np
+
+# ✅ IMPORT OPCIONAL DE PYARROW (Parquet / Arrow)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from .expression_parser import compile_derivatives
+    from .validation import validate_integration_inputs
+    from .instrumentation import stage, count
+except ImportError:
+    from utils.expression_parser import compile_derivatives
+    from utils.validation import validate_integration_inputs
+    from utils.instrumentation import stage, count
+
+# Filas generadas por bloque (4 columnas float64 -> ~2 MB por bloque)
+DEFAULT_CHUNK_SIZE = 65536
+
+DEFAULT_EXPORT_POINTS = 10000
+
+MAX_EXPORT_POINTS = 10_000_000
+
+# Format -> (MIME type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow")
+}
+
+def available_export_formats() -> list:
+    """Formats that can be written in this environment (Parquet/Arrow need pyarrow)."""
+    return [name for name in EXPORT_FORMATS if name == "csv" or PYARROW_AVAILABLE]
+
+def export_column_names(variable: str = "x") -> list:
+    """Column names of the exported table, in order."""
+    return [variable, f"f({variable})", f"f'({variable})", f"F({variable})"]
+
+def iter_sample_chunks(expr, variable: str, lower: float, upper: float,
+                       num_points: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Sample f, f' and the running integral of f on an evenly spaced grid, chunk by chunk.
+
+    The grid is the same as np.linspace(lower, upper, num_points). The running
+    integral F(x) = ∫[lower, x] f is accumulated with the trapezoidal rule and
+    carried across chunks; segments where f is undefined contribute nothing.
+    Undefined values of f and f' are NaN.
+
+    Args:
+        expr (sp.Expr): SymPy expression
+        variable (str): Variable name
+        lower (float): First sample point
+        upper (float): Last sample point
+        num_points (int): Total number of samples (at least 2)
+        chunk_size (int): Samples per yielded chunk
+
+    Yields:
+        Dict[str, np.ndarray]: Column name -> values, with export_column_names(variable) keys
+    """
+    f, derivative = compile_derivatives(expr, variable, 1)
+    columns = export_column_names(variable)
+    step = (upper - lower) / (num_points - 1)
+
+    previous_x = previous_y = None
+    running_integral = 0.0
+
+    for start in range(0, num_points, chunk_size):
+        stop = min(start + chunk_size, num_points)
+        x_vals = lower + np.arange(start, stop, dtype=float) * step
+        if stop == num_points:
+            x_vals[-1] = upper
+
+        y_vals = f(x_vals)
+        dy_vals = derivative(x_vals)
+
+        # Trapecios, incluyendo el que une este bloque con el anterior
+        if previous_x is None:
+            x_edges, y_edges = x_vals, y_vals
+            integral_vals = np.empty(stop - start)
+            integral_vals[0] = running_integral
+            offset = 1
+        else:
+            x_edges = np.concatenate(([previous_x], x_vals))
+            y_edges = np.concatenate(([previous_y], y_vals))
+            integral_vals = np.empty(stop - start)
+            offset = 0
+
+        segments = np.nan_to_num(0.5 * (y_edges[1:] + y_edges[:-1]) * np.diff(x_edges), nan=0.0)
+        integral_vals[offset:] = running_integral + np.cumsum(segments)
+
+        running_integral = integral_vals[-1]
+        previous_x, previous_y = x_vals[-1], y_vals[-1]
+
+        count("exported_rows", stop - start)
+        yield dict(zip(columns, (x_vals, y_vals, dy_vals, integral_vals)))
+
+def _write_csv(chunks, destination: BinaryIO):
+    import pandas as pd
+
+    text_stream = io.TextIOWrapper(destination, encoding="utf-8", newline="")
+    try:
+        for index, chunk in enumerate(chunks):
+            pd.DataFrame(chunk).to_csv(text_stream, header=(index == 0), index=False)
+    finally:
+        # No cerrar el destino del llamador al liberar el wrapper
+        text_stream.flush()
+        text_stream.detach()
+
+def _write_arrow(chunks, destination: BinaryIO, file_format: str, columns: list):
+    schema = pa.schema([(name, pa.float64()) for name in columns])
+
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(destination, schema)
+    else:
+        writer = pa.ipc.new_file(destination, schema)
+
+    try:
+        for chunk in chunks:
+            # Los NaN se guardan como nulos, igual que las celdas vacías del CSV
+            arrays = [pa.array(chunk[name], from_pandas=True) for name in columns]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+    finally:
+        writer.close()
+
+def export_samples(function_str: str, lower_bound: str, upper_bound: str,
+                   destination: Union[str, BinaryIO], file_format: str = "csv",
+                   variable: str = "x", num_points: int = DEFAULT_EXPORT_POINTS,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Stream samples of a function, its derivative and its running integral to a file.
+
+    Args:
+        function_str (str): Function as string
+        lower_bound (str): Lower bound as string
+        upper_bound (str): Upper bound as string
+        destination (str or file): Output path or writable binary file object
+        file_format (str): "csv", "parquet" or "arrow"
+        variable (str): Integration variable
+        num_points (int): Number of rows (2 to MAX_EXPORT_POINTS)
+        chunk_size (int): Rows generated and written at a time
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        ValueError: If the inputs, the resolution or the format are invalid
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {file_format}")
+    if file_format not in available_export_formats():
+        raise ValueError(f"Export format '{file_format}' requires pyarrow")
+    if not 2 <= num_points <= MAX_EXPORT_POINTS:
+        raise ValueError(f"Number of points must be between 2 and {MAX_EXPORT_POINTS}")
+
+    valid, error, expr, lower_val, upper_val = validate_integration_inputs(
+        function_str, lower_bound, upper_bound, variable
+    )
+    if not valid:
+        raise ValueError(error)
+
+    chunks = iter_sample_chunks(expr, variable, lower_val, upper_val, num_points, max(1, chunk_size))
+
+    with stage("data_export"):
+        if isinstance(destination, str):
+            with open(destination, "wb") as output_file:
+                _write_chunks(chunks, output_file, file_format, variable)
+        else:
+            _write_chunks(chunks, destination, file_format, variable)
+
+    return num_points
+
+def _write_chunks(chunks, destination: BinaryIO, file_format: str, variable: str):
+    if file_format == "csv":
+        _write_csv(chunks, destination)
+    else:
+        _write_arrow(chunks, destination, file_format, export_column_names(variable))
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Export f, f' and the running integral of a function")
+    parser.add_argument("function")
+    parser.add_argument("lower")
+    parser.add_argument("upper")
+    parser.add_argument("-v", "--variable", default="x")
+    parser.add_argument("-n", "--num-points", type=int, default=DEFAULT_EXPORT_POINTS)
+    parser.add_argument("-f", "--format", dest="file_format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("-o", "--output", help="output file (default: stdout, CSV only)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.output:
+            destination = args.output
+        elif args.file_format == "csv":
+            destination = sys.stdout.buffer
+        else:
+            parser.error("--output is required for parquet and arrow")
+
+        rows = export_samples(args.function, args.lower, args.upper, destination, args.file_format,
+                              args.variable, args.num_points, args.chunk_size)
+    except ValueError as e:
+        print(f"Export error: {e}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        print(f"{rows} rows written to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,17 @@
 import sympy as sp
 import numpy as np
 import re
-from typing import Union, Tuple, Any
+import ast
+from fractions import Fraction
+from mpmath import libmp as mlib
+from functools import lru_cache
+from typing import Union, Tuple, Any, Callable
+
+# ✅ IMPORTS LOCALES
+try:
+    from .instrumentation import stage, count, register_cache
+except ImportError:
+    from utils.instrumentation import stage, count, register_cache
 
 def safe_sympify(expression: str, variable: str = "x") -> Tuple[bool, Union[sp.Expr, str]]:
     """
@@ -52,7 +62,8 @@ def safe_sympify(expression: str, variable: str = "x") -> Tuple[bool, Union[sp.E
         }
         
         # Parse the expression WITHOUT transformations parameter
-        parsed_expr = sp.sympify(cleaned_expr, locals=local_dict)
+        with stage("parsing"):
+            parsed_expr = sp.sympify(cleaned_expr, locals=local_dict)
         
         return True, parsed_expr
         
@@ -148,19 +159,8 @@ def safe_float_conversion(value: Union[str, float, int, sp.Expr]) -> Tuple[bool,
             except ValueError:
                 pass
             
-            # Try to parse as symbolic expression
-            success, parsed = safe_sympify(value.strip())
-            if success:
-                try:
-                    # Evaluate numerically
-                    result = float(parsed.evalf())
-                    if np.isnan(result) or np.isinf(result):
-                        return False, f"Expression evaluates to invalid value: {result}"
-                    return True, result
-                except Exception as e:
-                    return False, f"Cannot evaluate expression numerically: {str(e)}"
-            else:
-                return False, f"Cannot parse expression: {parsed}"
+            # Expresión simbólica (pi/2, 2*pi, e...): resultado memoizado por texto
+            return _convert_bound_expression(value.strip())
         elif hasattr(value, 'evalf'):
             # SymPy expression
             try:
@@ -180,6 +180,115 @@ def safe_float_conversion(value: Union[str, float, int, sp.Expr]) -> Tuple[bool,
     except Exception as e:
         return False, f"Conversion error: {str(e)}"
 
+# Gramática segura del evaluador rápido de límites: racionales exactos por pi o e
+_BOUND_CONSTANTS = {"pi": mlib.mpf_pi, "e": mlib.mpf_e, "E": mlib.mpf_e}
+
+# Precisión (bits) con la que Expr.evalf() de SymPy evalúa antes de redondear a 53
+_EVALF_PRECISION = 53 + 4
+
+@lru_cache(maxsize=512)
+def _convert_bound_expression(text: str) -> Tuple[bool, Union[float, str]]:
+    """Convert a symbolic bound, trying the SymPy-free evaluator before safe_sympify."""
+    result = _fast_bound_value(text)
+    if result is not None:
+        return True, result
+    
+    # Try to parse as symbolic expression
+    success, parsed = safe_sympify(text)
+    if success:
+        try:
+            # Evaluate numerically
+            result = float(parsed.evalf())
+            if np.isnan(result) or np.isinf(result):
+                return False, f"Expression evaluates to invalid value: {result}"
+            return True, result
+        except Exception as e:
+            return False, f"Cannot evaluate expression numerically: {str(e)}"
+    else:
+        return False, f"Cannot parse expression: {parsed}"
+
+def _fast_bound_value(text: str):
+    """
+    Evaluate bounds of the form q, q*pi or q*e (q rational) without SymPy.
+    
+    Integer literals combined with + - * / and at most one pi/e factor are
+    reduced exactly, then rounded the way SymPy's evalf does (rationals are
+    truncated at working precision; for q*pi the factors are multiplied
+    exactly; the result is rounded to 57 and then 53 bits), so the
+    float is identical to float(sympify(text).evalf()). Anything else
+    (decimals, powers, functions, implicit products, other names) returns None
+    and the caller uses the SymPy path.
+    """
+    try:
+        tree = ast.parse(text, mode="eval")
+    except (SyntaxError, ValueError):
+        return None
+    
+    try:
+        reduced = _reduce_bound_node(tree.body)
+    except (ZeroDivisionError, OverflowError):
+        return None
+    if reduced is None:
+        return None
+    
+    coefficient, constant = reduced
+    if coefficient == 0:
+        return 0.0
+    
+    if constant is None:
+        # evalf_rational trunca a la precisión de trabajo (round_fast)
+        value = mlib.from_rational(coefficient.numerator, coefficient.denominator, _EVALF_PRECISION, mlib.round_down)
+    elif coefficient == 1:
+        value = _BOUND_CONSTANTS[constant](_EVALF_PRECISION)
+    else:
+        # evalf_mul: factores a prec + len(args) + 5 bits, producto exacto
+        working_precision = _EVALF_PRECISION + 2 + 5
+        factor = mlib.from_rational(coefficient.numerator, coefficient.denominator, working_precision, mlib.round_down)
+        product = mlib.mpf_mul(factor, _BOUND_CONSTANTS[constant](working_precision))
+        value = mlib.mpf_pos(product, _EVALF_PRECISION, mlib.round_nearest)
+    
+    result = mlib.to_float(mlib.mpf_pos(value, 53, mlib.round_nearest))
+    return result if np.isfinite(result) else None
+
+def _reduce_bound_node(node):
+    """Reduce a node of the bound grammar to (Fraction, constant name or None)."""
+    if isinstance(node, ast.Constant):
+        # Solo enteros: los decimales y potencias quedan para SymPy
+        return (Fraction(node.value), None) if type(node.value) is int else None
+    
+    if isinstance(node, ast.Name):
+        return (Fraction(1), node.id) if node.id in _BOUND_CONSTANTS else None
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _reduce_bound_node(node.operand)
+        if operand is None or isinstance(node.op, ast.UAdd):
+            return operand
+        return -operand[0], operand[1]
+    
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub, ast.Mult, ast.Div)):
+        left = _reduce_bound_node(node.left)
+        right = _reduce_bound_node(node.right)
+        if left is None or right is None:
+            return None
+        
+        if isinstance(node.op, (ast.Add, ast.Sub)):
+            # Solo sumas de racionales puros
+            if left[1] is not None or right[1] is not None:
+                return None
+            return (left[0] + right[0] if isinstance(node.op, ast.Add) else left[0] - right[0]), None
+        
+        if isinstance(node.op, ast.Mult):
+            if left[1] is not None and right[1] is not None:
+                return None
+            return left[0] * right[0], left[1] or right[1]
+        
+        # División solo entre racionales
+        if right[1] is not None:
+            return None
+        return left[0] / right[0], left[1]
+    
+    return None
+
 def evaluate_expression_at_point(expr: sp.Expr, variable: str, point: float) -> Tuple[bool, Union[float, str]]:
     """
     Safely evaluate a SymPy expression at a specific point.
@@ -192,6 +301,8 @@ def evaluate_expression_at_point(expr: sp.Expr, variable: str, point: float) ->
     Returns:
         Tuple[bool, Union[float, str]]: (success, result_or_error_message)
     """
+    count("point_evaluations")
+    
     try:
         # CORRECCIÓN DEFINITIVA: Conversión robusta del punto de entrada
         
@@ -277,6 +388,101 @@ def evaluate_expression_at_point(expr: sp.Expr, variable: str, point: float) ->
         else:
             return False, f"Unexpected error at {variable} = {point}: {error_msg}"
 
+@lru_cache(maxsize=256)
+def compile_expression(expr: sp.Expr, variable: str = "x") -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Compile a SymPy expression into a vectorized NumPy evaluator.
+    
+    The compiled callable is cached per (expression, variable), so repeated
+    evaluations of the same function reuse a single lambdify call.
+    
+    Args:
+        expr (sp.Expr): SymPy expression
+        variable (str): Variable name
+    
+    Returns:
+        Callable[[np.ndarray], np.ndarray]: Function mapping an array of points to
+        an array of float values, with NaN wherever the expression is undefined
+    """
+    var_symbol = sp.Symbol(variable, real=True)
+    
+    try:
+        numpy_func = sp.lambdify(var_symbol, expr, modules="numpy")
+    except Exception:
+        numpy_func = None
+    
+    def evaluate_pointwise(points: np.ndarray) -> np.ndarray:
+        values = np.empty(points.shape, dtype=float)
+        for index, point in np.ndenumerate(points):
+            success, value = evaluate_expression_at_point(expr, variable, float(point))
+            values[index] = value if success else np.nan
+        return values
+    
+    def evaluate(points) -> np.ndarray:
+        points = np.asarray(points, dtype=float)
+        count("evaluations", points.size)
+        
+        if numpy_func is None:
+            return evaluate_pointwise(points)
+        
+        try:
+            with np.errstate(all="ignore"):
+                raw_values = numpy_func(points)
+            values = np.broadcast_to(np.asarray(raw_values), points.shape)
+            
+            if np.iscomplexobj(values):
+                # Mismo criterio que evaluate_expression_at_point: parte imaginaria => indefinido
+                values = np.where(np.abs(values.imag) > 1e-12, np.nan, values.real)
+            
+            values = np.array(values, dtype=float)
+        except Exception:
+            return evaluate_pointwise(points)
+        
+        values[~np.isfinite(values)] = np.nan
+        return values
+    
+    return evaluate
+
+@lru_cache(maxsize=128)
+def compile_derivatives(expr: sp.Expr, variable: str = "x", order: int = 2) -> Tuple[Callable[[np.ndarray], np.ndarray], ...]:
+    """
+    Compile an expression together with its first `order` derivatives.
+    
+    Args:
+        expr (sp.Expr): SymPy expression
+        variable (str): Variable name
+        order (int): Highest derivative order to compile
+    
+    Returns:
+        Tuple[Callable, ...]: (f, f', f'', ...) vectorized evaluators
+    """
+    var_symbol = sp.Symbol(variable, real=True)
+    
+    evaluators = [compile_expression(expr, variable)]
+    current = expr
+    for _ in range(order):
+        current = sp.diff(current, var_symbol)
+        evaluators.append(compile_expression(current, variable))
+    
+    return tuple(evaluators)
+
+register_cache("compile_expression", compile_expression)
+register_cache("compile_derivatives", compile_derivatives)
+
+def evaluate_expression_on_grid(expr: sp.Expr, variable: str, points) -> np.ndarray:
+    """
+    Evaluate a SymPy expression on an array of points in a single vectorized pass.
+    
+    Args:
+        expr (sp.Expr): SymPy expression
+        variable (str): Variable name
+        points: Array-like of evaluation points
+    
+    Returns:
+        np.ndarray: Float values, NaN where the expression is undefined
+    """
+    return compile_expression(expr, variable)(points)
+
 def validate_expression_domain(expr: sp.Expr, variable: str, lower_bound: float, upper_bound: float, num_points: int = 10) -> Tuple[bool, str]:
     """
     Validate that an expression is well-defined over a given domain.
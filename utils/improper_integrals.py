@@ -0,0 +1,426 @@
+import sympy as sp
+import numpy as np
+import copy
+import time
+from functools import lru_cache
+from typing import Tuple, Union, Dict, Any, List, Callable
+
+from sympy.calculus.singularities import singularities
+
+try:
+    from .expression_parser import safe_float_conversion, compile_expression
+    from .validation import validate_function_input, parse_infinite_bound
+    from .calculator import get_symbolic_antiderivative
+    from .instrumentation import stage, log_failure, register_cache
+except ImportError:
+    from utils.expression_parser import safe_float_conversion, compile_expression
+    from utils.validation import validate_function_input, parse_infinite_bound
+    from utils.calculator import get_symbolic_antiderivative
+    from utils.instrumentation import stage, log_failure, register_cache
+
+# Cuadratura doble exponencial: paso inicial en t y refinamientos (h = 0.5 / 2^k)
+DE_INITIAL_STEP = 0.5
+DE_MAX_LEVELS = 7
+
+# Rango de t: tanh-sinh llega a ~1e-37 del extremo, exp-sinh cubre u en [1e-50, 1e50]
+TANH_SINH_RANGE = 4.0
+EXP_SINH_RANGE = 5.0
+
+CONVERGENCE_TOLERANCE = 1e-10
+
+# Si el integrando transformado en el borde del rango supera esta fracción de |I| no decae
+TAIL_TOLERANCE = 1e-6
+
+# Nodos del borde usados para decidir entre divergencia (signo fijo) y oscilación
+TAIL_NODES = 4
+
+# Acuerdo exigido entre los límites de la antiderivada y la cuadratura
+SYMBOLIC_AGREEMENT = 1e-6
+
+MAX_SINGULARITIES = 50
+
+def is_improper(lower_bound: str, upper_bound: str) -> bool:
+    """True if either bound is infinite ("inf", "-oo", "∞"...)."""
+    return parse_infinite_bound(lower_bound) is not None or parse_infinite_bound(upper_bound) is not None
+
+def _parse_bound(bound: str) -> Tuple[bool, Union[sp.Expr, str]]:
+    """Exact value of a bound: ±oo for infinite bounds, a real SymPy number otherwise."""
+    infinite = parse_infinite_bound(bound)
+    if infinite is not None:
+        return True, sp.oo if infinite > 0 else -sp.oo
+
+    success, value = safe_float_conversion(bound)
+    if not success:
+        return False, value
+    # Valor exacto (pi/2, 1/10...) para que f(a + u) se simplifique alrededor del extremo
+    return True, sp.nsimplify(value, [sp.pi, sp.E])
+
+@lru_cache(maxsize=256)
+def find_singularities(expr: sp.Expr, variable: str, lower: sp.Expr, upper: sp.Expr) -> Tuple[sp.Expr, ...]:
+    """
+    Exact singular points of f in [a, b] (bounds may be ±oo), sorted.
+
+    Returns:
+        Tuple[sp.Expr, ...]: Singular points; empty if there are none or SymPy cannot find them
+
+    Raises:
+        ValueError: If there are infinitely (or too) many singularities in the interval
+    """
+    var_symbol = sp.Symbol(variable, real=True)
+    try:
+        points = singularities(expr, var_symbol, sp.Interval(lower, upper))
+    except Exception as e:
+        log_failure("Singularity detection", e)
+        return ()
+
+    if points is sp.S.EmptySet:
+        return ()
+    if not isinstance(points, sp.FiniteSet):
+        raise ValueError("The function has infinitely many singularities in the interval")
+
+    points = [point for point in points if point.is_real and point.is_finite]
+    if len(points) > MAX_SINGULARITIES:
+        raise ValueError(f"The function has more than {MAX_SINGULARITIES} singularities in the interval")
+    return tuple(sorted(points, key=float))
+
+register_cache("find_singularities", find_singularities)
+
+def _endpoint_is_singular(expr: sp.Expr, variable: str, point: sp.Expr, singular_points: tuple) -> bool:
+    if not point.is_finite or point in singular_points:
+        return True
+    return not np.isfinite(compile_expression(expr, variable)(np.array([float(point)]))[0])
+
+def _split_interval(expr: sp.Expr, variable: str, lower: sp.Expr, upper: sp.Expr,
+                    singular_points: tuple) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Split [a, b] at the interior singularities.
+
+    Returns:
+        Tuple[List, List]: (segments (l, r) for the antiderivative limits,
+        pieces (anchor, direction, far end) for the quadrature, each with its only
+        possible singularity at the anchor)
+    """
+    interior = [point for point in singular_points if lower < point < upper]
+    edges = [lower] + interior + [upper]
+    singular = [_endpoint_is_singular(expr, variable, edge, singular_points) for edge in edges]
+
+    segments, pieces = [], []
+    for (left, right), (left_singular, right_singular) in zip(zip(edges, edges[1:]), zip(singular, singular[1:])):
+        segments.append((left, right))
+        if left == -sp.oo and right == sp.oo:
+            pieces += [(sp.Integer(0), -1, -sp.oo), (sp.Integer(0), 1, sp.oo)]
+        elif left == -sp.oo:
+            pieces.append((right, -1, left))
+        elif right == sp.oo:
+            pieces.append((left, 1, right))
+        elif left_singular and right_singular:
+            middle = (left + right) / 2
+            pieces += [(left, 1, middle), (right, -1, middle)]
+        elif right_singular:
+            pieces.append((right, -1, left))
+        else:
+            pieces.append((left, 1, right))
+
+    return segments, pieces
+
+def _shifted_evaluator(expr: sp.Expr, variable: str, anchor: sp.Expr, direction: int) -> Callable:
+    """Compiled u -> f(anchor + direction·u), simplified so that u = 1e-40 keeps its digits."""
+    var_symbol = sp.Symbol(variable, real=True)
+    shifted = expr.subs(var_symbol, anchor + direction * var_symbol)
+    try:
+        # (1 + u)² - 1 -> u² + 2u: sin cancelación cerca del extremo
+        shifted = sp.expand(shifted)
+    except Exception:
+        pass
+    return compile_expression(shifted, variable)
+
+def _tail_status(tail_values: np.ndarray) -> str:
+    """Divergent if the non-decaying tail keeps its sign, oscillatory otherwise."""
+    signs = np.sign(tail_values)
+    return "divergent" if np.all(signs == signs[0]) and signs[0] != 0 else "oscillatory"
+
+def double_exponential_quadrature(func: Callable, length: float) -> Dict[str, Any]:
+    """
+    Integrate func over [0, length] (length may be inf) with double exponential quadrature.
+
+    Finite intervals use tanh-sinh (u = L / (1 + e^{-π sinh t})) and infinite ones
+    exp-sinh (u = e^{π/2 sinh t}); both pack nodes double-exponentially close to
+    u = 0, so integrable endpoint singularities there converge. The step in t is
+    halved until two estimates agree, reusing the previous nodes.
+
+    Diagnostics: the transformed integrand must vanish at both ends of the t
+    range; a tail that does not decay (or overflows) means divergence when it
+    keeps its sign and an oscillatory, inconclusive integral otherwise.
+
+    Args:
+        func (Callable): Vectorized integrand of u, with NaN where undefined
+        length (float): Interval length (np.inf for [0, ∞))
+
+    Returns:
+        Dict[str, Any]: value, error, levels, evaluations, status ("converged",
+        "not_converged", "divergent", "oscillatory" or "undefined") and the end
+        ("start" or "end") where a divergence was detected
+    """
+    infinite = not np.isfinite(length)
+    t_range = EXP_SINH_RANGE if infinite else TANH_SINH_RANGE
+
+    def transformed(t: np.ndarray) -> np.ndarray:
+        with np.errstate(all="ignore"):
+            if infinite:
+                u = np.exp(np.pi / 2 * np.sinh(t))
+                du = np.pi / 2 * np.cosh(t) * u
+            else:
+                v = np.pi * np.sinh(t)
+                near, far = 1 / (1 + np.exp(-v)), 1 / (1 + np.exp(v))
+                u = length * near
+                du = length * np.pi * np.cosh(t) * near * far
+            return func(u) * du
+
+    result = {"value": None, "error": None, "levels": 0, "evaluations": 0, "status": "converged", "end": None}
+
+    step = DE_INITIAL_STEP
+    nodes = np.arange(-t_range, t_range + step / 2, step)
+    values = transformed(nodes)
+    result["evaluations"] = int(nodes.size)
+
+    undefined = ~np.isfinite(values)
+    if undefined.any():
+        # Solo se admite un tramo indefinido pegado a un borde si el integrando crece hacia él (desbordamiento)
+        defined_indices = np.flatnonzero(~undefined)
+        if defined_indices.size < 3 or undefined[defined_indices[0]:defined_indices[-1] + 1].any():
+            result["status"] = "undefined"
+            return result
+        for end, inner in (("start", defined_indices[:3]), ("end", defined_indices[-3:][::-1])):
+            touches = undefined[0] if end == "start" else undefined[-1]
+            if touches:
+                growing = np.all(np.diff(np.abs(values[inner])) < 0)
+                result.update(status="divergent" if growing else "undefined", end=end)
+                return result
+
+    estimate = step * values.sum()
+    estimates = [estimate]
+    for level in range(1, DE_MAX_LEVELS + 1):
+        step /= 2
+        new_nodes = np.arange(-t_range + step, t_range, 2 * step)
+        new_values = transformed(new_nodes)
+        result["evaluations"] += int(new_nodes.size)
+        if not np.all(np.isfinite(new_values)):
+            result["status"] = "undefined"
+            return result
+
+        estimate = estimate / 2 + step * new_values.sum()
+        estimates.append(estimate)
+        result["levels"] = level
+        if level >= 2 and abs(estimates[-1] - estimates[-2]) <= CONVERGENCE_TOLERANCE * max(1.0, abs(estimate)):
+            break
+
+    result["value"] = float(estimates[-1])
+    result["error"] = float(abs(estimates[-1] - estimates[-2]))
+
+    # Colas: el integrando transformado debe anularse en los dos bordes del rango de t
+    scale = TAIL_TOLERANCE * max(1.0, abs(result["value"]))
+    for end, tail in (("start", values[:TAIL_NODES]), ("end", values[::-1][:TAIL_NODES])):
+        if abs(tail[0]) > scale:
+            result.update(status=_tail_status(tail), end=end)
+            return result
+
+    if result["error"] > CONVERGENCE_TOLERANCE * max(1.0, abs(result["value"])):
+        result["status"] = "not_converged"
+    return result
+
+def _antiderivative_limits(expr: sp.Expr, variable: str, segments: List[tuple]) -> Dict[str, Any]:
+    """
+    Σ [lim F(x→r⁻) - lim F(x→l⁺)] over the segments, with F the cached antiderivative.
+
+    Returns:
+        Dict[str, Any]: {"status": "converged", "value"} | {"status": "divergent", "point"} |
+        {"status": "unavailable"} when there is no closed form or a limit is not a real number
+    """
+    antiderivative = get_symbolic_antiderivative(expr, variable)
+    if antiderivative is None:
+        return {"status": "unavailable"}
+
+    var_symbol = sp.Symbol(variable, real=True)
+    total = sp.Integer(0)
+    try:
+        for left, right in segments:
+            limits = []
+            for point, direction in ((left, "+"), (right, "-")):
+                limit = sp.limit(antiderivative, var_symbol, point, direction)
+                if limit in (sp.oo, -sp.oo):
+                    return {"status": "divergent", "point": point}
+                limits.append(limit)
+            total += limits[1] - limits[0]
+        value = float(sp.N(total))
+    except Exception as e:
+        # AccumBounds (sin(∞)), valores complejos o límites no resueltos
+        log_failure("Improper integral limits", e)
+        return {"status": "unavailable"}
+
+    return {"status": "converged", "value": value} if np.isfinite(value) else {"status": "unavailable"}
+
+def _format_point(point: sp.Expr) -> str:
+    return "∞" if point == sp.oo else "-∞" if point == -sp.oo else f"{float(point):g}"
+
+@lru_cache(maxsize=128)
+def _calculate_improper_cached(function_str: str, lower_bound: str, upper_bound: str,
+                               variable: str) -> Tuple[bool, Union[float, str], Dict[str, Any]]:
+    """Integral impropia por límites de la antiderivada y cuadratura doble exponencial (cacheado por entradas)."""
+    start_time = time.time()
+
+    valid, error, expr = validate_function_input(function_str, variable)
+    if not valid:
+        return False, f"Validation error: {error}", {}
+
+    bounds = []
+    for name, bound in (("lower", lower_bound), ("upper", upper_bound)):
+        success, value = _parse_bound(bound)
+        if not success:
+            return False, f"Validation error: Invalid {name} bound: {value}", {}
+        bounds.append(value)
+    lower, upper = bounds
+    if not lower < upper:
+        return False, f"Validation error: Lower bound ({_format_point(lower)}) must be less than upper bound ({_format_point(upper)})", {}
+
+    improper = {"singularities": [], "pieces": [], "symbolic_result": None, "numeric_result": None, "status": None}
+    details = {
+        "function": function_str,
+        "variable": variable,
+        "lower_bound": float(lower),
+        "upper_bound": float(upper),
+        "method_used": "",
+        "computation_time": 0,
+        "approximation_error": None,
+        "validation": {},
+        "improper": improper
+    }
+
+    with stage("singularity_detection"):
+        try:
+            singular_points = find_singularities(expr, variable, lower, upper)
+        except ValueError as e:
+            return False, str(e), details
+        segments, pieces = _split_interval(expr, variable, lower, upper, singular_points)
+        improper["singularities"] = [float(point) for point in singular_points]
+
+    # Método 1: límites de la antiderivada en los extremos y singularidades
+    with stage("symbolic_limits"):
+        symbolic = _antiderivative_limits(expr, variable, segments)
+
+    if symbolic["status"] == "divergent":
+        improper["status"] = "divergent"
+        details["method_used"] = "Antiderivative limits"
+        details["computation_time"] = time.time() - start_time
+        return False, f"The improper integral diverges (the antiderivative tends to infinity at {variable} = {_format_point(symbolic['point'])})", details
+    if symbolic["status"] == "converged":
+        improper["symbolic_result"] = symbolic["value"]
+
+    # Método 2: cuadratura doble exponencial por tramos, singularidad siempre en u = 0
+    with stage("improper_quadrature"):
+        numeric_total, numeric_error, statuses = 0.0, 0.0, []
+        for anchor, direction, far_end in pieces:
+            length = float(abs(far_end - anchor))
+            piece = double_exponential_quadrature(_shifted_evaluator(expr, variable, anchor, direction), length)
+
+            ends = (anchor, far_end) if direction > 0 else (far_end, anchor)
+            piece["interval"] = (float(ends[0]), float(ends[1]))
+            piece["transformation"] = "exp-sinh" if not np.isfinite(length) else "tanh-sinh"
+            if piece["end"] is not None:
+                piece["point"] = _format_point(anchor if piece["end"] == "start" else far_end)
+            improper["pieces"].append(piece)
+            statuses.append(piece["status"])
+
+            if piece["value"] is not None:
+                numeric_total += piece["value"]
+                numeric_error += piece["error"]
+
+    # Estado global: el peor de los tramos
+    for status in ("undefined", "divergent", "oscillatory", "not_converged", "converged"):
+        if status in statuses:
+            numeric_status = status
+            break
+    if numeric_status in ("converged", "not_converged"):
+        improper["numeric_result"] = numeric_total
+        details["approximation_error"] = numeric_error
+
+    details["computation_time"] = time.time() - start_time
+
+    if improper["symbolic_result"] is not None:
+        symbolic_value = improper["symbolic_result"]
+        agrees = numeric_status == "converged" and abs(symbolic_value - numeric_total) <= SYMBOLIC_AGREEMENT * max(1.0, abs(numeric_total))
+        details["validation"] = {
+            "symbolic_result": symbolic_value,
+            "numerical_result": improper["numeric_result"],
+            "cross_validation": agrees
+        }
+        # Una antiderivada con saltos (ramas de atan, log) da límites falsos: manda la cuadratura convergida
+        if numeric_status != "converged" or agrees:
+            improper["status"] = "convergent"
+            details["method_used"] = "Improper Integral (antiderivative limits)"
+            return True, symbolic_value, details
+
+    if numeric_status in ("converged", "not_converged"):
+        improper["status"] = "convergent"
+        details["method_used"] = "Improper Integral (double exponential quadrature)"
+        if numeric_status == "not_converged":
+            # Típico de colas oscilantes que decaen (sin(x)/x²): el error estimado acompaña al valor
+            details["method_used"] += ", not fully converged"
+        return True, numeric_total, details
+
+    failed_piece = next(piece for piece in improper["pieces"] if piece["status"] == numeric_status)
+    improper["status"] = numeric_status
+    if numeric_status == "divergent":
+        return False, f"The improper integral diverges (the integrand does not decay fast enough near {variable} = {failed_piece['point']})", details
+    if numeric_status == "oscillatory":
+        return False, f"The improper integral does not converge numerically: the integrand keeps oscillating near {variable} = {failed_piece['point']}", details
+    return False, f"The function is undefined on part of the interval [{failed_piece['interval'][0]:g}, {failed_piece['interval'][1]:g}]", details
+
+register_cache("calculate_improper_integral", _calculate_improper_cached)
+
+def calculate_improper_integral(function_str: str, lower_bound: str, upper_bound: str,
+                                variable: str = "x") -> Tuple[bool, Union[float, str], Dict[str, Any]]:
+    """
+    Calculate an improper integral: infinite bounds and/or singularities in [a, b].
+
+    The interval is split at the singular points SymPy finds, so each piece has
+    at most one singular end. Two methods are combined:
+
+    - Antiderivative limits: Σ [F(r⁻) - F(l⁺)] with the cached antiderivative;
+      an infinite limit proves divergence.
+    - Double exponential quadrature of f(anchor ± u): exp-sinh for infinite
+      tails, tanh-sinh towards finite singular ends. It checks convergence
+      between refinements and that the transformed integrand decays at both
+      ends, which detects divergence without a closed form.
+
+    The limits are used when the quadrature agrees with them or cannot decide
+    (e.g. oscillating tails such as sin(x)/x). Results are cached per input tuple.
+
+    Args:
+        function_str (str): Function as string
+        lower_bound (str): Lower bound ("-inf", "-oo" and "-∞" are accepted)
+        upper_bound (str): Upper bound ("inf", "oo", "∞" are accepted)
+        variable (str): Integration variable
+
+    Returns:
+        Tuple[bool, Union[float, str], Dict]: (success, value or error message, details);
+        details["improper"] has the singularities, the per-piece diagnostics and the
+        status ("convergent", "divergent", "oscillatory" or "undefined")
+    """
+    try:
+        return copy.deepcopy(_calculate_improper_cached(function_str, str(lower_bound), str(upper_bound), variable))
+    except Exception as e:
+        return False, f"Improper integral failed: {str(e)}", {}
+
+def has_singularities(expr: sp.Expr, variable: str, lower_val: float, upper_val: float) -> bool:
+    """
+    True if SymPy finds a singular point of f in the finite interval [a, b] (endpoints included).
+
+    Used by calculate_definite_integral_robust to send integrals such as
+    ∫[0, 1] 1/sqrt(x) or ∫[-1, 1] 1/x to calculate_improper_integral.
+    """
+    lower = sp.nsimplify(lower_val, [sp.pi, sp.E])
+    upper = sp.nsimplify(upper_val, [sp.pi, sp.E])
+    try:
+        return bool(find_singularities(expr, variable, lower, upper))
+    except ValueError:
+        return True
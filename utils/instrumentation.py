@@ -0,0 +1,164 @@
+"""
+Lightweight instrumentation for the calculation pipeline.
+
+Stages (parsing, validation, integration, plotting...) are timed with the
+``stage`` context manager and events are tallied with ``count``. Nothing is
+recorded unless a report is active, so the hooks cost almost nothing in
+normal use:
+
+    with instrument() as report:
+        calculate_definite_integral_robust("sin(x)", "0", "pi")
+    report["stages"]["symbolic_integration"]["total_time"]
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any
+
+logger = logging.getLogger("calculo")
+
+# Reportes activos del hilo actual (Streamlit ejecuta cada rerun en su propio hilo)
+_state = threading.local()
+
+# Cached functions whose hit/miss counters are included in every report
+_registered_caches: Dict[str, Callable] = {}
+
+def _active_reports() -> list:
+    reports = getattr(_state, "reports", None)
+    if reports is None:
+        reports = _state.reports = []
+    return reports
+
+def register_cache(name: str, cached_function: Callable) -> Callable:
+    """
+    Include an lru_cache'd function in the cache statistics of every report.
+
+    Args:
+        name (str): Name shown in the report
+        cached_function (Callable): Function decorated with functools.lru_cache
+
+    Returns:
+        Callable: The same function, so this can be used as a decorator
+    """
+    _registered_caches[name] = cached_function
+    return cached_function
+
+def clear_caches():
+    """Empty every registered cache (used to measure cold runs)."""
+    for cached_function in _registered_caches.values():
+        cached_function.cache_clear()
+
+def _cache_snapshot() -> Dict[str, tuple]:
+    snapshot = {}
+    for name, cached_function in _registered_caches.items():
+        info = cached_function.cache_info()
+        snapshot[name] = (info.hits, info.misses)
+    return snapshot
+
+def new_report() -> Dict[str, Any]:
+    """Create an empty performance report."""
+    return {
+        "total_time": 0.0,
+        "stages": {},
+        "counters": {},
+        "caches": {},
+        "events": []
+    }
+
+@contextmanager
+def instrument():
+    """
+    Collect timings, counters and cache statistics for the enclosed code.
+
+    Reports can be nested; inner stages are recorded in every active report.
+    Cache statistics come from process-wide lru_cache counters, so concurrent
+    sessions may show up in them.
+
+    Yields:
+        dict: Report with total_time, stages, counters, caches and events
+    """
+    report = new_report()
+    reports = _active_reports()
+    reports.append(report)
+    caches_before = _cache_snapshot()
+    start_time = time.perf_counter()
+
+    try:
+        yield report
+    finally:
+        report["total_time"] = time.perf_counter() - start_time
+        reports.remove(report)
+
+        for name, (hits, misses) in _cache_snapshot().items():
+            hits_before, misses_before = caches_before.get(name, (0, 0))
+            report["caches"][name] = {
+                "hits": hits - hits_before,
+                "misses": misses - misses_before
+            }
+
+@contextmanager
+def stage(name: str):
+    """
+    Time a pipeline stage in all active reports.
+
+    Args:
+        name (str): Stage name (e.g. "parsing", "numeric_integration")
+    """
+    reports = getattr(_state, "reports", None)
+    if not reports:
+        yield
+        return
+
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start_time
+        for report in reports:
+            entry = report["stages"].setdefault(name, {"calls": 0, "total_time": 0.0})
+            entry["calls"] += 1
+            entry["total_time"] += elapsed
+
+def count(name: str, amount: int = 1):
+    """
+    Increment a counter in all active reports.
+
+    Args:
+        name (str): Counter name (e.g. "evaluations")
+        amount (int): Amount to add
+    """
+    reports = getattr(_state, "reports", None)
+    if not reports:
+        return
+
+    for report in reports:
+        report["counters"][name] = report["counters"].get(name, 0) + amount
+
+def log_failure(stage_name: str, error: Exception):
+    """
+    Record a recoverable failure instead of printing it.
+
+    Args:
+        stage_name (str): Stage where the failure happened
+        error (Exception): The exception that was handled
+    """
+    message = f"{stage_name} failed: {error}"
+    logger.warning(message)
+
+    for report in getattr(_state, "reports", None) or []:
+        report["events"].append(message)
+
+def summarize_stages(report: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Get the total time per stage of a report, slowest first.
+
+    Args:
+        report (dict): Report produced by instrument()
+
+    Returns:
+        dict: Stage name -> total seconds
+    """
+    stages = sorted(report["stages"].items(), key=lambda item: item[1]["total_time"], reverse=True)
+    return {name: entry["total_time"] for name, entry in stages}
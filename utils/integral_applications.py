@@ -0,0 +1,217 @@
+import numpy as np
+import sympy as sp
+import copy
+from functools import lru_cache
+from typing import Tuple, Union, Dict, Any, Optional
+
+try:
+    from .expression_parser import compile_derivatives
+    from .validation import validate_integration_inputs
+    from .calculator import antiderivative_difference
+    from .improper_integrals import find_singularities, calculate_improper_integral
+    from .instrumentation import stage, register_cache
+except ImportError:
+    from utils.expression_parser import compile_derivatives
+    from utils.validation import validate_integration_inputs
+    from utils.calculator import antiderivative_difference
+    from utils.improper_integrals import find_singularities, calculate_improper_integral
+    from utils.instrumentation import stage, register_cache
+
+# Cuadratura de Gauss-Legendre compuesta: paneles x nodos por panel
+QUADRATURE_PANELS = 64
+QUADRATURE_NODES = 16
+
+# Subpaneles geométricos hacia cada extremo (razón 0.15) para singularidades como sqrt(x) en 0
+ENDPOINT_LEVELS = 12
+ENDPOINT_RATIO = 0.15
+
+APPLICATIONS = ("arc_length", "surface_area", "centroid", "work", "average_value")
+
+def _gauss_legendre_grid(lower_val: float, upper_val: float,
+                         panels: int = QUADRATURE_PANELS, nodes: int = QUADRATURE_NODES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nodes and weights of composite Gauss-Legendre quadrature on [a, b].
+
+    The nodes are interior and the end panels are graded geometrically, so
+    integrable singularities of f' at the bounds (e.g. sqrt(x) at 0) keep
+    ~1e-8 accuracy instead of breaking the quadrature.
+    """
+    reference_nodes, reference_weights = np.polynomial.legendre.leggauss(nodes)
+    edges = np.linspace(lower_val, upper_val, panels + 1)
+
+    first_width, last_width = edges[1] - edges[0], edges[-1] - edges[-2]
+    first_edges = edges[0] + first_width * ENDPOINT_RATIO ** np.arange(ENDPOINT_LEVELS, 0, -1)
+    last_edges = edges[-1] - last_width * ENDPOINT_RATIO ** np.arange(1, ENDPOINT_LEVELS + 1)
+    edges = np.concatenate(([edges[0]], first_edges, edges[1:-1], last_edges, [edges[-1]]))
+
+    half_widths = np.diff(edges)[:, np.newaxis] / 2
+    centers = (edges[:-1] + edges[1:])[:, np.newaxis] / 2
+    points = (centers + half_widths * reference_nodes).ravel()
+    weights = (half_widths * reference_weights).ravel()
+    return points, weights
+
+def _singular_points(expr: sp.Expr, evaluator, variable: str, lower_val: float, upper_val: float) -> Optional[list]:
+    """
+    Singular points of expr in [a, b]: SymPy's plus the endpoints where it is not finite.
+
+    Returns:
+        list or None: Sorted points (floats); None if there are infinitely many
+    """
+    lower = sp.nsimplify(lower_val, [sp.pi, sp.E])
+    upper = sp.nsimplify(upper_val, [sp.pi, sp.E])
+    try:
+        points = {float(point) for point in find_singularities(expr, variable, lower, upper)}
+    except ValueError:
+        return None
+
+    # log(x) en 0, por ejemplo, no siempre aparece en singularities()
+    endpoint_values = evaluator(np.array([lower_val, upper_val]))
+    points.update(point for point, value in zip((lower_val, upper_val), endpoint_values) if not np.isfinite(value))
+    return sorted(points)
+
+def _split_grid(lower_val: float, upper_val: float, breakpoints: list) -> Tuple[np.ndarray, np.ndarray]:
+    """Gauss-Legendre grid graded towards every breakpoint (interior singularities of f')."""
+    edges = [lower_val] + [point for point in breakpoints if lower_val < point < upper_val] + [upper_val]
+    grids = [_gauss_legendre_grid(left, right) for left, right in zip(edges[:-1], edges[1:])]
+    return np.concatenate([points for points, _ in grids]), np.concatenate([weights for _, weights in grids])
+
+def _format_points(points: Optional[list], variable: str) -> str:
+    if points is None:
+        return "infinitely many points"
+    return ", ".join(f"{variable} = {point:g}" for point in points)
+
+@lru_cache(maxsize=128)
+def _applications_cached(function_str: str, lower_bound: str, upper_bound: str, variable: str) -> Dict[str, Any]:
+    """Todas las aplicaciones con una sola evaluación de f y f' (cacheado por entradas)."""
+    valid, error, expr, lower_val, upper_val = validate_integration_inputs(
+        function_str, lower_bound, upper_bound, variable
+    )
+    if not valid:
+        return {"error": error}
+
+    with stage("applied_integrals"):
+        f, derivative = compile_derivatives(expr, variable, 1)
+        var_symbol = sp.Symbol(variable, real=True)
+        singular = _singular_points(expr, f, variable, lower_val, upper_val)
+
+    # f no acotada: los nodos interiores nunca caen en la singularidad, así que la
+    # cuadratura daría un número finito sin sentido. ∫ f va al motor impropio y las
+    # demás aplicaciones (longitud, superficie, ȳ del centroide) divergen.
+    if singular is None or singular:
+        message = f"f is singular in the interval ({_format_points(singular, variable)})"
+        results = {"domain": [lower_val, upper_val], "quadrature_points": 0, "singularities": singular}
+        success, integral, _ = calculate_improper_integral(function_str, lower_bound, upper_bound, variable)
+        if success:
+            results["work"] = integral
+            results["average_value"] = integral / (upper_val - lower_val)
+        else:
+            results["work"] = results["average_value"] = integral
+        results["arc_length"] = results["surface_area"] = results["centroid"] = message
+        return results
+
+    with stage("applied_integrals"):
+        # f acotada con f' singular (p. ej. sqrt(x)): la malla se gradúa hacia esos puntos
+        slope_singular = _singular_points(sp.diff(expr, var_symbol), derivative, variable, lower_val, upper_val)
+        points, weights = _split_grid(lower_val, upper_val, slope_singular or [])
+        values = f(points)
+        slopes = derivative(points)
+
+    results = {"domain": [lower_val, upper_val], "quadrature_points": int(points.size)}
+
+    # ∫ f: antiderivada cacheada si existe, si no la misma cuadratura
+    integral = antiderivative_difference(expr, variable, lower_val, upper_val)
+    values_defined = bool(np.all(np.isfinite(values)))
+    if integral is None and values_defined:
+        integral = float(weights @ values)
+
+    if integral is not None:
+        results["work"] = integral
+        results["average_value"] = integral / (upper_val - lower_val)
+    else:
+        results["work"] = results["average_value"] = "The function is undefined in the interval"
+
+    if slope_singular is None:
+        results["arc_length"] = results["surface_area"] = (
+            f"f' is singular in the interval ({_format_points(slope_singular, variable)})")
+    elif values_defined and np.all(np.isfinite(slopes)):
+        arc_element = np.sqrt(1 + slopes ** 2)
+        results["arc_length"] = float(weights @ arc_element)
+        results["surface_area"] = float(2 * np.pi * (weights @ (np.abs(values) * arc_element)))
+    else:
+        results["arc_length"] = results["surface_area"] = "f or f' is undefined in the interval"
+
+    if values_defined:
+        # Centroide de la región entre f y el eje: (∫x f / A, ∫f²/2 / A)
+        area = float(weights @ values)
+        if abs(area) > 1e-12:
+            results["centroid"] = (float(weights @ (points * values)) / area,
+                                   float(weights @ (values ** 2 / 2)) / area)
+        else:
+            results["centroid"] = "The signed area is zero, so the centroid is undefined"
+    else:
+        results["centroid"] = "The function is undefined in the interval"
+
+    return results
+
+register_cache("integral_applications", _applications_cached)
+
+def calculate_integral_applications(function_str: str, lower_bound: str, upper_bound: str,
+                                    variable: str = "x") -> Dict[str, Any]:
+    """
+    Compute arc length, surface area, centroid, work and average value together.
+
+    f and f' are compiled once (compile_derivatives) and evaluated in a single
+    vectorized pass on composite Gauss-Legendre nodes; work and average value
+    use the cached antiderivative when it exists. Results are cached per input
+    tuple, so a full applications panel costs about one integral. If f is
+    singular in [a, b] (find_singularities), work and average value go through
+    calculate_improper_integral and the other applications are reported as
+    divergent; interior singularities of f' only refine the quadrature grid.
+
+    - arc_length:    L = ∫ sqrt(1 + f'²) dx
+    - surface_area:  S = 2π ∫ |f| sqrt(1 + f'²) dx (revolution around the variable axis)
+    - centroid:      (∫ x f dx / A, ∫ f²/2 dx / A) with A = ∫ f dx (signed region)
+    - work:          W = ∫ F(x) dx, with f as the force
+    - average_value: (1 / (b - a)) ∫ f dx
+
+    Returns:
+        dict: Application name -> value (float, or (x, y) for the centroid) or an
+        error message string; {"error": message} if the inputs are invalid
+    """
+    try:
+        return copy.deepcopy(_applications_cached(function_str, str(lower_bound), str(upper_bound), variable))
+    except Exception as e:
+        return {"error": f"Applied integrals failed: {str(e)}"}
+
+def _single_application(name: str, function_str: str, lower_bound: str, upper_bound: str,
+                        variable: str) -> Tuple[bool, Union[float, tuple, str]]:
+    results = calculate_integral_applications(function_str, lower_bound, upper_bound, variable)
+    if "error" in results:
+        return False, results["error"]
+    value = results[name]
+    return (False, value) if isinstance(value, str) else (True, value)
+
+def calculate_arc_length(function_str: str, lower_bound: str, upper_bound: str,
+                         variable: str = "x") -> Tuple[bool, Union[float, str]]:
+    """Arc length of y = f(x) on [a, b]. Returns (success, length or error message)."""
+    return _single_application("arc_length", function_str, lower_bound, upper_bound, variable)
+
+def calculate_surface_area(function_str: str, lower_bound: str, upper_bound: str,
+                           variable: str = "x") -> Tuple[bool, Union[float, str]]:
+    """Area of the surface of revolution of f around the variable axis. Returns (success, area or error)."""
+    return _single_application("surface_area", function_str, lower_bound, upper_bound, variable)
+
+def calculate_centroid(function_str: str, lower_bound: str, upper_bound: str,
+                       variable: str = "x") -> Tuple[bool, Union[tuple, str]]:
+    """Centroid of the region between f and the axis. Returns (success, (x, y) or error)."""
+    return _single_application("centroid", function_str, lower_bound, upper_bound, variable)
+
+def calculate_work(function_str: str, lower_bound: str, upper_bound: str,
+                   variable: str = "x") -> Tuple[bool, Union[float, str]]:
+    """Work done by the force f along [a, b]. Returns (success, work or error)."""
+    return _single_application("work", function_str, lower_bound, upper_bound, variable)
+
+def calculate_average_value(function_str: str, lower_bound: str, upper_bound: str,
+                            variable: str = "x") -> Tuple[bool, Union[float, str]]:
+    """Average value of f on [a, b]. Returns (success, average or error)."""
+    return _single_application("average_value", function_str, lower_bound, upper_bound, variable)
@@ -0,0 +1,132 @@
+import numpy as np
+from functools import lru_cache
+from typing import Tuple, Union, Dict, Any
+
+try:
+    from .parametric_integrals import evaluate_parametric_integral
+    from .instrumentation import stage, register_cache
+except ImportError:
+    from utils.parametric_integrals import evaluate_parametric_integral
+    from utils.instrumentation import stage, register_cache
+
+# Resolución máxima del heatmap por eje (100 x 100 sigue siendo una sola evaluación)
+MAX_SWEEP_RESOLUTION = 200
+
+# Paso relativo de las diferencias centrales de la sensibilidad
+SENSITIVITY_STEP = 1e-4
+
+@lru_cache(maxsize=32)
+def _sweep_cached(function_str: str, lower_bound: str, upper_bound: str, variable: str,
+                  x_axis: tuple, y_axis: tuple, fixed: tuple) -> Tuple[bool, Union[Dict[str, Any], str]]:
+    """Grid of integrals for one (x axis, y axis, fixed values) combination (cacheado)."""
+    (x_name, x_start, x_stop, x_count), (y_name, y_start, y_stop, y_count) = x_axis, y_axis
+    x_values = np.linspace(x_start, x_stop, x_count)
+    y_values = np.linspace(y_start, y_stop, y_count)
+
+    # Filas = eje y, columnas = eje x (orientación de go.Heatmap)
+    parameters = dict(fixed)
+    parameters[x_name] = x_values[np.newaxis, :]
+    parameters[y_name] = y_values[:, np.newaxis]
+
+    with stage("parameter_sweep"):
+        success, values, details = evaluate_parametric_integral(
+            function_str, lower_bound, upper_bound, parameters, variable
+        )
+    if not success:
+        return False, values
+
+    values = np.broadcast_to(values, (y_count, x_count)).copy()
+    for array in (x_values, y_values, values):
+        array.setflags(write=False)
+
+    return True, {
+        "x_name": x_name, "x_values": x_values,
+        "y_name": y_name, "y_values": y_values,
+        "values": values,
+        "method_used": details["method_used"],
+        "undefined_cells": details["undefined_cells"]
+    }
+
+register_cache("parameter_sweep", _sweep_cached)
+
+def _axis(axis: Tuple[str, float, float, int]) -> tuple:
+    name, start, stop, resolution = axis
+    resolution = int(resolution)
+    if not 2 <= resolution <= MAX_SWEEP_RESOLUTION:
+        raise ValueError(f"The resolution of {name!r} must be between 2 and {MAX_SWEEP_RESOLUTION}")
+    if not start < stop:
+        raise ValueError(f"The range of {name!r} is empty")
+    return (name, float(start), float(stop), resolution)
+
+def sweep_integral(function_str: str, lower_bound: str, upper_bound: str,
+                   x_axis: Tuple[str, float, float, int], y_axis: Tuple[str, float, float, int],
+                   fixed: Dict[str, float] = None, variable: str = "x") -> Tuple[bool, Union[Dict[str, Any], str]]:
+    """
+    Integral of a parametric function over a 2D grid of two of its parameters.
+
+    The whole grid is one batched evaluation of the compiled parametric
+    antiderivative (evaluate_parametric_integral), and grids are cached by
+    (function, bounds, axes, fixed values), so moving back to a previous
+    slider position costs nothing.
+
+    Args:
+        function_str (str): Expression with named parameters
+        lower_bound (str): Lower integration bound
+        upper_bound (str): Upper integration bound
+        x_axis: (parameter, start, stop, resolution) of the columns
+        y_axis: (parameter, start, stop, resolution) of the rows
+        fixed (Dict[str, float]): Values of the remaining parameters
+        variable (str): Integration variable
+
+    Returns:
+        Tuple[bool, Union[Dict, str]]: (success, grid or error message). The grid has
+        x_name, x_values, y_name, y_values, values (rows = y, columns = x, read-only),
+        method_used and undefined_cells.
+    """
+    try:
+        x_axis, y_axis = _axis(x_axis), _axis(y_axis)
+        if x_axis[0] == y_axis[0]:
+            raise ValueError("The two sweep axes must be different parameters")
+        fixed = tuple(sorted((name, float(value)) for name, value in (fixed or {}).items()
+                             if name not in (x_axis[0], y_axis[0])))
+    except (ValueError, TypeError) as e:
+        return False, str(e)
+
+    return _sweep_cached(function_str, str(lower_bound), str(upper_bound), variable, x_axis, y_axis, fixed)
+
+def integral_sensitivity(function_str: str, lower_bound: str, upper_bound: str,
+                         parameters: Dict[str, float], variable: str = "x") -> Tuple[bool, Union[Dict[str, Any], str]]:
+    """
+    Value of the integral at a parameter point and its sensitivity to each parameter.
+
+    The base point and the central-difference points of every parameter are
+    evaluated in one batched call.
+
+    Returns:
+        Tuple[bool, Union[Dict, str]]: (success, {"value": I, "sensitivity": {name:
+        {"derivative": dI/dp, "elasticity": (dI/dp) * p / I}}} or error message)
+    """
+    names = list(parameters)
+    base = np.array([float(parameters[name]) for name in names])
+    steps = SENSITIVITY_STEP * np.maximum(np.abs(base), 1.0)
+
+    # Columna 0: punto base; columnas 2i+1 / 2i+2: p_i + h / p_i - h
+    points = np.tile(base[:, np.newaxis], (1, 2 * len(names) + 1))
+    for index in range(len(names)):
+        points[index, 2 * index + 1] += steps[index]
+        points[index, 2 * index + 2] -= steps[index]
+
+    success, values, details = evaluate_parametric_integral(
+        function_str, lower_bound, upper_bound, dict(zip(names, points)), variable
+    )
+    if not success:
+        return False, values
+
+    value = float(values[0])
+    sensitivity = {}
+    for index, name in enumerate(names):
+        derivative = float((values[2 * index + 1] - values[2 * index + 2]) / (2 * steps[index]))
+        elasticity = float(derivative * base[index] / value) if value != 0 and np.isfinite(value) else float("nan")
+        sensitivity[name] = {"derivative": derivative, "elasticity": elasticity}
+
+    return True, {"value": value, "sensitivity": sensitivity, "method_used": details["method_used"]}
@@ -0,0 +1,318 @@
+import numpy as np
+import sympy as sp
+from functools import lru_cache
+from typing import Tuple, Union, Dict, Any, Callable, Optional
+
+try:
+    from .expression_parser import safe_sympify
+    from .calculator import get_symbolic_antiderivative
+    from .instrumentation import stage, count, register_cache
+except ImportError:
+    from utils.expression_parser import safe_sympify
+    from utils.calculator import get_symbolic_antiderivative
+    from utils.instrumentation import stage, count, register_cache
+
+# erf, gamma... vectorizadas con scipy.special si está disponible. SymPy 1.11 no traduce
+# Si/Ci/Shi/Chi (NameError al evaluar): se mapean a sici/shichi
+try:
+    import scipy.special
+    LAMBDIFY_MODULES = [{
+        "Si": lambda x: scipy.special.sici(x)[0],
+        "Ci": lambda x: scipy.special.sici(x)[1],
+        "Shi": lambda x: scipy.special.shichi(x)[0],
+        "Chi": lambda x: scipy.special.shichi(x)[1]
+    }, "numpy", "scipy"]
+except ImportError:
+    LAMBDIFY_MODULES = ["numpy"]
+
+# Nodos de Gauss-Legendre para integrandos sin antiderivada cerrada
+PARAMETRIC_QUADRATURE_NODES = 64
+
+# Cambio de signo entre nodos vecinos con |f| > este múltiplo de la mediana: un polo
+# entre ellos (solo si las singularidades no se resolvieron simbólicamente)
+BLOWUP_RATIO = 10.0
+
+# Nombres que el parser ya interpreta (constantes y funciones)
+RESERVED_NAMES = {"pi", "e", "E", "exp", "ln", "log", "sin", "cos", "tan", "sqrt", "abs", "Abs",
+                  "atan", "asin", "acos", "sinh", "cosh", "tanh"}
+
+def _validate_parameter_names(parameters: Tuple[str, ...], variable: str):
+    if len(set(parameters)) != len(parameters):
+        raise ValueError(f"Repeated parameter names: {list(parameters)}")
+    for name in parameters:
+        if not name.isidentifier() or name in RESERVED_NAMES:
+            raise ValueError(f"Invalid parameter name: {name!r}")
+        if name == variable:
+            raise ValueError(f"Parameter {name!r} is the integration variable")
+
+def _compile_vectorized(expr: sp.Expr, symbols: list) -> Callable[..., np.ndarray]:
+    """Lambdify over several (broadcast) arguments, NaN wherever the expression is undefined."""
+    numpy_func = sp.lambdify(symbols, expr, modules=LAMBDIFY_MODULES)
+
+    def evaluate_pointwise(*arguments) -> np.ndarray:
+        values = np.empty(arguments[0].shape, dtype=complex)
+        for index in np.ndindex(values.shape):
+            try:
+                values[index] = complex(numpy_func(*(float(argument[index]) for argument in arguments)))
+            except Exception:
+                values[index] = np.nan
+        return values
+
+    def evaluate(*arguments) -> np.ndarray:
+        arguments = np.broadcast_arrays(*(np.asarray(argument, dtype=float) for argument in arguments))
+        count("evaluations", arguments[0].size)
+        with np.errstate(all="ignore"):
+            try:
+                values = np.broadcast_to(np.asarray(numpy_func(*arguments)), arguments[0].shape)
+            except Exception:
+                # Funciones sin versión vectorizada: punto a punto
+                values = evaluate_pointwise(*arguments)
+
+        if np.iscomplexobj(values):
+            values = np.where(np.abs(values.imag) > 1e-12, np.nan, values.real)
+
+        values = np.array(values, dtype=float)
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+    return evaluate
+
+def _compile_singularities(expr: sp.Expr, var_symbol: sp.Symbol, symbols: list) -> Optional[list]:
+    """
+    Singular points of expr in the variable as vectorized functions of the parameters.
+
+    Each callable takes (x, *params) like the integrand (x only sets the broadcast
+    shape) and gives NaN where the point is not real. None if SymPy cannot give a
+    finite set (e.g. tan(k*x)).
+    """
+    try:
+        points = sp.singularities(expr, var_symbol)
+    except Exception:
+        return None
+    if isinstance(points, sp.Intersection):
+        # p. ej. Intersection({-sqrt(a), sqrt(a)}, Reals): los puntos complejos dan NaN
+        points = next((arg for arg in points.args if isinstance(arg, sp.FiniteSet)), None)
+    if points is sp.S.EmptySet:
+        return []
+    if not isinstance(points, sp.FiniteSet):
+        return None
+    return [_compile_vectorized(point, [var_symbol] + symbols) for point in points]
+
+@lru_cache(maxsize=128)
+def compile_parametric_integral(function_str: str, parameters: Tuple[str, ...], variable: str = "x") -> Dict[str, Any]:
+    """
+    Parse an expression with named parameters and compile it once.
+
+    The antiderivative is computed symbolically with the parameters as free
+    real symbols (get_symbolic_antiderivative), so cases such as k = 0 in
+    exp(-k*t) come out as Piecewise branches and stay correct.
+
+    Args:
+        function_str (str): Expression, e.g. "A*exp(-k*t)"
+        parameters (Tuple[str, ...]): Parameter names, in the order the callables take them
+        variable (str): Integration variable
+
+    Returns:
+        Dict[str, Any]: "expression" and "antiderivative" (SymPy, None without closed
+        form), "integrand" f(x, *params), "definite" (lower, upper, *params) -> F(upper) - F(lower)
+        (None without closed form) and "singularities" (see _compile_singularities), all
+        vectorized with NumPy broadcasting
+
+    Raises:
+        ValueError: If the expression or the parameter names are invalid
+    """
+    parameters = tuple(parameters)
+    _validate_parameter_names(parameters, variable)
+
+    success, expr = safe_sympify(function_str, variable)
+    if not success:
+        raise ValueError(expr)
+
+    # El parser crea símbolos sin supuestos para nombres desconocidos: se reemplazan por reales
+    var_symbol = sp.Symbol(variable, real=True)
+    symbols = [sp.Symbol(name, real=True) for name in parameters]
+    by_name = dict(zip(parameters, symbols))
+    expr = expr.subs({symbol: by_name[symbol.name] for symbol in expr.free_symbols if symbol.name in by_name})
+
+    unknown = sorted(symbol.name for symbol in expr.free_symbols if symbol != var_symbol and symbol not in symbols)
+    if unknown:
+        raise ValueError(f"Undeclared parameters in the expression: {unknown}")
+
+    with stage("parametric_compilation"):
+        antiderivative = get_symbolic_antiderivative(expr, variable)
+        integrand = _compile_vectorized(expr, [var_symbol] + symbols)
+        singularities = _compile_singularities(expr, var_symbol, symbols)
+
+        definite = None
+        if antiderivative is not None:
+            lower, upper = sp.Dummy("lower", real=True), sp.Dummy("upper", real=True)
+            difference = antiderivative.subs(var_symbol, upper) - antiderivative.subs(var_symbol, lower)
+            definite = _compile_vectorized(difference, [lower, upper] + symbols)
+
+    return {
+        "expression": expr,
+        "antiderivative": antiderivative,
+        "parameters": parameters,
+        "integrand": integrand,
+        "definite": definite,
+        "singularities": singularities
+    }
+
+register_cache("compile_parametric_integral", compile_parametric_integral)
+
+def _bound_values(bound) -> np.ndarray:
+    if isinstance(bound, str):
+        success, value = safe_sympify(bound)
+        if not success or value.free_symbols:
+            raise ValueError(f"Invalid bound: {bound!r}")
+        return np.asarray(float(value))
+    return np.asarray(bound, dtype=float)
+
+def _parameter_arrays(compiled: Dict[str, Any], parameters: Dict[str, Any]) -> list:
+    missing = [name for name in compiled["parameters"] if name not in parameters]
+    if missing:
+        raise ValueError(f"Missing parameter values: {missing}")
+    return [np.asarray(parameters[name], dtype=float) for name in compiled["parameters"]]
+
+def _gauss_legendre_integral(integrand: Callable, lower: np.ndarray, upper: np.ndarray,
+                             parameter_values: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fixed Gauss-Legendre rule on [lower, upper], broadcast over every cell of the grid.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (integral per cell, integrand values at the nodes,
+        nodes along the first axis)
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(PARAMETRIC_QUADRATURE_NODES)
+    shape = np.broadcast_shapes(lower.shape, upper.shape, *(value.shape for value in parameter_values))
+    expand = (slice(None),) + (np.newaxis,) * len(shape)
+
+    half_width, center = (upper - lower) / 2, (upper + lower) / 2
+    points = center + half_width * nodes[expand]
+    values = integrand(points, *parameter_values)
+    return half_width * np.sum(weights[expand] * values, axis=0), values
+
+def _singular_cells(compiled: Dict[str, Any], lower: np.ndarray, upper: np.ndarray, parameter_values: list,
+                    node_values: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cells where f is not finite somewhere on the closed interval [lower, upper].
+
+    Neither the quadrature (interior nodes) nor F(b) - F(a) sees a pole between the
+    bounds, so both need this mask. A closed-form cell only diverges if F is not
+    finite at one of those points; otherwise the improper integral converges to
+    F(b) - F(a) (e.g. 1/sqrt(x) on [0, 1]).
+
+    Args:
+        node_values: Gauss-Legendre node values, required when the singularities
+            could not be resolved symbolically (sign change with blow-up between nodes)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (singular cells, cells where the closed form diverges)
+    """
+    integrand, definite = compiled["integrand"], compiled["definite"]
+    singular = ~np.isfinite(integrand(lower, *parameter_values)) | ~np.isfinite(integrand(upper, *parameter_values))
+
+    if compiled["singularities"] is None:
+        with np.errstate(invalid="ignore"):
+            magnitude = np.abs(node_values)
+            large = magnitude > BLOWUP_RATIO * np.median(magnitude, axis=0)
+            sign_change = np.signbit(node_values[1:]) != np.signbit(node_values[:-1])
+            blowup = np.any(sign_change & large[1:] & large[:-1], axis=0)
+        return singular | blowup, blowup
+
+    divergent = np.zeros_like(singular)
+    left, right = np.minimum(lower, upper), np.maximum(lower, upper)
+    for point in compiled["singularities"]:
+        location = point(lower, *parameter_values)
+        inside = (left <= location) & (location <= right)
+        singular = singular | inside
+        if definite is not None:
+            divergent = divergent | (inside & ~np.isfinite(definite(lower, location, *parameter_values)))
+    return singular, divergent
+
+def evaluate_parametric_integral(function_str: str, lower_bound, upper_bound, parameters: Dict[str, Any],
+                                 variable: str = "x") -> Tuple[bool, Union[np.ndarray, str], Dict[str, Any]]:
+    """
+    Evaluate ∫[a, b] f(x; p) for whole grids of parameter values at once.
+
+    Parameter values (and the bounds) may be scalars or arrays and are
+    broadcast together with NumPy rules, so a sweep over k and A can pass
+    k[:, None] and A[None, :] (or the arrays of parameter_grid). The
+    expression is parsed, integrated and compiled only once per
+    (expression, parameter names); cells where the closed form is
+    undefined, or expressions without one, use a vectorized Gauss-Legendre rule.
+    Cells where f has a singularity in [a, b] stay NaN, unless the closed form
+    is finite through it (convergent improper integral).
+
+    Args:
+        function_str (str): Expression with named parameters, e.g. "A*exp(-k*t)"
+        lower_bound: Lower bound(s) (number, array or constant expression string)
+        upper_bound: Upper bound(s)
+        parameters (Dict[str, Any]): Parameter name -> value or array of values
+        variable (str): Integration variable
+
+    Returns:
+        Tuple[bool, Union[np.ndarray, str], Dict[str, Any]]: (success, integral values with the
+        broadcast shape (NaN where undefined) or error message, details)
+    """
+    try:
+        compiled = compile_parametric_integral(function_str, tuple(parameters), variable)
+        lower, upper = _bound_values(lower_bound), _bound_values(upper_bound)
+        parameter_values = _parameter_arrays(compiled, parameters)
+        shape = np.broadcast_shapes(lower.shape, upper.shape, *(value.shape for value in parameter_values))
+    except ValueError as e:
+        return False, str(e), {}
+    except Exception as e:
+        return False, f"Parametric integral failed: {str(e)}", {}
+
+    details = {
+        "parameters": list(compiled["parameters"]),
+        "antiderivative": str(compiled["antiderivative"]) if compiled["antiderivative"] is not None else None,
+        "shape": shape
+    }
+
+    with stage("parametric_evaluation"):
+        if compiled["definite"] is not None:
+            values = np.broadcast_to(compiled["definite"](lower, upper, *parameter_values), shape).copy()
+        else:
+            values = np.full(shape, np.nan)
+
+        closed_form = np.isfinite(values)
+        quadrature = node_values = None
+        if not np.all(closed_form) or compiled["singularities"] is None:
+            quadrature, node_values = _gauss_legendre_integral(compiled["integrand"], lower, upper, parameter_values)
+
+        # Una sola máscara para ambos caminos: los polos entre a y b dejan la celda en NaN
+        singular, divergent = _singular_cells(compiled, lower, upper, parameter_values, node_values)
+        closed_form = closed_form & ~divergent
+        fallback = np.nan if quadrature is None else np.where(singular, np.nan, quadrature)
+        values = np.where(closed_form, values, fallback)
+
+    quadrature_cells = np.isfinite(values) & ~closed_form
+    details["method_used"] = "Parametric Symbolic" if compiled["definite"] is not None and not np.any(quadrature_cells) else (
+        "Gauss-Legendre" if not np.any(closed_form) else "Parametric Symbolic + Gauss-Legendre")
+    details["symbolic_cells"] = int(np.count_nonzero(closed_form))
+    details["undefined_cells"] = int(np.count_nonzero(~np.isfinite(values)))
+    return True, values, details
+
+def evaluate_parametric_integrand(function_str: str, points, parameters: Dict[str, Any],
+                                  variable: str = "x") -> np.ndarray:
+    """
+    Evaluate f(x; p) with broadcasting over points and parameter values.
+
+    Raises:
+        ValueError: If the expression, parameter names or values are invalid
+    """
+    compiled = compile_parametric_integral(function_str, tuple(parameters), variable)
+    return compiled["integrand"](points, *_parameter_arrays(compiled, parameters))
+
+def parameter_grid(**axes) -> Dict[str, np.ndarray]:
+    """
+    Full grid of parameter combinations: one broadcastable array per parameter.
+
+        parameter_grid(A=np.linspace(10, 100, 10), k=np.linspace(0.1, 1, 20))
+        # {"A": shape (10, 1), "k": shape (1, 20)}
+    """
+    grids = np.meshgrid(*(np.asarray(values, dtype=float) for values in axes.values()),
+                        indexing="ij", sparse=True)
+    return dict(zip(axes, grids))
@@ -1,6 +1,7 @@
 import streamlit as st
 import numpy as np
 import sympy as sp
+from functools import lru_cache
 # ✅ IMPORT OPCIONAL DE PLOTLY
 try:
     import plotly.graph_objects as go
@@ -11,12 +12,14 @@ except ImportError:
     st.error("📦 Plotly no disponible - las visualizaciones no funcionarán")
 # ✅ IMPORTS LOCALES
 try:
-    from utils.expression_parser import safe_sympify, evaluate_expression_at_point
+    from utils.expression_parser import safe_sympify, evaluate_expression_at_point, evaluate_expression_on_grid
     from utils.validation import validate_integration_inputs
+    from utils.instrumentation import stage, register_cache
 except ImportError:
     try:
-        from .expression_parser import safe_sympify, evaluate_expression_at_point
+        from .expression_parser import safe_sympify, evaluate_expression_at_point, evaluate_expression_on_grid
         from .validation import validate_integration_inputs
+        from .instrumentation import stage, register_cache
     except ImportError:
         st.error("Error importando módulos locales")
 def safe_convert_numpy_to_python(value):
@@ -59,30 +62,31 @@ def plot_integral(function_str: str, lower_bound: str, upper_bound: str, variabl
         x_min = lower_val - extension
         x_max = upper_val + extension
         
-        # Generate x values con conversión segura
-        x_vals_numpy = np.linspace(x_min, x_max, num_points)
-        x_vals = [safe_convert_numpy_to_python(x) for x in x_vals_numpy]
-        y_vals = []
-        
-        # Evaluate function at each point
-        for x in x_vals:
-            success, y = evaluate_expression_at_point(expr, variable, x)
-            if success and not (np.isnan(y) or np.isinf(y)):
-                y_vals.append(y)
-            else:
-                y_vals.append(None)  # Use None instead of np.nan for Plotly
-        
-        # Generate area data
-        x_area_numpy = np.linspace(lower_val, upper_val, 200)
-        x_area = [safe_convert_numpy_to_python(x) for x in x_area_numpy]
-        y_area = []
-        
-        for x in x_area:
-            success, y = evaluate_expression_at_point(expr, variable, x)
-            if success and not (np.isnan(y) or np.isinf(y)):
-                y_area.append(y)
-            else:
-                y_area.append(0)
+        with stage("plot_samples"):
+            # Generate x values con conversión segura
+            x_vals_numpy = np.linspace(x_min, x_max, num_points)
+            x_vals = [safe_convert_numpy_to_python(x) for x in x_vals_numpy]
+            y_vals = []
+        
+            # Evaluate function at each point
+            for x in x_vals:
+                success, y = evaluate_expression_at_point(expr, variable, x)
+                if success and not (np.isnan(y) or np.isinf(y)):
+                    y_vals.append(y)
+                else:
+                    y_vals.append(None)  # Use None instead of np.nan for Plotly
+        
+            # Generate area data
+            x_area_numpy = np.linspace(lower_val, upper_val, 200)
+            x_area = [safe_convert_numpy_to_python(x) for x in x_area_numpy]
+            y_area = []
+        
+            for x in x_area:
+                success, y = evaluate_expression_at_point(expr, variable, x)
+                if success and not (np.isnan(y) or np.isinf(y)):
+                    y_area.append(y)
+                else:
+                    y_area.append(0)
         
         # Create the plot
         fig = go.Figure()
@@ -126,7 +130,8 @@ def plot_integral(function_str: str, lower_bound: str, upper_bound: str, variabl
             height=500
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"Error creating plot: {str(e)}")
@@ -142,8 +147,13 @@ Error: {str(e)}
             """)
 
 def plot_riemann_sum(function_str: str, lower_bound: float, upper_bound: float, 
-                    n: int, method: str = "left", variable: str = "x"):
-    """Plot Riemann sum rectangles with the function."""
+                    n: int, method: str = "left", variable: str = "x", sample_values: list = None):
+    """
+    Plot Riemann sum rectangles with the function.
+    
+    If sample_values (f at the n sample points) is given, rectangles reuse them
+    instead of evaluating the function again.
+    """
     try:
         # Parse function
         success, expr = safe_sympify(function_str, variable)
@@ -160,17 +170,10 @@ def plot_riemann_sum(function_str: str, lower_bound: float, upper_bound: float,
         x_min = lower_bound - extension
         x_max = upper_bound + extension
         
-        # Generate smooth function plot con conversión segura
-        x_smooth_numpy = np.linspace(x_min, x_max, 1000)
-        x_smooth = [safe_convert_numpy_to_python(x) for x in x_smooth_numpy]
-        y_smooth = []
-        
-        for x in x_smooth:
-            success, y = evaluate_expression_at_point(expr, variable, x)
-            if success and not (np.isnan(y) or np.isinf(y)):
-                y_smooth.append(y)
-            else:
-                y_smooth.append(None)
+        with stage("plot_samples"):
+            # Generate smooth function plot (evaluación vectorizada)
+            x_smooth = np.linspace(x_min, x_max, 1000)
+            y_smooth = evaluate_expression_on_grid(expr, variable, x_smooth)
         
         # Create the plot
         fig = go.Figure()
@@ -178,54 +181,52 @@ def plot_riemann_sum(function_str: str, lower_bound: float, upper_bound: float,
         # Plot the smooth function
         fig.add_trace(go.Scatter(
             x=x_smooth,
-            y=y_smooth,
+            y=[None if np.isnan(y) else y for y in y_smooth],
             mode='lines',
             name=f'f({variable}) = {function_str}',
             line=dict(color='blue', width=3),
             connectgaps=False
         ))
         
-        # Calculate and plot rectangles
-        riemann_sum = 0
-        for i in range(n):
-            x_left = lower_bound + i * delta_x
-            x_right = lower_bound + (i + 1) * delta_x
-            
-            # Determine sample point
-            if method == "left":
-                sample_point = x_left
-            elif method == "right":
-                sample_point = x_right
-            else:  # midpoint
-                sample_point = (x_left + x_right) / 2
-            
-            # Convertir sample_point a tipo Python nativo
-            sample_point = safe_convert_numpy_to_python(sample_point)
-            
-            # Evaluate function
-            success, function_value = evaluate_expression_at_point(expr, variable, sample_point)
-            if success and not (np.isnan(function_value) or np.isinf(function_value)):
-                riemann_sum += function_value * delta_x
-                
-                # Draw rectangle
-                fig.add_shape(
-                    type="rect",
-                    x0=x_left, y0=0,
-                    x1=x_right, y1=function_value,
-                    line=dict(color="red", width=1),
-                    fillcolor="rgba(255, 0, 0, 0.3)",
-                )
-                
-                # Add sample point (only show legend for first one)
-                fig.add_trace(go.Scatter(
-                    x=[sample_point],
-                    y=[function_value],
-                    mode='markers',
-                    name='Sample points' if i == 0 else '',
-                    marker=dict(color='red', size=6),
-                    showlegend=(i == 0),
-                    hovertemplate=f'{variable} = {sample_point:.4f}<br>f({variable}) = {function_value:.4f}<extra></extra>'
-                ))
+        # Sample points and function values for all rectangles at once
+        indices = np.arange(n)
+        x_left = lower_bound + indices * delta_x
+        if method == "left":
+            sample_points = x_left
+        elif method == "right":
+            sample_points = x_left + delta_x
+        else:  # midpoint
+            sample_points = x_left + delta_x / 2
+        
+        with stage("plot_samples"):
+            if sample_values is not None:
+                function_values = np.asarray(sample_values, dtype=float)
+            else:
+                function_values = evaluate_expression_on_grid(expr, variable, sample_points)
+        
+        valid = np.isfinite(function_values)
+        riemann_sum = float(function_values[valid].sum() * delta_x)
+        
+        # Rectangles as a single bar trace (one trace instead of n shapes)
+        fig.add_trace(go.Bar(
+            x=x_left[valid],
+            y=function_values[valid],
+            width=delta_x,
+            offset=0,
+            marker=dict(color="rgba(255, 0, 0, 0.3)", line=dict(color="red", width=1)),
+            name='Rectangles',
+            hoverinfo='skip'
+        ))
+        
+        # Sample points in one trace
+        fig.add_trace(go.Scatter(
+            x=sample_points[valid],
+            y=function_values[valid],
+            mode='markers',
+            name='Sample points',
+            marker=dict(color='red', size=6),
+            hovertemplate=f'{variable} = %{{x:.4f}}<br>f({variable}) = %{{y:.4f}}<extra></extra>'
+        ))
         
         # Add vertical lines at bounds
         fig.add_vline(x=lower_bound, line_dash="dash", line_color="green")
@@ -239,10 +240,12 @@ def plot_riemann_sum(function_str: str, lower_bound: float, upper_bound: float,
             showlegend=True,
             hovermode='x unified',
             template='plotly_white',
-            height=500
+            height=500,
+            bargap=0
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"Error creating Riemann sum plot: {str(e)}")
@@ -278,32 +281,33 @@ def plot_area_between_curves(func1_str: str, func2_str: str, lower_bound: str,
         x_min = lower_val - extension
         x_max = upper_val + extension
         
-        # Generate x values con conversión segura
-        x_vals_numpy = np.linspace(x_min, x_max, num_points)
-        x_vals = [safe_convert_numpy_to_python(x) for x in x_vals_numpy]
-        y1_vals = []
-        y2_vals = []
-        
-        # Evaluate both functions
-        for x in x_vals:
-            success1, y1 = evaluate_expression_at_point(expr1, variable, x)
-            success2, y2 = evaluate_expression_at_point(expr2, variable, x)
+        with stage("plot_samples"):
+            # Generate x values con conversión segura
+            x_vals_numpy = np.linspace(x_min, x_max, num_points)
+            x_vals = [safe_convert_numpy_to_python(x) for x in x_vals_numpy]
+            y1_vals = []
+            y2_vals = []
+        
+            # Evaluate both functions
+            for x in x_vals:
+                success1, y1 = evaluate_expression_at_point(expr1, variable, x)
+                success2, y2 = evaluate_expression_at_point(expr2, variable, x)
             
-            y1_vals.append(y1 if success1 and not (np.isnan(y1) or np.isinf(y1)) else None)
-            y2_vals.append(y2 if success2 and not (np.isnan(y2) or np.isinf(y2)) else None)
-        
-        # Generate values for shaded area (between bounds only)
-        x_area_numpy = np.linspace(lower_val, upper_val, 200)
-        x_area = [safe_convert_numpy_to_python(x) for x in x_area_numpy]
-        y1_area = []
-        y2_area = []
-        
-        for x in x_area:
-            success1, y1 = evaluate_expression_at_point(expr1, variable, x)
-            success2, y2 = evaluate_expression_at_point(expr2, variable, x)
+                y1_vals.append(y1 if success1 and not (np.isnan(y1) or np.isinf(y1)) else None)
+                y2_vals.append(y2 if success2 and not (np.isnan(y2) or np.isinf(y2)) else None)
+        
+            # Generate values for shaded area (between bounds only)
+            x_area_numpy = np.linspace(lower_val, upper_val, 200)
+            x_area = [safe_convert_numpy_to_python(x) for x in x_area_numpy]
+            y1_area = []
+            y2_area = []
+        
+            for x in x_area:
+                success1, y1 = evaluate_expression_at_point(expr1, variable, x)
+                success2, y2 = evaluate_expression_at_point(expr2, variable, x)
             
-            y1_area.append(y1 if success1 and not (np.isnan(y1) or np.isinf(y1)) else 0)
-            y2_area.append(y2 if success2 and not (np.isnan(y2) or np.isinf(y2)) else 0)
+                y1_area.append(y1 if success1 and not (np.isnan(y1) or np.isinf(y1)) else 0)
+                y2_area.append(y2 if success2 and not (np.isnan(y2) or np.isinf(y2)) else 0)
         
         # Create the plot
         fig = go.Figure()
@@ -367,7 +371,8 @@ def plot_area_between_curves(func1_str: str, func2_str: str, lower_bound: str,
             height=500
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"Error creating area plot: {str(e)}")
@@ -399,17 +404,18 @@ def create_comparison_plot(function_str: str, lower_bound: str, upper_bound: str
             horizontal_spacing=0.1
         )
         
-        # Generate x values
-        x_vals_numpy = np.linspace(lower_val, upper_val, 200)
-        x_vals = [safe_convert_numpy_to_python(x) for x in x_vals_numpy]
-        y_vals = []
+        with stage("plot_samples"):
+            # Generate x values
+            x_vals_numpy = np.linspace(lower_val, upper_val, 200)
+            x_vals = [safe_convert_numpy_to_python(x) for x in x_vals_numpy]
+            y_vals = []
         
-        for x in x_vals:
-            success, y = evaluate_expression_at_point(expr, variable, x)
-            if success and not (np.isnan(y) or np.isinf(y)):
-                y_vals.append(y)
-            else:
-                y_vals.append(0)
+            for x in x_vals:
+                success, y = evaluate_expression_at_point(expr, variable, x)
+                if success and not (np.isnan(y) or np.isinf(y)):
+                    y_vals.append(y)
+                else:
+                    y_vals.append(0)
         
         # Plot original function in all subplots
         for row in range(1, 3):
@@ -471,47 +477,108 @@ def create_comparison_plot(function_str: str, lower_bound: str, upper_bound: str
             showlegend=True
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
         
     except Exception as e:
         st.error(f"Error creating comparison plot: {str(e)}")
 
-def plot_volume_3d(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x"):
+# Presupuesto de vértices por nivel de detalle de la superficie 3D
+MESH_DETAIL_LEVELS = {"low": 2000, "medium": 6000, "high": 20000}
+MESH_VERTEX_BUDGET = MESH_DETAIL_LEVELS["medium"]
+
+# Muestras uniformes usadas para decidir dónde colocar los anillos del eje
+MESH_PROBE_POINTS = 4097
+
+@lru_cache(maxsize=32)
+def build_revolution_mesh(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x",
+                          vertex_budget: int = MESH_VERTEX_BUDGET):
+    """
+    Build the surface of revolution of |f| around the variable axis within a vertex budget.
+    
+    The profile is probed once on a dense uniform grid with the compiled
+    evaluator; axial rings are then placed by equidistributing the arc length
+    of the normalized profile blended with uniform spacing (more rings where
+    f changes fast), and the
+    budget is split between rings and theta according to the solid's aspect
+    ratio. The mesh is built with broadcasting and cached per input tuple, so
+    re-opening the 3D view does not recompute it.
+    
+    Returns:
+        dict: Read-only float32 arrays t, radius, x, y, z (z/x/y with shape
+        (n_theta, n_axis)); NaN where f is undefined. Or {"error": message}
+    """
+    valid, error, expr, lower_val, upper_val = validate_integration_inputs(
+        function_str, lower_bound, upper_bound, variable
+    )
+    if not valid:
+        return {"error": error}
+    
+    with stage("plot_samples"):
+        probe = np.linspace(lower_val, upper_val, MESH_PROBE_POINTS)
+        probe_radius = np.abs(evaluate_expression_on_grid(expr, variable, probe))
+        finite = np.isfinite(probe_radius)
+        if not finite.any():
+            return {"error": "The function is undefined on the whole interval"}
+        
+        axis_length = upper_val - lower_val
+        radius_scale = max(float(np.max(probe_radius[finite])), 1e-12)
+        
+        # Longitud de arco del perfil normalizado (t/L, r/R); los huecos cuentan como tramo recto
+        normalized_radius = np.where(finite, probe_radius, 0.0) / radius_scale
+        segment_lengths = np.hypot(np.diff(probe) / axis_length, np.diff(normalized_radius))
+        arc_length = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+        
+        # Reparto del presupuesto: anillos del eje vs. resolución angular
+        aspect = (2 * np.pi * radius_scale) / max(axis_length, 1e-12)
+        n_theta = int(np.clip(np.sqrt(vertex_budget * min(max(aspect, 0.25), 4.0) / arc_length[-1]), 16, 96))
+        n_axis = int(np.clip(vertex_budget // n_theta, 16, MESH_PROBE_POINTS))
+        
+        # Mitad por longitud de arco, mitad uniforme: los picos no dejan sin anillos al resto del eje
+        placement = 0.5 * arc_length / arc_length[-1] + 0.5 * (probe - lower_val) / axis_length
+        targets = np.linspace(0.0, 1.0, n_axis)
+        indices = np.unique(np.searchsorted(placement, targets).clip(0, MESH_PROBE_POINTS - 1))
+        t_vals = probe[indices]
+        radius = probe_radius[indices]
+        
+        theta = np.linspace(0, 2 * np.pi, n_theta)
+        x_vals = radius[np.newaxis, :] * np.cos(theta)[:, np.newaxis]
+        y_vals = radius[np.newaxis, :] * np.sin(theta)[:, np.newaxis]
+        z_vals = np.broadcast_to(t_vals, x_vals.shape)
+    
+    mesh = {
+        "t": t_vals,
+        "radius": radius,
+        "x": x_vals,
+        "y": y_vals,
+        "z": z_vals
+    }
+    for name, values in mesh.items():
+        # float32 reduce a la mitad el tamaño de la figura; los arreglos cacheados son de solo lectura
+        values = np.ascontiguousarray(values, dtype=np.float32)
+        values.setflags(write=False)
+        mesh[name] = values
+    return mesh
+
+register_cache("build_revolution_mesh", build_revolution_mesh)
+
+def plot_volume_3d(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x",
+                   vertex_budget: int = MESH_VERTEX_BUDGET):
     """Visualizar sólido de revolución en 3D."""
     try:
-        # Validar inputs
-        valid, error, expr, lower_val, upper_val = validate_integration_inputs(
-            function_str, lower_bound, upper_bound, variable
-        )
-        if not valid:
-            st.error(f"Error en visualización 3D: {error}")
+        mesh = build_revolution_mesh(function_str, str(lower_bound), str(upper_bound), variable, int(vertex_budget))
+        if "error" in mesh:
+            st.error(f"Error en visualización 3D: {mesh['error']}")
             return
         
-        # Generar datos para revolución
-        t_vals = np.linspace(lower_val, upper_val, 100)
-        r_vals = []
-        
-        for t in t_vals:
-            success, r = evaluate_expression_at_point(expr, variable, t)
-            if success and not (np.isnan(r) or np.isinf(r)) and r >= 0:
-                r_vals.append(abs(r))  # Radio debe ser positivo
-            else:
-                r_vals.append(0.1)  # Valor mínimo para evitar errores
-        
-        # Crear superficie de revolución
-        theta = np.linspace(0, 2*np.pi, 50)
-        T, THETA = np.meshgrid(t_vals, theta)
-        R = np.array([r_vals] * len(theta))
-        
-        # Coordenadas cartesianas
-        X = R * np.cos(THETA)
-        Y = R * np.sin(THETA) 
-        Z = T
+        t_vals = mesh["t"]
+        r_vals = mesh["radius"]
+        lower_val, upper_val = float(t_vals[0]), float(t_vals[-1])
         
         # Crear figura 3D
         fig = go.Figure(data=[
             go.Surface(
-                x=X, y=Y, z=Z,
+                x=mesh["x"], y=mesh["y"], z=mesh["z"],
                 colorscale='Viridis',
                 opacity=0.8,
                 name='Sólido de Revolución'
@@ -520,7 +587,7 @@ def plot_volume_3d(function_str: str, lower_bound: str, upper_bound: str, variab
         
         # Agregar curva original
         fig.add_trace(go.Scatter3d(
-            x=r_vals, y=[0]*len(r_vals), z=t_vals,
+            x=r_vals, y=np.zeros_like(r_vals), z=t_vals,
             mode='lines',
             line=dict(color='red', width=8),
             name=f'f({variable}) = {function_str}'
@@ -539,14 +606,16 @@ def plot_volume_3d(function_str: str, lower_bound: str, upper_bound: str, variab
             height=600
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
         
         # Información adicional
         st.info(f"""
         **🎯 Interpretación 3D:**
         - **Eje de revolución:** {variable} (vertical)
-        - **Radio:** f({variable}) = {function_str}
-        - **Intervalo:** [{lower_val}, {upper_val}]
+        - **Radio:** |f({variable})| con f({variable}) = {function_str}
+        - **Intervalo:** [{lower_val:g}, {upper_val:g}]
+        - **Malla:** {mesh["x"].shape[1]} anillos × {mesh["x"].shape[0]} ángulos
         - **Vista:** Sólido generado al rotar la curva alrededor del eje {variable}
         """)
         
@@ -555,7 +624,8 @@ def plot_volume_3d(function_str: str, lower_bound: str, upper_bound: str, variab
         # Fallback a visualización 2D
         plot_integral(function_str, lower_bound, upper_bound, variable)
 
-def plot_3d_comparison(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x"):
+def plot_3d_comparison(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x",
+                       vertex_budget: int = MESH_VERTEX_BUDGET):
     """Comparar función 2D vs sólido 3D."""
     col1, col2 = st.columns(2)
     
@@ -565,7 +635,7 @@ def plot_3d_comparison(function_str: str, lower_bound: str, upper_bound: str, va
     
     with col2:
         st.markdown("#### 🔄 Sólido de Revolución (3D)")
-        plot_volume_3d(function_str, lower_bound, upper_bound, variable)
+        plot_volume_3d(function_str, lower_bound, upper_bound, variable, vertex_budget)
 
 def plot_interactive_slider(function_str: str, variable: str = "x"):
     """
@@ -592,11 +662,14 @@ def plot_interactive_slider(function_str: str, variable: str = "x"):
         # Plot with current bounds
         plot_integral(function_str, str(lower_val), str(upper_val), variable)
         
-        # Calculate and display integral
-        from utils.calculator import calculate_definite_integral_robust
-        success, result, details = calculate_definite_integral_robust(
-            function_str, str(lower_val), str(upper_val), variable
-        )
+        # Calculate and display integral: la antiderivada compilada se reutiliza en cada movimiento
+        from utils.calculator import antiderivative_difference, calculate_definite_integral_robust
+        result = antiderivative_difference(expr, variable, lower_val, upper_val)
+        success = result is not None
+        if not success:
+            success, result, details = calculate_definite_integral_robust(
+                function_str, str(lower_val), str(upper_val), variable
+            )
         
         if success:
             st.metric("Integral Value", f"{result:.6f}")
@@ -606,9 +679,181 @@ def plot_interactive_slider(function_str: str, variable: str = "x"):
     except Exception as e:
         st.error(f"Error creating interactive plot: {str(e)}")
 
-def export_plot_data(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x"):
+def plot_cumulative_integral(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x",
+                             num_points: int = 1001):
+    """
+    Plot a function together with its running integral F(t) = ∫[a, t] f.
+    
+    Returns:
+        dict or None: Details of the cumulative computation (method, total...), or None on error
+    """
+    try:
+        from utils.calculator import calculate_cumulative_integral
+        
+        with stage("plot_samples"):
+            success, data, details = calculate_cumulative_integral(
+                function_str, lower_bound, upper_bound, variable, num_points
+            )
+            if not success:
+                st.error(f"Plotting error: {data}")
+                return None
+            
+            # f en la misma malla (ya compilada, sale de la caché)
+            x_vals = data["points"]
+            valid, error, expr, lower_val, upper_val = validate_integration_inputs(
+                function_str, lower_bound, upper_bound, variable
+            )
+            y_vals = evaluate_expression_on_grid(expr, variable, x_vals)
+        
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        
+        fig.add_trace(go.Scatter(
+            x=x_vals,
+            y=np.where(np.isfinite(y_vals), y_vals, None),
+            mode='lines',
+            name=f'f({variable}) = {function_str}',
+            line=dict(color='blue', width=2),
+            connectgaps=False
+        ), secondary_y=False)
+        
+        fig.add_trace(go.Scatter(
+            x=x_vals,
+            y=data["values"],
+            mode='lines',
+            name=f'F({variable}) = ∫[{lower_val:g}, {variable}] f',
+            line=dict(color='green', width=3)
+        ), secondary_y=True)
+        
+        fig.update_layout(
+            title=f'Running Integral: total = {details["total"]:.6g} ({details["method_used"]})',
+            xaxis_title=variable,
+            showlegend=True,
+            hovermode='x unified',
+            template='plotly_white',
+            height=500
+        )
+        fig.update_yaxes(title_text=f'f({variable})', secondary_y=False)
+        fig.update_yaxes(title_text=f'F({variable})', secondary_y=True)
+        
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
+        
+        return details
+        
+    except Exception as e:
+        st.error(f"Error creating cumulative plot: {str(e)}")
+        return None
+
+def plot_parameter_heatmap(grid: dict, title: str, current_point: tuple = None, units: str = ""):
+    """
+    Heatmap of a parameter sweep (see utils.parameter_sweep.sweep_integral).
+
+    Args:
+        grid (dict): Sweep grid with x_name, x_values, y_name, y_values and values
+        title (str): Chart title
+        current_point (tuple): (x, y) of the current slider values, marked on the map
+        units (str): Units of the integral, for the color bar
+    """
+    try:
+        with stage("plot_samples"):
+            # float32: la mitad de datos hacia el navegador, de sobra para un mapa de color
+            z_vals = np.asarray(grid["values"], dtype=np.float32)
+
+        fig = go.Figure(go.Heatmap(
+            x=grid["x_values"],
+            y=grid["y_values"],
+            z=z_vals,
+            colorscale='Viridis',
+            colorbar=dict(title=units),
+            hovertemplate=f'{grid["x_name"]} = %{{x:.4g}}<br>{grid["y_name"]} = %{{y:.4g}}<br>∫ = %{{z:,.4g}}<extra></extra>'
+        ))
+
+        if current_point is not None:
+            fig.add_trace(go.Scatter(
+                x=[current_point[0]], y=[current_point[1]],
+                mode='markers',
+                marker=dict(color='red', size=12, symbol='x'),
+                name='Actual',
+                showlegend=False
+            ))
+
+        fig.update_layout(
+            title=title,
+            xaxis_title=grid["x_name"],
+            yaxis_title=grid["y_name"],
+            template='plotly_white',
+            height=500
+        )
+
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    except Exception as e:
+        st.error(f"Error creating heatmap: {str(e)}")
+
+def plot_time_series_integral(times: np.ndarray, values: np.ndarray, cumulative: np.ndarray,
+                              model: dict = None, windows: tuple = None, time_label: str = "t"):
+    """
+    Plot measured samples and their running integral, with an optional fitted model overlay.
+
+    Long series are decimated to PLOT_MAX_POINTS per trace and drawn with
+    WebGL, so millions of samples stay responsive in the browser.
+
+    Args:
+        times, values, cumulative (np.ndarray): Samples and their running integral
+        model (dict): {"values", "cumulative", "label"} of the fitted model at the sample times
+        windows (tuple): (positions, window integrals, width): bars of the given width
+            starting at the positions, or a line when width is None (rolling windows)
+        time_label (str): Axis label of the times
+    """
+    try:
+        from utils.time_series import decimation_indices
+
+        with stage("plot_samples"):
+            index = decimation_indices(len(times))
+            x_vals = times[index]
+
+        rows = 3 if windows is not None else 2
+        fig = make_subplots(rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.06,
+                            subplot_titles=["Muestras", "Integral acumulada", "Integral por ventana"][:rows])
+
+        fig.add_trace(go.Scattergl(x=x_vals, y=values[index], mode='lines', name='Medido',
+                                   line=dict(color='blue', width=1)), row=1, col=1)
+        fig.add_trace(go.Scattergl(x=x_vals, y=cumulative[index], mode='lines', name='∫ medido',
+                                   line=dict(color='green', width=3)), row=2, col=1)
+
+        if model is not None:
+            label = model.get("label", "Modelo")
+            fig.add_trace(go.Scattergl(x=x_vals, y=model["values"][index], mode='lines', name=label,
+                                       line=dict(color='red', width=2, dash='dash')), row=1, col=1)
+            fig.add_trace(go.Scattergl(x=x_vals, y=model["cumulative"][index], mode='lines', name=f'∫ {label}',
+                                       line=dict(color='red', width=2, dash='dash')), row=2, col=1)
+
+        if windows is not None:
+            positions, integrals, width = windows
+            window_index = decimation_indices(len(positions))
+            if width is None:
+                fig.add_trace(go.Scattergl(x=positions[window_index], y=integrals[window_index], mode='lines',
+                                           name='∫ ventana móvil', line=dict(color='orange', width=2)), row=3, col=1)
+            else:
+                fig.add_trace(go.Bar(x=positions[window_index], y=integrals[window_index], name='∫ ventana',
+                                     marker_color='orange', offset=0, width=width), row=3, col=1)
+
+        fig.update_layout(template='plotly_white', height=300 * rows, hovermode='x unified')
+        fig.update_xaxes(title_text=time_label, row=rows, col=1)
+
+        with stage("figure_serialization"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    except Exception as e:
+        st.error(f"Error creating time series plot: {str(e)}")
+
+def export_plot_data(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x", num_points: int = 1000):
     """
     Export plot data for external use.
+    
+    For large resolutions (with derivative and running integral) use
+    utils.data_export.export_samples, which streams the rows to a file.
     """
     try:
         # Validate inputs
@@ -619,18 +864,9 @@ def export_plot_data(function_str: str, lower_bound: str, upper_bound: str, vari
             st.error(f"Export error: {error}")
             return None
         
-        # Generate data points
-        num_points = 1000
-        x_vals_numpy = np.linspace(lower_val, upper_val, num_points)
-        x_vals = [safe_convert_numpy_to_python(x) for x in x_vals_numpy]
-        y_vals = []
-        
-        for x in x_vals:
-            success, y = evaluate_expression_at_point(expr, variable, x)
-            if success and not (np.isnan(y) or np.isinf(y)):
-                y_vals.append(y)
-            else:
-                y_vals.append(None)
+        # Generate data points (evaluación vectorizada; NaN donde f no está definida)
+        x_vals = np.linspace(lower_val, upper_val, num_points)
+        y_vals = evaluate_expression_on_grid(expr, variable, x_vals)
         
         # Create DataFrame
         import pandas as pd
@@ -643,4 +879,4 @@ def export_plot_data(function_str: str, lower_bound: str, upper_bound: str, vari
         
     except Exception as e:
         st.error(f"Error exporting data: {str(e)}")
-        return None
\ No newline at end of file
+        return None
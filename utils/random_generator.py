@@ -1,8 +1,8 @@
 import random
 import numpy as np
 import sympy as sp
-from typing import Dict, List, Tuple
-from .expression_parser import safe_sympify, evaluate_expression_at_point
+from typing import Dict, List, Tuple, Union
+from .expression_parser import safe_sympify, evaluate_expression_at_point, compile_expression
 
 # Engineering function templates with proper mathematical expressions
 ENGINEERING_TEMPLATES = [
@@ -136,6 +136,175 @@ SCENARIO_TEMPLATES = [
     }
 ]
 
+# Plantillas parametrizadas de la página de escenarios aleatorios, por categoría.
+# Parámetros: (tipo, mínimo, máximo[, decimales]); "upper": rango del límite superior
+SCENARIO_CATEGORIES = {
+    "🚀 Optimización de Rendimiento": [
+        {"function": "{a}*t**2 + {b}*t",
+         "parameters": {"a": ("int", 10, 100), "b": ("int", 1, 20)},
+         "context": "Tiempo de procesamiento de algoritmo O(n²)",
+         "upper": (50, 200)},
+        {"function": "{a}*exp(-{k}*t)",
+         "parameters": {"a": ("int", 20, 150), "k": ("float", 0.1, 0.5, 2)},
+         "context": "Degradación de cache después de pico",
+         "upper": (10, 60)}
+    ],
+    "📊 Machine Learning": [
+        {"function": "{a}*exp(-{k}*t)",
+         "parameters": {"a": ("float", 0.5, 2.0, 2), "k": ("float", 0.01, 0.2, 3)},
+         "context": "Función de pérdida durante entrenamiento",
+         "upper": (100, 1000)},
+        {"function": "{a}*log(t+1) + {b}",
+         "parameters": {"a": ("int", 5, 25), "b": ("int", 1, 10)},
+         "context": "Convergencia de accuracy en epochs",
+         "upper": (50, 200)}
+    ],
+    "🌐 Sistemas Distribuidos": [
+        {"function": "{a}*sin(3.14*t/{p}) + {b}",
+         "parameters": {"a": ("int", 100, 500), "p": ("int", 12, 24), "b": ("int", 200, 800)},
+         "context": "Carga de tráfico distribuido",
+         "upper": (24, 72)},
+        {"function": "{a}*exp(-t/{tau}) + {b}",
+         "parameters": {"a": ("int", 50, 200), "tau": ("int", 10, 30), "b": ("int", 10, 50)},
+         "context": "Latencia en red distribuida",
+         "upper": (60, 180)}
+    ],
+    "💾 Bases de Datos": [
+        {"function": "{a}*log(t+1) + {b}*t",
+         "parameters": {"a": ("int", 1000, 5000), "b": ("int", 100, 500)},
+         "context": "Consultas por segundo en base de datos",
+         "upper": (24, 168)},
+        {"function": "{a}*sqrt(t) + {b}",
+         "parameters": {"a": ("int", 50, 200), "b": ("int", 10, 100)},
+         "context": "Tiempo de respuesta de consultas",
+         "upper": (100, 500)}
+    ],
+    "🔒 Seguridad": [
+        {"function": "{a}*exp(t/{tau}) + {b}",
+         "parameters": {"a": ("int", 10, 100), "tau": ("int", 50, 200), "b": ("int", 5, 50)},
+         "context": "Intentos de acceso maliciosos",
+         "upper": (24, 72)},
+        {"function": "{a}*sin(3.14*t/{p}) + {b}",
+         "parameters": {"a": ("int", 100, 1000), "p": ("int", 6, 24), "b": ("int", 50, 500)},
+         "context": "Eventos de seguridad detectados",
+         "upper": (24, 168)}
+    ]
+}
+
+DEFAULT_SCENARIO_CATEGORY = "🚀 Optimización de Rendimiento"
+
+SCENARIO_COMPANIES = ["TechCorp", "DataFlow Inc", "CloudScale", "AI Systems", "ByteForce", "NeoStream"]
+
+SCENARIO_METRICS = ["MB/s", "ms", "requests/s", "% CPU", "GB", "usuarios", "eventos/h"]
+
+def sample_template_parameters(template: Dict, rng=random) -> Dict[str, Union[int, float]]:
+    """
+    Draw the parameters of a category template.
+    
+    Args:
+        template (Dict): Entry of SCENARIO_CATEGORIES
+        rng: random.Random instance (or the random module)
+    
+    Returns:
+        Dict[str, Union[int, float]]: Parameter name -> value (floats rounded to their decimals)
+    """
+    values = {}
+    for name, (kind, low, high, *decimals) in template["parameters"].items():
+        if kind == "int":
+            values[name] = rng.randint(low, high)
+        else:
+            values[name] = round(rng.uniform(low, high), decimals[0])
+    return values
+
+def render_template_function(template: Dict, parameters: Dict[str, Union[int, float]]) -> str:
+    """Function string of a category template for the given parameters."""
+    formatted = {}
+    for name, (kind, low, high, *decimals) in template["parameters"].items():
+        value = parameters[name]
+        formatted[name] = str(value) if kind == "int" else f"{value:.{decimals[0]}f}"
+    return template["function"].format(**formatted)
+
+def generate_category_scenario(category: str, rng=random) -> Dict:
+    """
+    Generate a scenario of the random scenarios page from its category templates.
+    
+    Args:
+        category (str): Key of SCENARIO_CATEGORIES (unknown categories use the default one)
+        rng: random.Random instance (or the random module)
+    
+    Returns:
+        Dict: function, context, company, metric, bounds and variable, plus the
+        category, template index and parameters the function was built from
+    """
+    if category not in SCENARIO_CATEGORIES:
+        category = DEFAULT_SCENARIO_CATEGORY
+    
+    templates = SCENARIO_CATEGORIES[category]
+    template_index = rng.randrange(len(templates))
+    template = templates[template_index]
+    parameters = sample_template_parameters(template, rng)
+    
+    return {
+        "function": render_template_function(template, parameters),
+        "context": template["context"],
+        "company": rng.choice(SCENARIO_COMPANIES),
+        "metric": rng.choice(SCENARIO_METRICS),
+        "lower": "0",
+        "upper": str(rng.randint(*template["upper"])),
+        "variable": "t",
+        "category": category,
+        "template_index": template_index,
+        "parameters": parameters
+    }
+
+def scenario_code(category: str, seed: int) -> str:
+    """
+    Compact code that reproduces a scenario: "<category index>-<seed in hex>".
+
+    Args:
+        category (str): Key of SCENARIO_CATEGORIES
+        seed (int): 32-bit scenario seed
+
+    Returns:
+        str: Code such as "1-9f3a1c7b"
+    """
+    categories = list(SCENARIO_CATEGORIES)
+    index = categories.index(category) if category in categories else categories.index(DEFAULT_SCENARIO_CATEGORY)
+    return f"{index}-{seed & 0xFFFFFFFF:08x}"
+
+def parse_scenario_code(code: str) -> Tuple[str, int]:
+    """
+    Category and seed of a scenario code.
+
+    Raises:
+        ValueError: If the code is malformed or names an unknown category
+    """
+    try:
+        index, seed = code.strip().split("-")
+        category = list(SCENARIO_CATEGORIES)[int(index)]
+        return category, int(seed, 16)
+    except (ValueError, IndexError, AttributeError):
+        raise ValueError(f"Invalid scenario code: {code!r}")
+
+def generate_seeded_scenario(category: str, seed: int) -> Dict:
+    """
+    Generate the scenario of a category for a seed (same seed, same scenario).
+
+    Args:
+        category (str): Key of SCENARIO_CATEGORIES
+        seed (int): 32-bit scenario seed
+
+    Returns:
+        Dict: generate_category_scenario output plus its "code" (see scenario_code)
+    """
+    scenario = generate_category_scenario(category, random.Random(seed))
+    scenario["code"] = scenario_code(scenario["category"], seed)
+    return scenario
+
+def scenario_from_code(code: str) -> Dict:
+    """Rebuild a scenario from its code (see scenario_code)."""
+    return generate_seeded_scenario(*parse_scenario_code(code))
+
 def generate_safe_bounds(function_template: Dict, function_str: str) -> Tuple[float, float]:
     """
     Generate safe integration bounds based on function type and validation.
@@ -169,46 +338,37 @@ def generate_safe_bounds(function_template: Dict, function_str: str) -> Tuple[fl
         # Default bounds
         bounds_options = [(0, 5), (1, 10), (-2, 2), (0, 8)]
     
-    # Try each bounds option and validate
-    for lower, upper in bounds_options:
-        try:
-            # Parse function and test evaluation
-            success, expr = safe_sympify(function_str, "t")
-            if success:
-                # Test evaluation at a few points
-                test_points = np.linspace(lower, upper, 5)
-                all_valid = True
-                
-                for point in test_points:
-                    eval_success, value = evaluate_expression_at_point(expr, "t", point)
-                    if not eval_success or abs(value) > 1e6 or np.isnan(value) or np.isinf(value):
-                        all_valid = False
-                        break
-                
-                if all_valid:
-                    return lower, upper
-        except:
-            continue
+    # Parsear y compilar una sola vez; cada opción se evalúa en un solo paso vectorizado
+    success, expr = safe_sympify(function_str, "t")
+    if success:
+        evaluate = compile_expression(expr, "t")
+        for lower, upper in bounds_options:
+            values = evaluate(np.linspace(lower, upper, 5))
+            if np.all(np.isfinite(values)) and np.all(np.abs(values) <= 1e6):
+                return lower, upper
     
     # Fallback bounds if nothing else works
     return 0, 5
 
-def generate_engineering_scenario() -> Dict:
+def generate_engineering_scenario(rng=random) -> Dict:
     """
     Generate a random engineering scenario with validated mathematical functions.
     
+    Args:
+        rng: random.Random instance (or the random module)
+    
     Returns:
         Dict: Complete scenario with function, bounds, context, etc.
     """
     # Select random template categories
-    template = random.choice(ENGINEERING_TEMPLATES)
-    scenario = random.choice(SCENARIO_TEMPLATES)
+    template = rng.choice(ENGINEERING_TEMPLATES)
+    scenario = rng.choice(SCENARIO_TEMPLATES)
     
     # Select random function from template
-    function_str = random.choice(template["functions"])
-    context = random.choice(template["contexts"])
-    unit = random.choice(template["units"])
-    time_unit = random.choice(scenario["time_units"])
+    function_str = rng.choice(template["functions"])
+    context = rng.choice(template["contexts"])
+    unit = rng.choice(template["units"])
+    time_unit = rng.choice(scenario["time_units"])
     
     # Generate safe bounds for the function
     lower_bound, upper_bound = generate_safe_bounds(template, function_str)
@@ -277,12 +437,13 @@ def get_scenario_complexity(function_str: str, function_type: str) -> str:
     except:
         return "media"
 
-def generate_multiple_scenarios(count: int = 5) -> List[Dict]:
+def generate_multiple_scenarios(count: int = 5, rng=random) -> List[Dict]:
     """
     Generate multiple unique engineering scenarios.
     
     Args:
         count (int): Number of scenarios to generate
+        rng: random.Random instance (or the random module)
     
     Returns:
         List[Dict]: List of generated scenarios
@@ -294,7 +455,7 @@ def generate_multiple_scenarios(count: int = 5) -> List[Dict]:
     attempts = 0
     
     while len(scenarios) < count and attempts < max_attempts:
-        scenario = generate_engineering_scenario()
+        scenario = generate_engineering_scenario(rng)
         
         # Ensure uniqueness by function
         if scenario["function"] not in used_functions:
@@ -0,0 +1,338 @@
+"""
+Bulk scenario factory for question banks.
+
+Scenarios are drawn from the category templates of the random scenarios
+page, validated on a worker pool (one vectorized evaluation per function),
+deduplicated by their parsed expression and interval, and solved once. Each
+scenario keeps its code, so it can be rebuilt outside the bank. The
+bank is a SQLite file whose ids are contiguous per category, so sampling a
+scenario is a single primary-key lookup regardless of the bank size:
+
+    python -m utils.scenario_bank -n 5000 --workers 4 --seed 7
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import sympy as sp
+
+try:
+    from .expression_parser import safe_sympify, compile_expression
+    from .calculator import calculate_definite_integral_robust
+    from .random_generator import SCENARIO_CATEGORIES, generate_seeded_scenario
+    from .instrumentation import stage, register_cache
+except ImportError:
+    from utils.expression_parser import safe_sympify, compile_expression
+    from utils.calculator import calculate_definite_integral_robust
+    from utils.random_generator import SCENARIO_CATEGORIES, generate_seeded_scenario
+    from utils.instrumentation import stage, register_cache
+
+# Banco por defecto (generado, no versionado); la página lo usa si existe
+SCENARIO_BANK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "assets", "_scenario_bank.sqlite")
+
+# Puntos de la evaluación vectorizada que valida cada función
+VALIDATION_POINTS = 257
+
+# Mismo umbral que validate_scenario para valores demasiado grandes
+MAX_ABS_VALUE = 1e10
+
+# Candidatos extra por ronda (descartes y duplicados) y rondas máximas
+OVERSAMPLING = 1.25
+MAX_ROUNDS = 20
+
+# Escenarios enviados juntos a cada proceso
+WORKER_CHUNK_SIZE = 32
+
+SCENARIO_COLUMNS = ("code", "category", "function", "lower", "upper", "variable", "context", "company",
+                    "metric", "template_index", "parameters", "result", "method")
+
+@lru_cache(maxsize=None)
+def _template_solution(category: str, template_index: int):
+    """
+    Definite integral of a category template compiled once with its parameters as symbols.
+
+    Returns:
+        Callable or None: f(*parameters, lower, upper) -> float, with the parameters
+        in template order; None if the template has no closed-form antiderivative
+    """
+    template = SCENARIO_CATEGORIES[category][template_index]
+    names = list(template["parameters"])
+
+    # Mismo parser que las instancias, así el resultado coincide con el cálculo robusto
+    success, expr = safe_sympify(template["function"].format(**{name: name for name in names}), "t")
+    if not success:
+        return None
+
+    # Todos los rangos de las plantillas son positivos
+    symbols = [sp.Symbol(name, positive=True) for name in names]
+    expr = expr.subs({sp.Symbol(name): symbol for name, symbol in zip(names, symbols)})
+    t = sp.Symbol("t", real=True)
+    lower, upper = sp.symbols("lower upper", real=True)
+
+    try:
+        antiderivative = sp.integrate(expr, t)
+    except Exception:
+        return None
+    if antiderivative.has(sp.Integral):
+        return None
+
+    definite = antiderivative.subs(t, upper) - antiderivative.subs(t, lower)
+    return sp.lambdify(symbols + [lower, upper], definite, modules="math")
+
+register_cache("scenario_template_solution", _template_solution)
+
+def solve_scenario(scenario: Dict) -> Tuple[bool, Union[float, str], str]:
+    """
+    Integral of a generated scenario, from its template's compiled solution when possible.
+
+    Template scenarios are solved by plugging their parameters and bounds into
+    the parametric antiderivative (microseconds); other scenarios, or templates
+    without a closed form, go through calculate_definite_integral_robust.
+
+    Returns:
+        Tuple[bool, Union[float, str], str]: (success, integral or error message, method used)
+    """
+    category, template_index = scenario.get("category"), scenario.get("template_index")
+    if category in SCENARIO_CATEGORIES and template_index is not None:
+        solution = _template_solution(category, template_index)
+        if solution is not None:
+            try:
+                parameters = scenario["parameters"]
+                value = solution(*(parameters[name] for name in SCENARIO_CATEGORIES[category][template_index]["parameters"]),
+                                 float(scenario["lower"]), float(scenario["upper"]))
+                if np.isfinite(value):
+                    return True, float(value), "Parametric Symbolic"
+            except (ArithmeticError, ValueError, KeyError):
+                pass
+
+    success, result, details = calculate_definite_integral_robust(
+        scenario["function"], scenario["lower"], scenario["upper"], scenario["variable"]
+    )
+    return success, result, details.get("method_used", "")
+
+def validate_and_solve(scenario: Dict) -> Optional[Dict]:
+    """
+    Validate a scenario with one vectorized evaluation and solve its integral.
+
+    Runs in the worker processes of build_scenario_bank.
+
+    Returns:
+        Dict or None: The scenario plus "canonical" (parsed expression, for
+        deduplication), "result" and "method"; None if it is not usable
+    """
+    success, expr = safe_sympify(scenario["function"], scenario["variable"])
+    if not success:
+        return None
+
+    lower, upper = float(scenario["lower"]), float(scenario["upper"])
+    if lower >= upper:
+        return None
+
+    values = compile_expression(expr, scenario["variable"])(np.linspace(lower, upper, VALIDATION_POINTS))
+    if not np.all(np.isfinite(values)) or np.max(np.abs(values)) > MAX_ABS_VALUE:
+        return None
+
+    success, result, method = solve_scenario(scenario)
+    if not success or not np.isfinite(result):
+        return None
+
+    # 0.10 y 0.1, 2.00 y 2 -> la misma expresión
+    canonical = sp.srepr(sp.nsimplify(expr, rational=True))
+    return dict(scenario, canonical=canonical, result=float(result), method=method)
+
+def _map_scenarios(executor, scenarios: List[Dict]) -> List[Optional[Dict]]:
+    if executor is None:
+        return [validate_and_solve(scenario) for scenario in scenarios]
+    return list(executor.map(validate_and_solve, scenarios, chunksize=WORKER_CHUNK_SIZE))
+
+def build_scenario_bank(count: int, path: str = SCENARIO_BANK_PATH, workers: int = None,
+                        seed: int = None, categories: List[str] = None) -> Dict[str, int]:
+    """
+    Generate, validate, deduplicate and solve scenarios in bulk and store them.
+
+    Categories are filled round-robin, so each gets about the same share.
+    Candidates are produced in rounds until the bank has `count` scenarios
+    or MAX_ROUNDS is reached (small template spaces run out of unique
+    scenarios). The file is written to a temporary path and swapped in
+    atomically, so the page never reads a half-written bank.
+
+    Args:
+        count (int): Number of scenarios wanted
+        path (str): Output SQLite file
+        workers (int): Worker processes (None: one per CPU, 1: no pool)
+        seed (int): Seed of the candidate stream (None: random)
+        categories (List[str]): Categories to include (default: all)
+
+    Returns:
+        Dict[str, int]: scenarios stored, candidates generated, invalid and duplicates
+
+    Raises:
+        ValueError: If count is not positive or a category is unknown
+    """
+    if count < 1:
+        raise ValueError("The number of scenarios must be positive")
+    categories = list(categories or SCENARIO_CATEGORIES)
+    unknown = [category for category in categories if category not in SCENARIO_CATEGORIES]
+    if unknown:
+        raise ValueError(f"Unknown categories: {unknown}")
+
+    rng = random.Random(seed)
+    accepted: Dict[tuple, Dict] = {}
+    seen_inputs = set()
+    stats = {"scenarios": 0, "generated": 0, "invalid": 0, "duplicates": 0}
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        with stage("scenario_bank"):
+            for _ in range(MAX_ROUNDS):
+                missing = count - len(accepted)
+                if missing <= 0:
+                    break
+
+                # Duplicados literales se descartan antes de gastar un proceso en ellos
+                batch = []
+                for _ in range(int(missing * OVERSAMPLING) + 1):
+                    # Cada escenario con su propia semilla: reproducible desde su código
+                    category = categories[stats["generated"] % len(categories)]
+                    scenario = generate_seeded_scenario(category, rng.getrandbits(32))
+                    stats["generated"] += 1
+                    key = (scenario["function"], scenario["lower"], scenario["upper"])
+                    if key in seen_inputs:
+                        stats["duplicates"] += 1
+                        continue
+                    seen_inputs.add(key)
+                    batch.append(scenario)
+
+                for solved in _map_scenarios(executor, batch):
+                    if solved is None:
+                        stats["invalid"] += 1
+                        continue
+                    key = (solved.pop("canonical"), solved["lower"], solved["upper"])
+                    if key in accepted or len(accepted) >= count:
+                        stats["duplicates"] += 1
+                        continue
+                    accepted[key] = solved
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    scenarios = sorted(accepted.values(), key=lambda scenario: categories.index(scenario["category"]))
+    _write_bank(scenarios, path)
+    stats["scenarios"] = len(scenarios)
+    return stats
+
+def _write_bank(scenarios: List[Dict], path: str):
+    """Write the scenarios (sorted by category) and the per-category id ranges."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+
+    with closing(sqlite3.connect(temporary_path)) as connection:
+        connection.execute("""
+            CREATE TABLE scenarios (
+                id INTEGER PRIMARY KEY,
+                code TEXT, category TEXT, function TEXT, lower TEXT, upper TEXT, variable TEXT,
+                context TEXT, company TEXT, metric TEXT,
+                template_index INTEGER, parameters TEXT, result REAL, method TEXT
+            )""")
+        connection.execute("CREATE TABLE categories (name TEXT PRIMARY KEY, first_id INTEGER, size INTEGER)")
+
+        rows = [
+            tuple(json.dumps(scenario[column]) if column == "parameters" else scenario[column]
+                  for column in SCENARIO_COLUMNS)
+            for scenario in scenarios
+        ]
+        connection.executemany(
+            f"INSERT INTO scenarios ({', '.join(SCENARIO_COLUMNS)}) VALUES ({', '.join('?' * len(SCENARIO_COLUMNS))})",
+            rows
+        )
+        connection.execute("""
+            INSERT INTO categories
+            SELECT category, MIN(id), COUNT(*) FROM scenarios GROUP BY category
+        """)
+        connection.commit()
+
+    os.replace(temporary_path, path)
+
+@lru_cache(maxsize=8)
+def _bank_index(path: str, modified_time: float) -> Dict[str, tuple]:
+    """Category -> (first id, size), read once per version of the bank file."""
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as connection:
+        index = {name: (first_id, size) for name, first_id, size in
+                 connection.execute("SELECT name, first_id, size FROM categories")}
+    total = sum(size for _, size in index.values())
+    index[None] = (1, total)
+    return index
+
+def scenario_bank_available(path: str = SCENARIO_BANK_PATH) -> bool:
+    """True if a scenario bank exists at path."""
+    return os.path.exists(path)
+
+def sample_scenario(category: str = None, rng=random, path: str = SCENARIO_BANK_PATH) -> Optional[Dict]:
+    """
+    Draw a random scenario from the bank in O(1): a random id in the category range.
+
+    Args:
+        category (str): Category to sample from (None: any)
+        rng: random.Random instance (or the random module)
+        path (str): Bank file
+
+    Returns:
+        Dict or None: Scenario with the keys of generate_seeded_scenario plus the
+        precomputed "result" and "method"; None if there is no bank or the
+        category has no scenarios
+    """
+    if not scenario_bank_available(path):
+        return None
+
+    index = _bank_index(path, os.path.getmtime(path))
+    first_id, size = index.get(category, (0, 0))
+    if size == 0:
+        return None
+
+    scenario_id = first_id + rng.randrange(size)
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as connection:
+        row = connection.execute(
+            f"SELECT {', '.join(SCENARIO_COLUMNS)} FROM scenarios WHERE id = ?", (scenario_id,)
+        ).fetchone()
+
+    scenario = dict(zip(SCENARIO_COLUMNS, row))
+    scenario["parameters"] = json.loads(scenario["parameters"])
+    return scenario
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a bank of validated, pre-solved scenarios")
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("-o", "--output", default=SCENARIO_BANK_PATH)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--category", action="append", dest="categories", choices=list(SCENARIO_CATEGORIES))
+    args = parser.parse_args(argv)
+
+    try:
+        stats = build_scenario_bank(args.count, args.output, args.workers, args.seed, args.categories)
+    except ValueError as e:
+        print(f"Scenario bank error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{stats['scenarios']} scenarios written to {args.output} "
+          f"({stats['generated']} generated, {stats['invalid']} invalid, {stats['duplicates']} duplicates)",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
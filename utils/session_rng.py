@@ -0,0 +1,67 @@
+"""
+Independent, seeded random streams per Streamlit session.
+
+Every session gets its own root seed; each named stream ("scenarios", ...)
+is derived from it with NumPy's SeedSequence, so streams never share state
+across sessions or with the global ``random`` module:
+
+    rng = session_rng("scenarios")  # random.Random
+"""
+
+import random
+import secrets
+import zlib
+from typing import Dict
+
+import numpy as np
+
+# Claves en st.session_state
+SESSION_SEED_KEY = "rng_seed"
+SESSION_STREAMS_KEY = "rng_streams"
+
+# Estado de respaldo cuando no hay sesión de Streamlit (scripts, CLI)
+_fallback_state: Dict = {}
+
+def new_seed() -> int:
+    """Fresh 32-bit seed from the OS entropy pool."""
+    return secrets.randbits(32)
+
+def derive_seed(root_seed: int, stream: str) -> int:
+    """
+    Seed of a named stream, derived deterministically from a root seed.
+
+    Args:
+        root_seed (int): Session (or run) seed
+        stream (str): Stream name
+
+    Returns:
+        int: 32-bit seed, independent for different stream names
+    """
+    sequence = np.random.SeedSequence([root_seed, zlib.crc32(stream.encode("utf-8"))])
+    return int(sequence.generate_state(1)[0])
+
+def _session_state():
+    try:
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if get_script_run_ctx() is not None:
+            return st.session_state
+    except:
+        pass
+    return _fallback_state
+
+def get_session_seed() -> int:
+    """Root seed of the current session (created on first use)."""
+    state = _session_state()
+    if SESSION_SEED_KEY not in state:
+        state[SESSION_SEED_KEY] = new_seed()
+    return state[SESSION_SEED_KEY]
+
+def session_rng(stream: str) -> random.Random:
+    """random.Random stream of the current session (persistent across reruns)."""
+    state = _session_state()
+    seed = get_session_seed()
+    streams = state.setdefault(SESSION_STREAMS_KEY, {})
+    if stream not in streams:
+        streams[stream] = random.Random(derive_seed(seed, stream))
+    return streams[stream]
@@ -0,0 +1,356 @@
+"""
+Integration of measured time series (CPU, RPS...) from CSV or Parquet files.
+
+Only the two needed columns are read: local files are memory-mapped and
+uploaded files are read zero-copy from their buffer, so multi-million-row
+files with uneven timestamps load without extra copies. Cumulative,
+fixed-window and rolling integrals are single vectorized passes
+(trapezoid or Simpson), and a parametric model can be fitted to the
+samples to overlay its integral on the measured one.
+"""
+
+import io
+import os
+import time
+from typing import Dict, List, Tuple, Union, Any, Optional
+
+import numpy as np
+
+# ✅ IMPORT OPCIONAL DE PYARROW (lectura con memory map / sin copia)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from scipy.optimize import curve_fit
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+try:
+    from .calculator import cumulative_quadrature
+    from .parametric_integrals import compile_parametric_integral, evaluate_parametric_integral
+    from .instrumentation import stage, count
+except ImportError:
+    from utils.calculator import cumulative_quadrature
+    from utils.parametric_integrals import compile_parametric_integral, evaluate_parametric_integral
+    from utils.instrumentation import stage, count
+
+TIME_SERIES_FORMATS = ("csv", "parquet")
+
+# Segundos por unidad al convertir columnas de fecha/hora a tiempo numérico
+TIME_UNITS = {"s": 1.0, "min": 60.0, "h": 3600.0}
+
+# Trapecio por defecto: Simpson con pasos muy desiguales amplifica el ruido de las mediciones
+INTEGRATION_METHODS = ("trapezoid", "simpson")
+
+# Muestras usadas para ajustar el modelo (submuestreo uniforme por encima)
+FIT_MAX_SAMPLES = 20000
+
+# Puntos máximos por serie enviados a una gráfica
+PLOT_MAX_POINTS = 5000
+
+def detect_format(source, format: str = None) -> str:
+    """
+    File format from an explicit value or the file name (path or uploaded file).
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if format is None:
+        name = source if isinstance(source, str) else getattr(source, "name", "")
+        format = os.path.splitext(str(name))[1].lstrip(".").lower()
+        format = {"pq": "parquet", "txt": "csv"}.get(format, format)
+    if format not in TIME_SERIES_FORMATS:
+        raise ValueError(f"Unsupported time series format: {format!r} (use CSV or Parquet)")
+    return format
+
+def _arrow_source(source):
+    """Memory map for paths, zero-copy buffer for uploaded files and bytes."""
+    if isinstance(source, str):
+        return pa.memory_map(source, "r")
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pa.BufferReader(source)
+    if hasattr(source, "getbuffer"):
+        return pa.BufferReader(source.getbuffer())
+    return pa.BufferReader(source.read())
+
+def _pandas_source(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+def read_time_series_columns(source, format: str = None) -> List[str]:
+    """
+    Column names of a CSV or Parquet file, without reading its data.
+
+    Raises:
+        ValueError: If the format is unsupported or the file cannot be read
+    """
+    format = detect_format(source, format)
+    try:
+        if PYARROW_AVAILABLE:
+            if format == "parquet":
+                # Sin la columna de índice que añade pandas al escribir Parquet
+                return [name for name in pq.read_schema(_arrow_source(source)).names
+                        if not name.startswith("__index_level_")]
+            reader = pa_csv.open_csv(_arrow_source(source))
+            return list(reader.schema.names)
+
+        if format == "parquet":
+            raise ValueError("Reading Parquet files requires pyarrow")
+        import pandas as pd
+        return list(pd.read_csv(_pandas_source(source), nrows=0).columns)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Could not read the file: {str(e)}")
+
+def _read_two_columns(source, format: str, time_column: str, value_column: str) -> Tuple[np.ndarray, np.ndarray]:
+    columns = [time_column, value_column]
+    if PYARROW_AVAILABLE:
+        if format == "parquet":
+            table = pq.read_table(_arrow_source(source), columns=columns, memory_map=isinstance(source, str))
+        else:
+            table = pa_csv.read_csv(_arrow_source(source),
+                                    convert_options=pa_csv.ConvertOptions(include_columns=columns))
+        return (table.column(time_column).to_numpy(zero_copy_only=False),
+                table.column(value_column).to_numpy(zero_copy_only=False))
+
+    if format == "parquet":
+        raise ValueError("Reading Parquet files requires pyarrow")
+    import pandas as pd
+    frame = pd.read_csv(_pandas_source(source), usecols=columns, memory_map=isinstance(source, str))
+    return frame[time_column].to_numpy(), frame[value_column].to_numpy()
+
+def _numeric_column(raw: np.ndarray) -> np.ndarray:
+    """Column as float64, NaN where a cell is missing or not a number."""
+    if np.issubdtype(raw.dtype, np.number):
+        return raw.astype(float)
+    import pandas as pd
+    return np.asarray(pd.to_numeric(raw, errors="coerce"), dtype=float)
+
+def _numeric_times(raw_times: np.ndarray, time_unit: str) -> Tuple[np.ndarray, Optional[str]]:
+    """
+    Times as float64; dates become time since the first sample in time_unit.
+
+    A text column is read as numbers first (bad cells become NaN, e.g. "1,2,3,bad")
+    and as dates only if no cell is numeric.
+    """
+    if not np.issubdtype(raw_times.dtype, np.datetime64):
+        times = _numeric_column(raw_times)
+        if np.issubdtype(raw_times.dtype, np.number) or np.any(np.isfinite(times)):
+            return times, None
+
+        import pandas as pd
+        raw_times = pd.to_datetime(raw_times, errors="coerce", utc=True).tz_localize(None).to_numpy()
+
+    raw_times = raw_times.astype("datetime64[ns]")
+    valid = ~np.isnat(raw_times)
+    if not np.any(valid):
+        raise ValueError("The time column has no valid dates")
+
+    start = raw_times[valid].min()
+    seconds = (raw_times - start) / np.timedelta64(1, "s")
+    return np.where(valid, seconds, np.nan) / TIME_UNITS[time_unit], str(start)
+
+def load_time_series(source, time_column: str, value_column: str, format: str = None,
+                     time_unit: str = "h") -> Tuple[bool, Union[Dict[str, np.ndarray], str], Dict[str, Any]]:
+    """
+    Load a (time, value) series from a CSV or Parquet file.
+
+    Only the two columns are read. Rows with missing or non-numeric values
+    are dropped, samples are sorted by time if needed and repeated
+    timestamps keep their first sample (Simpson needs distinct times).
+
+    Args:
+        source: File path, uploaded file (Streamlit UploadedFile) or bytes
+        time_column (str): Column with numeric times or dates
+        value_column (str): Column with the measured values
+        format (str): "csv" or "parquet" (default: from the file name)
+        time_unit (str): Unit of the times when the column holds dates ("s", "min", "h")
+
+    Returns:
+        Tuple[bool, Union[dict, str], dict]: (success, {"times", "values"} or error message,
+        details with rows, dropped, duplicates, sorted, uneven, start and time_unit)
+    """
+    details = {"rows": 0, "dropped": 0, "duplicates": 0, "sorted": False,
+               "uneven": False, "start": None, "time_unit": time_unit}
+
+    if time_unit not in TIME_UNITS:
+        return False, f"Unknown time unit: {time_unit}", details
+    if time_column == value_column:
+        return False, "The time and value columns must be different", details
+
+    try:
+        format = detect_format(source, format)
+        with stage("time_series_loading"):
+            raw_times, raw_values = _read_two_columns(source, format, time_column, value_column)
+            times, details["start"] = _numeric_times(raw_times, time_unit)
+            values = _numeric_column(raw_values)
+    except ValueError as e:
+        return False, str(e), details
+    except Exception as e:
+        return False, f"Could not read the time series: {str(e)}", details
+
+    with stage("time_series_cleaning"):
+        keep = np.isfinite(times) & np.isfinite(values)
+        details["dropped"] = int(np.count_nonzero(~keep))
+        times, values = times[keep], values[keep]
+
+        if np.any(np.diff(times) < 0):
+            order = np.argsort(times, kind="stable")
+            times, values = times[order], values[order]
+            details["sorted"] = True
+
+        distinct = np.concatenate(([True], np.diff(times) > 0))
+        details["duplicates"] = int(np.count_nonzero(~distinct))
+        times, values = times[distinct], values[distinct]
+
+    if times.size < 2:
+        return False, "The series needs at least two samples with distinct times", details
+
+    steps = np.diff(times)
+    details["rows"] = int(times.size)
+    details["uneven"] = bool(np.ptp(steps) > 1e-9 * max(np.max(steps), 1.0))
+    count("evaluations", times.size)
+    return True, {"times": times, "values": values}, details
+
+def integrate_samples(times: np.ndarray, values: np.ndarray, method: str = "trapezoid",
+                      window: float = None, rolling: bool = False) -> Tuple[bool, Union[Dict[str, np.ndarray], str], Dict[str, Any]]:
+    """
+    Cumulative and windowed integrals of sampled data, in vectorized passes.
+
+    The running integral uses the trapezoidal rule or cumulative Simpson on
+    the (possibly uneven) sample times. Simpson is more accurate on smooth
+    data, but with very uneven steps (see details["max_step_ratio"]) it
+    amplifies measurement noise. Window integrals are differences
+    of the running integral interpolated at the window edges, so any
+    number of windows costs one np.interp.
+
+    Args:
+        times (np.ndarray): Increasing sample times
+        values (np.ndarray): Sample values
+        method (str): "trapezoid" or "simpson"
+        window (float): Window width in time units (None: no windows)
+        rolling (bool): Trailing window ending at every sample instead of fixed consecutive windows
+
+    Returns:
+        Tuple[bool, Union[dict, str], dict]: (success, {"cumulative", and "window_starts" /
+        "window_integrals" when a window is given} or error message, details)
+    """
+    details = {"method_used": None, "total": None, "samples": int(len(times)), "windows": 0,
+               "max_step_ratio": None}
+
+    if method not in INTEGRATION_METHODS:
+        return False, f"Unknown integration method: {method}", details
+    if window is not None and not window > 0:
+        return False, "The window width must be positive", details
+
+    start_time = time.time()
+    with stage("time_series_integration"):
+        cumulative, details["method_used"] = cumulative_quadrature(times, values, method)
+        steps = np.diff(times)
+        if steps.size > 1:
+            details["max_step_ratio"] = float(np.max(np.maximum(steps[1:], steps[:-1]) /
+                                                     np.minimum(steps[1:], steps[:-1])))
+        result = {"cumulative": cumulative}
+
+        if window is not None:
+            if rolling:
+                starts = np.maximum(times - window, times[0])
+                ends = times
+            else:
+                starts = np.arange(times[0], times[-1], window)
+                ends = np.minimum(starts + window, times[-1])
+            result["window_starts"] = starts
+            result["window_integrals"] = np.interp(ends, times, cumulative) - np.interp(starts, times, cumulative)
+            details["windows"] = int(starts.size)
+
+    details["total"] = float(cumulative[-1])
+    details["computation_time"] = time.time() - start_time
+    return True, result, details
+
+def fit_parametric_model(function_str: str, initial: Dict[str, float], times: np.ndarray, values: np.ndarray,
+                         variable: str = "t") -> Tuple[bool, Union[Dict[str, float], str], Dict[str, Any]]:
+    """
+    Least-squares fit of a parametric model (e.g. "A*exp(-k*t)") to samples.
+
+    The model is the compiled parametric integrand, so each iteration is one
+    vectorized evaluation; long series are subsampled to FIT_MAX_SAMPLES.
+
+    Args:
+        function_str (str): Expression with named parameters
+        initial (Dict[str, float]): Starting value of every parameter
+        times (np.ndarray): Sample times
+        values (np.ndarray): Sample values
+        variable (str): Time variable of the expression
+
+    Returns:
+        Tuple[bool, Union[dict, str], dict]: (success, fitted parameters or error message,
+        details with rmse, r_squared and fit_samples)
+    """
+    details = {"rmse": None, "r_squared": None, "fit_samples": 0}
+    if not SCIPY_AVAILABLE:
+        return False, "Fitting a model requires SciPy", details
+
+    try:
+        compiled = compile_parametric_integral(function_str, tuple(initial), variable)
+    except ValueError as e:
+        return False, str(e), details
+
+    stride = max(1, int(np.ceil(len(times) / FIT_MAX_SAMPLES)))
+    fit_times, fit_values = times[::stride], values[::stride]
+    details["fit_samples"] = int(fit_times.size)
+
+    def model(points, *parameter_values):
+        return np.nan_to_num(compiled["integrand"](points, *parameter_values), nan=0.0)
+
+    try:
+        with stage("model_fitting"):
+            fitted, _ = curve_fit(model, fit_times, fit_values, p0=[float(initial[name]) for name in initial],
+                                  maxfev=5000)
+    except Exception as e:
+        return False, f"The model could not be fitted: {str(e)}", details
+
+    residuals = fit_values - model(fit_times, *fitted)
+    spread = np.sum((fit_values - np.mean(fit_values)) ** 2)
+    details["rmse"] = float(np.sqrt(np.mean(residuals ** 2)))
+    details["r_squared"] = float(1 - np.sum(residuals ** 2) / spread) if spread > 0 else None
+    return True, {name: float(value) for name, value in zip(initial, fitted)}, details
+
+def model_series(function_str: str, parameters: Dict[str, float], times: np.ndarray,
+                 variable: str = "t") -> Tuple[bool, Union[Dict[str, np.ndarray], str]]:
+    """
+    Model values and running integral from times[0] at every sample time.
+
+    The running integral is the compiled parametric antiderivative with the
+    upper bound broadcast over the sample times (Gauss-Legendre per sample
+    when there is no closed form).
+
+    Returns:
+        Tuple[bool, Union[dict, str]]: (success, {"values", "cumulative"} or error message)
+    """
+    try:
+        compiled = compile_parametric_integral(function_str, tuple(parameters), variable)
+    except ValueError as e:
+        return False, str(e)
+
+    success, cumulative, _ = evaluate_parametric_integral(function_str, float(times[0]), times, parameters, variable)
+    if not success:
+        return False, cumulative
+
+    values = compiled["integrand"](times, *(float(parameters[name]) for name in compiled["parameters"]))
+    return True, {"values": values, "cumulative": cumulative}
+
+def decimation_indices(size: int, max_points: int = PLOT_MAX_POINTS) -> np.ndarray:
+    """Evenly spaced indices (always including the last one) to plot at most max_points samples."""
+    if size <= max_points:
+        return np.arange(size)
+    return np.unique(np.concatenate((np.linspace(0, size - 1, max_points).astype(int), [size - 1])))
@@ -1,7 +1,31 @@
 import numpy as np
 import sympy as sp
+import threading
+from functools import lru_cache
 from typing import Tuple, Union, List
 from .expression_parser import safe_sympify, safe_float_conversion, validate_expression_domain
+from .instrumentation import stage, register_cache
+
+# Colectores de avisos activos (por hilo) mientras se calcula una validación cacheable
+_notices = threading.local()
+
+def _notify(level: str, message: str):
+    """
+    Show a validation notice (st.error/st.warning/st.info).
+    
+    While a cacheable validation is running the notice is recorded instead,
+    so it can be shown again every time the cached result is reused.
+    """
+    collectors = getattr(_notices, "collectors", None)
+    if collectors:
+        collectors[-1].append((level, message))
+        return
+    
+    try:
+        import streamlit as st
+        getattr(st, level)(message)
+    except:
+        pass
 
 def validate_function_input(function_str: str, variable: str = "x") -> Tuple[bool, str, sp.Expr]:
     """
@@ -39,10 +63,32 @@ def validate_function_input(function_str: str, variable: str = "x") -> Tuple[boo
     
     return True, "", expr
 
+# Textos aceptados como límites infinitos (en minúsculas y sin espacios)
+POSITIVE_INFINITY_ALIASES = ('inf', '+inf', 'infinity', '+infinity', 'positiveinfinity', 'oo', '+oo', '∞', '+∞')
+NEGATIVE_INFINITY_ALIASES = ('-inf', '-infinity', 'negativeinfinity', '-oo', '-∞')
+
+def parse_infinite_bound(bound: str) -> Union[float, None]:
+    """
+    Recognize an infinite bound ("inf", "-infinity", "oo", "∞"...).
+    
+    Returns:
+        float or None: np.inf or -np.inf, or None if the bound is not infinite
+    """
+    text = str(bound).lower().replace(" ", "")
+    if text in POSITIVE_INFINITY_ALIASES:
+        return np.inf
+    if text in NEGATIVE_INFINITY_ALIASES:
+        return -np.inf
+    return None
+
 def validate_bounds(lower_bound: str, upper_bound: str) -> Tuple[bool, str, float, float]:
     """
     Validate integration bounds with very flexible limits for engineering applications.
     
+    Infinite bounds are replaced by ±1,000,000 here (plots, Riemann sums);
+    calculate_definite_integral_robust sends them to the improper integral
+    engine before this truncation.
+    
     Args:
         lower_bound (str): Lower bound string
         upper_bound (str): Upper bound string
@@ -52,7 +98,7 @@ def validate_bounds(lower_bound: str, upper_bound: str) -> Tuple[bool, str, floa
     """
     # Handle special infinity cases
     try:
-        if str(lower_bound).lower().strip() in ['-inf', '-infinity', 'negative infinity']:
+        if parse_infinite_bound(lower_bound) == -np.inf:
             lower_val = -1000000.0  # Use very large finite number for engineering
         else:
             success_lower, result_lower = safe_float_conversion(lower_bound)
@@ -63,7 +109,7 @@ def validate_bounds(lower_bound: str, upper_bound: str) -> Tuple[bool, str, floa
         return False, f"Error processing lower bound: {str(e)}", None, None
     
     try:
-        if str(upper_bound).lower().strip() in ['inf', 'infinity', 'positive infinity']:
+        if parse_infinite_bound(upper_bound) == np.inf:
             upper_val = 1000000.0  # Use very large finite number for engineering
         else:
             success_upper, result_upper = safe_float_conversion(upper_bound)
@@ -85,31 +131,15 @@ def validate_bounds(lower_bound: str, upper_bound: str) -> Tuple[bool, str, floa
         return False, f"Integration interval is extremely large ({interval_size:.0f} units). Maximum allowed: 100,000,000 units", None, None
     elif interval_size > 50000000:  # 50 millones
         # Permitir pero con advertencia fuerte
-        try:
-            import streamlit as st
-            st.error(f"🚨 Extremely large integration interval ({interval_size:.0f} units). This may cause performance issues.")
-        except:
-            pass
+        _notify("error", f"🚨 Extremely large integration interval ({interval_size:.0f} units). This may cause performance issues.")
     elif interval_size > 10000000:  # 10 millones
         # Permitir pero con advertencia
-        try:
-            import streamlit as st
-            st.warning(f"⚠️ Very large integration interval ({interval_size:.0f} units). Computation will be slow.")
-        except:
-            pass
+        _notify("warning", f"⚠️ Very large integration interval ({interval_size:.0f} units). Computation will be slow.")
     elif interval_size > 1000000:  # 1 millón
         # Permitir intervalos grandes con advertencia menor
-        try:
-            import streamlit as st
-            st.info(f"ℹ️ Large integration interval ({interval_size:.0f} units). This may take several moments to compute.")
-        except:
-            pass
+        _notify("info", f"ℹ️ Large integration interval ({interval_size:.0f} units). This may take several moments to compute.")
     elif interval_size > 100000:  # 100,000
-        try:
-            import streamlit as st
-            st.info(f"ℹ️ Moderate integration interval ({interval_size:.0f} units).")
-        except:
-            pass
+        _notify("info", f"ℹ️ Moderate integration interval ({interval_size:.0f} units).")
     
     # Límites absolutos muy flexibles para ingeniería
     if abs(lower_val) > 1000000000 or abs(upper_val) > 1000000000:  # 1 billón
@@ -140,23 +170,11 @@ def validate_subdivisions(n: int) -> Tuple[bool, str]:
     if n > 100000:
         return False, f"Number of subdivisions is too large ({n:,}). Maximum allowed: 100,000"
     elif n > 50000:
-        try:
-            import streamlit as st
-            st.warning(f"⚠️ Very large number of subdivisions ({n:,}). This will take significant time to compute.")
-        except:
-            pass
+        _notify("warning", f"⚠️ Very large number of subdivisions ({n:,}). This will take significant time to compute.")
     elif n > 10000:
-        try:
-            import streamlit as st
-            st.info(f"ℹ️ Large number of subdivisions ({n:,}). Computation may take a moment.")
-        except:
-            pass
+        _notify("info", f"ℹ️ Large number of subdivisions ({n:,}). Computation may take a moment.")
     elif n > 1000:
-        try:
-            import streamlit as st
-            st.info(f"ℹ️ High number of subdivisions ({n:,}).")
-        except:
-            pass
+        _notify("info", f"ℹ️ High number of subdivisions ({n:,}).")
     
     return True, ""
 
@@ -164,6 +182,10 @@ def validate_integration_inputs(function_str: str, lower_bound: str, upper_bound
     """
     Validate all inputs for integration calculations with improved error handling.
     
+    Results (parsed expression, converted bounds and the domain report) are
+    cached per input tuple and shared by every caller; the warnings of a
+    validation are shown again on each call.
+    
     Args:
         function_str (str): Function string
         lower_bound (str): Lower bound string
@@ -173,6 +195,47 @@ def validate_integration_inputs(function_str: str, lower_bound: str, upper_bound
     Returns:
         Tuple[bool, str, sp.Expr, float, float]: (is_valid, error_message, expr, lower_val, upper_val)
     """
+    with stage("validation"):
+        try:
+            hash((function_str, lower_bound, upper_bound, variable))
+            cacheable = True
+        except TypeError:
+            cacheable = False
+        
+        if cacheable:
+            *result, notices = _validate_integration_inputs_cached(function_str, lower_bound, upper_bound, variable)
+        else:
+            *result, notices = _collect_integration_validation(function_str, lower_bound, upper_bound, variable)
+        
+        for level, message in notices:
+            _notify(level, message)
+        
+        return tuple(result)
+
+@lru_cache(maxsize=256)
+def _validate_integration_inputs_cached(function_str: str, lower_bound: str, upper_bound: str, variable: str) -> tuple:
+    """Cached (is_valid, error_message, expr, lower_val, upper_val, notices)."""
+    return _collect_integration_validation(function_str, lower_bound, upper_bound, variable)
+
+register_cache("validate_integration_inputs", _validate_integration_inputs_cached)
+
+def _collect_integration_validation(function_str: str, lower_bound: str, upper_bound: str, variable: str) -> tuple:
+    """Run the validation, recording its notices instead of showing them."""
+    collectors = getattr(_notices, "collectors", None)
+    if collectors is None:
+        collectors = _notices.collectors = []
+    
+    notices = []
+    collectors.append(notices)
+    try:
+        result = _check_integration_inputs(function_str, lower_bound, upper_bound, variable)
+    finally:
+        collectors.pop()
+    
+    return result + (tuple(notices),)
+
+def _check_integration_inputs(function_str: str, lower_bound: str, upper_bound: str, variable: str) -> Tuple[bool, str, sp.Expr, float, float]:
+    """Function, bounds and domain checks behind validate_integration_inputs."""
     # Validate function
     func_valid, func_error, expr = validate_function_input(function_str, variable)
     if not func_valid:
@@ -188,19 +251,11 @@ def validate_integration_inputs(function_str: str, lower_bound: str, upper_bound
         domain_valid, domain_error = validate_expression_domain(expr, variable, lower_val, upper_val)
         if not domain_valid:
             # En lugar de fallar completamente, mostrar advertencia y continuar
-            try:
-                import streamlit as st
-                st.warning(f"⚠️ Potential domain issue: {domain_error}")
-            except:
-                pass
+            _notify("warning", f"⚠️ Potential domain issue: {domain_error}")
             # Continuar con la validación en lugar de fallar
     except Exception as e:
         # Si la validación del dominio falla, continuar pero advertir
-        try:
-            import streamlit as st
-            st.warning(f"⚠️ Could not fully validate function domain: {str(e)}")
-        except:
-            pass
+        _notify("warning", f"⚠️ Could not fully validate function domain: {str(e)}")
     
     return True, "", expr, lower_val, upper_val
 
@@ -263,32 +318,16 @@ def validate_two_functions(func1_str: str, func2_str: str, lower_bound: str, upp
     try:
         domain1_valid, domain1_error = validate_expression_domain(expr1, variable, lower_val, upper_val)
         if not domain1_valid:
-            try:
-                import streamlit as st
-                st.warning(f"⚠️ First function domain issue: {domain1_error}")
-            except:
-                pass
+            _notify("warning", f"⚠️ First function domain issue: {domain1_error}")
     except Exception as e:
-        try:
-            import streamlit as st
-            st.warning(f"⚠️ Could not validate first function domain: {str(e)}")
-        except:
-            pass
+        _notify("warning", f"⚠️ Could not validate first function domain: {str(e)}")
     
     try:
         domain2_valid, domain2_error = validate_expression_domain(expr2, variable, lower_val, upper_val)
         if not domain2_valid:
-            try:
-                import streamlit as st
-                st.warning(f"⚠️ Second function domain issue: {domain2_error}")
-            except:
-                pass
+            _notify("warning", f"⚠️ Second function domain issue: {domain2_error}")
     except Exception as e:
-        try:
-            import streamlit as st
-            st.warning(f"⚠️ Could not validate second function domain: {str(e)}")
-        except:
-            pass
+        _notify("warning", f"⚠️ Could not validate second function domain: {str(e)}")
     
     return True, "", expr1, expr2, lower_val, upper_val
 
@@ -388,11 +427,7 @@ def validate_engineering_bounds(scenario_type: str, lower_bound: str, upper_boun
         
         if interval_size > max_interval:
             # En lugar de fallar, mostrar advertencia y usar límite general
-            try:
-                import streamlit as st
-                st.warning(f"⚠️ Very large interval for {scenario_type} scenario ({interval_size:.0f} units). Using general validation.")
-            except:
-                pass
+            _notify("warning", f"⚠️ Very large interval for {scenario_type} scenario ({interval_size:.0f} units). Using general validation.")
             
             # Usar validación general más flexible
             if interval_size > 1000000000:  # 1 billón como límite absoluto
@@ -432,11 +467,7 @@ def validate_extreme_bounds(lower_bound: str, upper_bound: str, allow_extreme: b
             if interval_size > 1000000000000:  # 1 billón
                 return False, f"Interval exceeds extreme limit ({interval_size:.0f} > 1,000,000,000,000)", None, None
             elif interval_size > 100000000:  # 100 millones
-                try:
-                    import streamlit as st
-                    st.warning(f"🔥 Extreme computation ahead: {interval_size:.0f} units. This will take significant time.")
-                except:
-                    pass
+                _notify("warning", f"🔥 Extreme computation ahead: {interval_size:.0f} units. This will take significant time.")
         else:
             # Límites normales más flexibles
             if interval_size > 100000000:
@@ -474,17 +505,9 @@ def validate_plot_bounds(lower_bound: str, upper_bound: str) -> Tuple[bool, str,
         if interval_size > 10000000:  # 10 millones para plots
             return False, f"Plotting interval too large ({interval_size:.0f} units). Maximum for plots: 10,000,000", None, None
         elif interval_size > 1000000:  # 1 millón
-            try:
-                import streamlit as st
-                st.warning(f"⚠️ Large plotting interval ({interval_size:.0f} units). Plot generation may be slow.")
-            except:
-                pass
+            _notify("warning", f"⚠️ Large plotting interval ({interval_size:.0f} units). Plot generation may be slow.")
         elif interval_size > 100000:  # 100,000
-            try:
-                import streamlit as st
-                st.info(f"ℹ️ Moderate plotting interval ({interval_size:.0f} units).")
-            except:
-                pass
+            _notify("info", f"ℹ️ Moderate plotting interval ({interval_size:.0f} units).")
         
         return True, "", lower_val, upper_val
         
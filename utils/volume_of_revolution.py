@@ -0,0 +1,178 @@
+import sympy as sp
+import numpy as np
+import copy
+from functools import lru_cache
+from typing import Tuple, Union, Dict, Any
+
+try:
+    from .expression_parser import safe_float_conversion, compile_expression
+    from .validation import validate_integration_inputs, validate_two_functions
+    from .calculator import antiderivative_difference
+    from .instrumentation import stage, register_cache
+except ImportError:
+    from utils.expression_parser import safe_float_conversion, compile_expression
+    from utils.validation import validate_integration_inputs, validate_two_functions
+    from utils.calculator import antiderivative_difference
+    from utils.instrumentation import stage, register_cache
+
+VOLUME_METHODS = ("disk", "washer", "shell")
+
+# Puntos de la cuadratura de Simpson compuesta (impar)
+VOLUME_GRID_POINTS = 2001
+
+# Acuerdo relativo exigido para preferir el resultado simbólico
+SYMBOLIC_AGREEMENT = 1e-6
+
+def _simpson(values: np.ndarray, grid: np.ndarray) -> float:
+    """Composite Simpson rule on an evenly spaced grid with an odd number of points."""
+    step = grid[1] - grid[0]
+    return float(step / 3 * (values[0] + values[-1] + 4 * values[1:-1:2].sum() + 2 * values[2:-1:2].sum()))
+
+def _volume_integrand(method: str, var_symbol: sp.Symbol, outer: np.ndarray, inner: np.ndarray,
+                      grid: np.ndarray, axis_value: float):
+    """
+    Numeric integrand on the grid and its symbolic form when the signs are constant.
+
+    Returns:
+        Tuple[np.ndarray, Callable or None]: (integrand values, builder of the symbolic
+        integrand from (f, g, axis) or None if a sign changes in the interval)
+    """
+    pi = np.pi
+
+    if method == "shell":
+        # V = 2π ∫ |x - c| |f(x) - g(x)| dx, eje vertical x = c
+        radius = grid - axis_value
+        height = outer - inner
+        values = 2 * pi * np.abs(radius) * np.abs(height)
+        product = radius * height
+        if (product > 0).any() and (product < 0).any():
+            return values, None
+        sign = -1 if (product < 0).any() else 1
+        return values, lambda f, g, c: sign * 2 * sp.pi * (var_symbol - c) * (f - g)
+
+    # Disco: región entre f y el eje y = c
+    if method == "disk":
+        values = pi * (outer - axis_value) ** 2
+        return values, lambda f, g, c: sp.pi * (f - c) ** 2
+
+    # Arandela: radios medidos desde el eje; si las curvas quedan a ambos lados no hay hueco
+    outer_radius = np.abs(outer - axis_value)
+    inner_radius = np.abs(inner - axis_value)
+    same_side = (outer - axis_value) * (inner - axis_value) >= 0
+    big = np.maximum(outer_radius, inner_radius)
+    small = np.where(same_side, np.minimum(outer_radius, inner_radius), 0.0)
+    values = pi * (big ** 2 - small ** 2)
+
+    # Forma simbólica solo si una curva queda siempre por fuera y ninguna cruza el eje
+    outer_is_far = outer_radius > inner_radius
+    inner_is_far = outer_radius < inner_radius
+    if not same_side.all() or (outer_is_far.any() and inner_is_far.any()):
+        return values, None
+    sign = -1 if inner_is_far.any() else 1
+    return values, lambda f, g, c: sign * sp.pi * ((f - c) ** 2 - (g - c) ** 2)
+
+@lru_cache(maxsize=128)
+def _calculate_volume_cached(function_str: str, lower_bound: str, upper_bound: str, variable: str,
+                             method: str, inner_function_str: str, axis: str) -> Tuple[bool, Union[float, str], Dict[str, Any]]:
+    """Volumen por cuadratura vectorizada con validación simbólica (cacheado por entradas)."""
+    details = {
+        "method": method,
+        "axis": None,
+        "method_used": None,
+        "numeric_result": None,
+        "symbolic_result": None
+    }
+
+    if method not in VOLUME_METHODS:
+        return False, f"Unknown volume method: {method}", details
+    if method == "washer" and not inner_function_str:
+        return False, "The washer method needs an inner function", details
+
+    if inner_function_str:
+        valid, error, outer_expr, inner_expr, lower_val, upper_val = validate_two_functions(
+            function_str, inner_function_str, lower_bound, upper_bound, variable
+        )
+    else:
+        valid, error, outer_expr, lower_val, upper_val = validate_integration_inputs(
+            function_str, lower_bound, upper_bound, variable
+        )
+        inner_expr = sp.Integer(0)
+    if not valid:
+        return False, error, details
+
+    success, axis_value = safe_float_conversion(axis)
+    if not success:
+        return False, f"Invalid axis: {axis_value}", details
+    details["axis"] = f"{variable} = {axis_value:g}" if method == "shell" else f"y = {axis_value:g}"
+
+    var_symbol = sp.Symbol(variable, real=True)
+
+    # Método 1: Simpson compuesto sobre las funciones compiladas (una evaluación por curva)
+    with stage("volume_quadrature"):
+        grid = np.linspace(lower_val, upper_val, VOLUME_GRID_POINTS)
+        outer = compile_expression(outer_expr, variable)(grid)
+        inner = compile_expression(inner_expr, variable)(grid) if inner_function_str else np.zeros_like(grid)
+
+        if not (np.all(np.isfinite(outer)) and np.all(np.isfinite(inner))):
+            return False, "The function is undefined at some points of the interval", details
+
+        values, symbolic_integrand = _volume_integrand(method, var_symbol, outer, inner, grid, axis_value)
+        numeric_result = _simpson(values, grid)
+        details["numeric_result"] = numeric_result
+        details["method_used"] = "Vectorized Simpson quadrature"
+
+    result = numeric_result
+
+    # Método 2: Antiderivada cacheada (pi exacto), aceptada solo si coincide con la cuadratura
+    if symbolic_integrand is not None:
+        with stage("symbolic_integration"):
+            # El eje exacto (pi, -1...) evita coeficientes en coma flotante
+            axis_expr = sp.nsimplify(axis_value, [sp.pi, sp.E])
+            integrand = sp.expand(symbolic_integrand(outer_expr, inner_expr, axis_expr))
+            details["integrand"] = str(integrand)
+            symbolic_result = antiderivative_difference(integrand, variable, lower_val, upper_val)
+
+        if symbolic_result is not None:
+            details["symbolic_result"] = symbolic_result
+            if abs(symbolic_result - numeric_result) <= SYMBOLIC_AGREEMENT * max(1.0, abs(numeric_result)):
+                result = symbolic_result
+                details["method_used"] = "Symbolic Integration (cross-validated)"
+
+    return True, result, details
+
+register_cache("calculate_volume_of_revolution", _calculate_volume_cached)
+
+def calculate_volume_of_revolution(function_str: str, lower_bound: str, upper_bound: str, variable: str = "x",
+                                   method: str = "disk", inner_function_str: str = None,
+                                   axis: str = "0") -> Tuple[bool, Union[float, str], Dict[str, Any]]:
+    """
+    Calculate the volume of a solid of revolution.
+
+    - disk:   V = π ∫ (f - c)² dx around the horizontal line y = c
+    - washer: V = π ∫ (R² - r²) dx around y = c, R and r the distances of f and g to the axis
+    - shell:  V = 2π ∫ |x - c| |f - g| dx around the vertical line x = c (g = 0 by default)
+
+    The integrand is evaluated once on a shared grid with the compiled
+    expressions (composite Simpson, exact π). When it has a closed form
+    the cached antiderivative is used as well and preferred if both agree.
+    Results are cached per input tuple, so widget reruns are free.
+
+    Args:
+        function_str (str): Function (outer curve for washers)
+        lower_bound (str): Lower bound
+        upper_bound (str): Upper bound
+        variable (str): Variable name
+        method (str): "disk", "washer" or "shell"
+        inner_function_str (str): Inner curve (washer, optional for shell)
+        axis (str): Axis position c (e.g. "0", "-1", "pi")
+
+    Returns:
+        Tuple[bool, Union[float, str], Dict]: (success, volume or error message, details)
+    """
+    try:
+        return copy.deepcopy(_calculate_volume_cached(
+            function_str, str(lower_bound), str(upper_bound), variable, method,
+            inner_function_str or "", str(axis)
+        ))
+    except Exception as e:
+        return False, f"Volume calculation failed: {str(e)}", {}